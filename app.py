@@ -1,6 +1,9 @@
 import re
+import time
 import uuid
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 import nest_asyncio
 import streamlit as st
 from streamlit_mermaid import st_mermaid
@@ -8,8 +11,16 @@ from streamlit_mermaid import st_mermaid
 # Apply nest_asyncio to allow nested event loops (crucial for Streamlit + LangGraph/Asyncio)
 nest_asyncio.apply()
 
-from src.agents.assistant.graph import create_assistant_graph, run_assistant
-from src.utils.exporter import convert_to_docx
+from src.agents.assistant.graph import (
+    get_assistant_graph,
+    run_assistant,
+    refresh_srs_job,
+    load_assistant_state
+)
+from src.utils.exporter import export_docx
+from src.utils.streaming import TokenBuffer, stream_tokens_to
+from src.utils.metrics import start_metrics_exporters
+from src.utils.usage import usage_ledger
 from datetime import datetime
 import os
 import glob
@@ -38,12 +49,22 @@ if "messages" not in st.session_state:
     st.session_state.messages = []
 if "srs_content" not in st.session_state:
     st.session_state.srs_content = "### SRS Artifact\n\nNo SRS generated yet. Ask the agent to create one!"
+# IDs live in the URL so a refresh (or another replica) resumes the conversation
 if "user_id" not in st.session_state:
-    st.session_state.user_id = f"user-{uuid.uuid4().hex[:8]}"
+    st.session_state.user_id = st.query_params.get("user", f"user-{uuid.uuid4().hex[:8]}")
 if "conversation_id" not in st.session_state:
-    st.session_state.conversation_id = f"conv-{uuid.uuid4().hex[:8]}"
+    st.session_state.conversation_id = st.query_params.get("conv", f"conv-{uuid.uuid4().hex[:8]}")
 if "assistant_state" not in st.session_state:
-    st.session_state.assistant_state = None
+    # Resume from the shared checkpointer when the conversation already exists
+    st.session_state.assistant_state = asyncio.run(
+        load_assistant_state(st.session_state.conversation_id)
+    )
+    if st.session_state.assistant_state:
+        st.session_state.messages = st.session_state.assistant_state.get("messages", [])
+        if st.session_state.assistant_state.get("srs_document"):
+            st.session_state.srs_content = st.session_state.assistant_state["srs_document"]
+st.query_params["user"] = st.session_state.user_id
+st.query_params["conv"] = st.session_state.conversation_id
 
 # Ensure version directory exists
 SRS_DIR = "srs_version"
@@ -58,15 +79,20 @@ try:
 except Exception as e:
     st.error(f"Failed to initialize memory: {e}")
 
-# Load Graph once (cache resource implies global, but session_state is fine for single user local app)
-if "graph" not in st.session_state:
-    st.session_state.graph = create_assistant_graph()
+# Compile the graph once per process (shared by every session)
+get_assistant_graph()
+
+# Prometheus metrics on METRICS_PORT / METRICS_FILE (no-op when unset)
+start_metrics_exporters()
 
 # Sidebar for Metadata
 with st.sidebar:
     st.title("Settings")
     st.write(f"**User:** `{st.session_state.user_id}`")
     st.write(f"**Session:** `{st.session_state.conversation_id}`")
+    session_usage = usage_ledger.session_totals(st.session_state.conversation_id)["total"]
+    st.write(f"**Tokens:** {session_usage['prompt_tokens'] + session_usage['completion_tokens']:,} "
+             f"(${session_usage['cost_usd']:.4f})")
     
    
 
@@ -107,6 +133,86 @@ with st.sidebar:
     else:
         st.info("No saved versions yet.")
 
+def render_srs(content: str):
+    """Render SRS markdown, drawing mermaid code blocks as diagrams"""
+    # Regex to split content by mermaid code blocks
+    # Captures the block including backticks so we can identify it
+    parts = re.split(r'(```mermaid\n.*?\n```)', content, flags=re.DOTALL)
+    
+    for part in parts:
+        if part.startswith("```mermaid"):
+            # Clean up the code block to get just the mermaid code
+            code = part.replace("```mermaid\n", "").replace("\n```", "").strip()
+            if code:
+                try:
+                    st_mermaid(code, height=400)
+                except Exception as e:
+                    st.error(f"Mermaid rendering error: {e}")
+                    st.code(code, language="mermaid")
+        else:
+            # Render regular markdown
+            if part.strip():
+                st.markdown(part)
+
+def _srs_job_active() -> bool:
+    state = st.session_state.assistant_state
+    return bool(state and state.get("srs_job_id"))
+
+# Poll every 2s only while a background SRS job is running
+@st.fragment(run_every=2 if _srs_job_active() else None)
+def artifact_view():
+    """Artifact panel: finished SRS, or progress of the background job"""
+    state = st.session_state.assistant_state
+    was_active = _srs_job_active()
+    job = refresh_srs_job(state) if was_active else None
+    
+    if job and job["status"] in ("queued", "running"):
+        st.info(f"⏳ Generating SRS - phase: **{job['phase']}**")
+        if job.get("partial_result"):
+            st.markdown(job["partial_result"])
+        return
+    
+    if job or was_active:
+        # Job just finished (or was lost): pick up the result and redraw the whole page
+        st.session_state.messages = state["messages"]
+        if state.get("srs_document"):
+            st.session_state.srs_content = state["srs_document"]
+        st.rerun()
+    
+    render_srs(st.session_state.srs_content)
+
+def run_assistant_streaming(user_input: str, placeholder) -> tuple:
+    """
+    Run the assistant on a worker thread and redraw the artifact panel
+    with synthesis tokens while the SRS is being generated
+    """
+    token_buffer = TokenBuffer()
+    
+    # st.session_state is only readable on the script thread
+    # (the worker has no ScriptRunContext): read everything up front
+    user_id = st.session_state.user_id
+    session_id = st.session_state.conversation_id
+    existing_state = st.session_state.assistant_state
+    
+    def _run(user_id, session_id, existing_state):
+        with stream_tokens_to(token_buffer.append):
+            return asyncio.run(run_assistant(
+                user_message=user_input,
+                user_id=user_id,
+                session_id=session_id,
+                existing_state=existing_state
+            ))
+    
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(copy_context().run, _run, user_id, session_id, existing_state)
+        rendered_length = 0
+        while not future.done():
+            if len(token_buffer) > rendered_length:
+                rendered_length = len(token_buffer)
+                placeholder.markdown(token_buffer.text())
+            time.sleep(0.2)
+        return future.result()
+
 # Layout: Artifact (Left) - Chat (Right)
 col_artifact, col_chat = st.columns([7, 3], gap="medium")
 
@@ -240,6 +346,7 @@ with st.sidebar:
         # Reset Session
         new_id = f"conv-{uuid.uuid4().hex[:8]}"
         st.session_state.conversation_id = new_id
+        st.query_params["conv"] = new_id
         st.session_state.messages = []
         st.session_state.srs_content = "### SRS Artifact\n\nNo SRS generated yet."
         st.session_state.assistant_state = None
@@ -283,26 +390,10 @@ with col_artifact:
     # The border=True creates the explicit frame user requested
     # Matched height with Chat Panel (800px)
     with st.container(height=800, border=True):
-        content = st.session_state.srs_content
-        
-        # Regex to split content by mermaid code blocks
-        # Captures the block including backticks so we can identify it
-        parts = re.split(r'(```mermaid\n.*?\n```)', content, flags=re.DOTALL)
-        
-        for part in parts:
-            if part.startswith("```mermaid"):
-                # Clean up the code block to get just the mermaid code
-                code = part.replace("```mermaid\n", "").replace("\n```", "").strip()
-                if code:
-                    try:
-                        st_mermaid(code, height=400)
-                    except Exception as e:
-                        st.error(f"Mermaid rendering error: {e}")
-                        st.code(code, language="mermaid")
-            else:
-                # Render regular markdown
-                if part.strip():
-                    st.markdown(part)
+        # Placeholder so a streaming SRS can be redrawn in place
+        artifact_placeholder = st.empty()
+        with artifact_placeholder.container():
+            artifact_view()
                     
     # --- ARTIFACT TOOLBAR (Bottom) ---
     st.markdown("<div style='margin-top: 10px;'></div>", unsafe_allow_html=True)
@@ -328,8 +419,9 @@ with col_artifact:
                 st.error(f"Save failed: {e}")
             
     with col_export:
-        # Convert MD to DOCX
-        docx_file = convert_to_docx(st.session_state.srs_content)
+        # Convert MD to DOCX (cached by content hash: reruns with an
+        # unchanged SRS reuse the previous export)
+        docx_file = export_docx(st.session_state.srs_content)
         
         st.download_button(
             label="📥 Export DOCX",
@@ -408,26 +500,24 @@ with col_chat:
                 with st.spinner("Thinking..."):
                     # Run Assistant via Wrapper (Handles confirmation logic & state management)
                     try:
-                        response_text, final_state = asyncio.run(run_assistant(
-                            user_message=user_input,
-                            user_id=st.session_state.user_id,
-                            session_id=st.session_state.conversation_id,
-                            existing_state=st.session_state.assistant_state
-                        ))
+                        response_text, final_state = run_assistant_streaming(
+                            user_input, artifact_placeholder
+                        )
                     except Exception as e:
                         st.error(f"Error running assistant: {e}")
-                        final_state = st.session_state.assistant_state # Fallback
+                        final_state = st.session_state.assistant_state # Fallback (None on a new conversation)
                     
                     # 3. Update State & UI
-                    st.session_state.assistant_state = final_state
-                    st.session_state.messages = final_state["messages"]
-                    
-                    if final_state.get("srs_document"):
-                        st.session_state.srs_content = final_state["srs_document"]
-                    
-                    last_msg = final_state["messages"][-1]
-                    if last_msg["role"] == "assistant":
-                        st.markdown(last_msg["content"])
+                    if final_state is not None:
+                        st.session_state.assistant_state = final_state
+                        st.session_state.messages = final_state["messages"]
+                        
+                        if final_state.get("srs_document"):
+                            st.session_state.srs_content = final_state["srs_document"]
+                        
+                        last_msg = final_state["messages"][-1] if final_state["messages"] else None
+                        if last_msg and last_msg["role"] == "assistant":
+                            st.markdown(last_msg["content"])
             
             # Force rerun to update artifacts panel and clear input state visually if needed
             st.rerun()
\ No newline at end of file
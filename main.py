@@ -3,6 +3,9 @@ from datetime import datetime
 
 from src.utils.tracing import logger
 from src.utils.export_md import export_to_markdown
+from src.utils.streaming import stream_tokens_to
+from src.utils.metrics import NODE_LATENCY, LLM_LATENCY, SEARCH_LATENCY, start_metrics_exporters
+from src.memory.checkpointer import checkpoint_store_stats
 from agents.srs.graph import generate_srs_langgraph
 
 async def interactive_mode():
@@ -14,6 +17,7 @@ async def interactive_mode():
   print("\nCommands:")
   print("  • Type your project idea and press Enter")
   print("  • Type 'trace' to export execution trace")
+  print("  • Type 'metrics' to show latency percentiles")
   print("  • Type 'q' to quit")
   print("="*80 + "\n")
   
@@ -36,6 +40,16 @@ async def interactive_mode():
           logger.export_trace()
         else:
           print("No trace data available.")
+        if logger.sink:
+          print(f"Continuous trace: {logger.sink.path} (python -m src.utils.trace_sink --help)")
+        continue
+      
+      if user_input.lower() == 'metrics':
+        for histogram in (NODE_LATENCY, LLM_LATENCY, SEARCH_LATENCY):
+          print(f"\n{histogram.description}:")
+          for row in histogram.summary() or [{"count": 0}]:
+            print(f"  {row}")
+        print(f"\nCheckpoint store: {checkpoint_store_stats()}")
         continue
       
       if user_input.lower().startswith('save'):
@@ -50,12 +64,25 @@ async def interactive_mode():
       current_project = user_input
       print(f"\nGenerating SRS using LangGraph for: {user_input}\n")
       
-      current_srs = await generate_srs_langgraph(user_input)
+      streamed = []
       
-      print("\n" + "="*80)
-      print(" FINAL SRS DOCUMENT")
-      print("="*80 + "\n")
-      print(current_srs)
+      def print_token(token: str):
+        # Print the header right before the first synthesis token
+        if not streamed:
+          print("\n" + "="*80)
+          print(" FINAL SRS DOCUMENT")
+          print("="*80 + "\n")
+        streamed.append(token)
+        print(token, end="", flush=True)
+      
+      with stream_tokens_to(print_token):
+        current_srs = await generate_srs_langgraph(user_input)
+      
+      if not streamed:
+        print("\n" + "="*80)
+        print(" FINAL SRS DOCUMENT")
+        print("="*80 + "\n")
+        print(current_srs)
       print("\n" + "="*80)
       print("\nType 'save' to export as markdown, or 'trace' for execution log")
         
@@ -69,4 +96,5 @@ async def interactive_mode():
       logger.log("SYSTEM_ERROR", str(e), level="ERROR")
 
 if __name__ == "__main__":
+  start_metrics_exporters()
   asyncio.run(interactive_mode())
\ No newline at end of file
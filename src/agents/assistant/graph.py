@@ -1,8 +1,13 @@
-from typing import Literal
+import json
+import inspect
+import functools
+from typing import Callable, Dict, Literal, Optional
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 
 from src.utils.tracing import logger
+from src.memory.checkpointer import get_checkpointer
+from src.agents.registry import graph_registry
+from src.utils.metrics import timed_node
 from src.agents.assistant.state import AssistantState
 from src.agents.assistant.nodes import (
   intake_node,
@@ -11,8 +16,16 @@ from src.agents.assistant.nodes import (
   ready_node,
   trigger_node
 )
-from src.agents.assistant.utils import classify_confirmation
-from src.utils.langfuse_tracer import trace_agent, trace_graph_execution, flush_langfuse
+from src.agents.assistant.utils import (
+  classify_confirmation,
+  fused_turn,
+  ASSISTANT_FUSED_TURN,
+  _detect_user_language
+)
+from src.agents.assistant.nodes.trigger import apply_srs_result
+from src.jobs import get_srs_job, JOB_COMPLETE, JOB_FAILED
+from src.utils.usage import usage_ledger
+from src.utils.langfuse_tracer import trace_agent, trace_graph_execution
 
 # ============================== ROUTING FUNCTIONS =============================
 def after_intake(state: AssistantState) -> Literal["validator"]:
@@ -67,6 +80,27 @@ def after_trigger(state: AssistantState) -> Literal[END]:
   logger.log("ROUTING", "trigger → END (SRS complete)", level="SUCCESS")
   return END
 
+# ============================== TOKEN USAGE ===================================
+def with_token_usage(func: Callable) -> Callable:
+  """
+  Wrap a last node of the turn so the state it returns (and checkpoints)
+  carries the session's token usage, this turn's calls included
+  """
+  def record(state: AssistantState) -> AssistantState:
+    state["token_usage"] = usage_ledger.session_totals(state["session_id"])
+    return state
+  
+  if inspect.iscoroutinefunction(func):
+    @functools.wraps(func)
+    async def async_wrapper(state, *args, **kwargs):
+      return record(await func(state, *args, **kwargs))
+    return async_wrapper
+  
+  @functools.wraps(func)
+  def wrapper(state, *args, **kwargs):
+    return record(func(state, *args, **kwargs))
+  return wrapper
+
 # =========================== CREATE ASSISTANT GRAPH ===========================
 def create_assistant_graph():
   """
@@ -91,11 +125,11 @@ def create_assistant_graph():
   # Add nodes
   logger.log("GRAPH_BUILD", "Adding nodes: intake, validator, ready, continue, trigger", level="INFO")
   
-  workflow.add_node("intake", intake_node)
-  workflow.add_node("validator", validator_node)
-  workflow.add_node("ready", ready_node)
-  workflow.add_node("continue", continue_chat_node)
-  workflow.add_node("trigger", trigger_node)
+  workflow.add_node("intake", timed_node("assistant", "intake", intake_node))
+  workflow.add_node("validator", timed_node("assistant", "validator", validator_node))
+  workflow.add_node("ready", timed_node("assistant", "ready", with_token_usage(ready_node)))
+  workflow.add_node("continue", timed_node("assistant", "chat", with_token_usage(continue_chat_node)))
+  workflow.add_node("trigger", timed_node("assistant", "trigger", with_token_usage(trigger_node)))
   
   # Set entry point
   workflow.set_entry_point("intake")
@@ -158,14 +192,56 @@ def create_assistant_graph():
     }
   )
   
-  # Add memory/checkpointing
-  memory = MemorySaver()
+  # Add durable checkpointing (shared, keyed by thread_id)
+  memory = get_checkpointer()
   app = workflow.compile(checkpointer=memory)
   
   logger.log("GRAPH_BUILD", "Assistant Agent graph compiled successfully", level="SUCCESS")
   
   return app
 
+def get_assistant_graph():
+  """
+  Get the compiled Assistant graph (built once per process, shared by sessions)
+  """
+  return graph_registry.get("assistant", create_assistant_graph)
+
+# ==================== PUBLIC API: Load / save conversation ====================
+async def load_assistant_state(session_id: str) -> Optional[AssistantState]:
+  """
+  Resume a conversation from the checkpointer (keyed by session_id)
+  
+  Returns:
+    The last checkpointed state, or None for a new conversation
+  """
+  app = get_assistant_graph()
+  config = {"configurable": {"thread_id": session_id}}
+  
+  try:
+    snapshot = await app.aget_state(config)
+  except Exception as e:
+    logger.log("STATE_RESUME_ERROR", f"Could not load checkpoint for {session_id}: {e}", level="ERROR")
+    return None
+  
+  if not snapshot or not snapshot.values:
+    return None
+  
+  logger.log("STATE_RESUME", f"Resumed conversation {session_id} from checkpoint", 
+            data={"num_messages": len(snapshot.values.get("messages", []))}, level="INFO")
+  return dict(snapshot.values)
+
+def save_assistant_state(state: AssistantState):
+  """
+  Checkpoint a state changed outside the graph (e.g. a finished SRS job)
+  """
+  app = get_assistant_graph()
+  config = {"configurable": {"thread_id": state["session_id"]}}
+  
+  try:
+    app.update_state(config, state, as_node="trigger")
+  except Exception as e:
+    logger.log("STATE_SAVE_ERROR", f"Could not checkpoint {state['session_id']}: {e}", level="ERROR")
+
 # ========================== PUBLIC API: Run Assistant =========================
 @trace_agent("Assistant Agent", agent_type="assistant")
 async def run_assistant(
@@ -186,6 +262,9 @@ async def run_assistant(
   Returns:
     (assistant_response, updated_state)
   """
+  # Logs of this turn (and of any SRS job it starts) go to this session's buffer
+  logger.bind_session(session_id)
+  
   logger.log("ASSISTANT_START", 
             f"Processing message from user {user_id}",
             data={"message_preview": user_message[:100]},
@@ -194,6 +273,10 @@ async def run_assistant(
   # ============================================================================
   # STEP 1: Prepare state
   # ============================================================================
+  if not existing_state:
+    # Conversation may have been started by another process/replica
+    existing_state = await load_assistant_state(session_id)
+  
   if existing_state:
     logger.log("STATE_LOAD", "Loading existing state", level="INFO")
     state = existing_state
@@ -205,6 +288,8 @@ async def run_assistant(
       "session_id": session_id,
       "current_message": user_message,
       "messages": [],
+      "user_language": None,
+      "turn_draft": None,
       "requirements": {},
       "validation_score": 0.0,
       "missing_categories": [],
@@ -214,16 +299,38 @@ async def run_assistant(
       "user_confirmed_generation": False,
       "srs_document": None,
       "srs_metadata": None,
+      "srs_job_id": None,
+      "token_usage": None,
       "relevant_history": [],
       "user_preferences": []
     }
   
+  # Budgets count what the conversation used before a restart too
+  usage_ledger.restore_session(session_id, state.get("token_usage"))
+  
+  # Language is detected once per turn and shared by the reply nodes
+  state["user_language"] = _detect_user_language(
+    state["messages"] + [{"role": "user", "content": user_message}]
+  )
+  
+  # Optional fused turn: confirmation + extraction + reply draft in one call.
+  # Fields that failed validation are None and take the regular path below.
+  state["turn_draft"] = None
+  if ASSISTANT_FUSED_TURN:
+    state["turn_draft"] = fused_turn(
+      user_message,
+      state["requirements"],
+      state["user_language"],
+      offer_pending=state["should_trigger_srs"]
+    )
+  
   # ============================================================================
   # STEP 2: Check confirmation (smart classification)
   # ============================================================================
   if state["should_trigger_srs"]:
     logger.log("CONFIRMATION_CHECK", "Checking for user confirmation...", level="INFO")
-    is_confirmed = classify_confirmation(user_message)
+    drafted = (state["turn_draft"] or {}).get("is_confirmed")
+    is_confirmed = drafted if drafted is not None else classify_confirmation(user_message)
     
     if is_confirmed:
       logger.log("USER_CONFIRMATION", "User confirmed SRS generation (Classifier)", level="INFO")
@@ -234,8 +341,7 @@ async def run_assistant(
   # ============================================================================
   # STEP 3: Create and run graph
   # ============================================================================
-  logger.log("GRAPH_EXECUTION", "Creating Assistant graph", level="INFO")
-  app = create_assistant_graph()
+  app = get_assistant_graph()
   
   config = {"configurable": {"thread_id": session_id}}
   
@@ -275,7 +381,50 @@ async def run_assistant(
             },
             level="SUCCESS")
   
-  # Flush Langfuse to send data
-  flush_langfuse()
+  return response_message, final_state
+
+# ===================== PUBLIC API: Background SRS job status ==================
+def refresh_srs_job(state: AssistantState) -> Optional[Dict]:
+  """
+  Check the background SRS job of a conversation
+  
+  When the job has finished, its result (or error) is applied to the state
+  and the job is detached from it.
+  
+  Returns:
+    The job record (status, phase, partial_result, result), or None
+  """
+  job_id = state.get("srs_job_id") if state else None
+  if not job_id:
+    return None
+  
+  job = get_srs_job(job_id)
+  if job is None:
+    # e.g. started on another replica with a local job store, or the store was cleared
+    logger.log("SRS_JOB_MISSING", f"Unknown SRS job: {job_id}", level="WARNING")
+    state["messages"].append({
+      "role": "assistant",
+      "content": "I lost track of the SRS generation that was running. Please ask me to generate the SRS again."
+    })
+    state["current_phase"] = "complete"
+    state["srs_job_id"] = None
+    save_assistant_state(state)
+    return None
+  
+  if job["status"] == JOB_COMPLETE:
+    usage = json.loads(job["usage"]) if job.get("usage") else None
+    apply_srs_result(state, job["result"], usage=usage, run_id=job["id"] if job.get("run_state") else None)
+    state["srs_job_id"] = None
+  elif job["status"] == JOB_FAILED:
+    state["messages"].append({
+      "role": "assistant",
+      "content": f"Error generating SRS: {job['error']}"
+    })
+    state["current_phase"] = "complete"
+    state["srs_job_id"] = None
+  
+  if not state["srs_job_id"]:
+    state["token_usage"] = usage_ledger.session_totals(state["session_id"])
+    save_assistant_state(state)
   
-  return response_message, final_state
\ No newline at end of file
+  return job
@@ -1,5 +1,6 @@
 from src.utils.tracing import logger
 from src.utils.langfuse_tracer import trace_node
+from src.utils.llm_metrics import chat_completion
 from src.memory.singleton import get_memory_manager
 from src.agents.assistant.state import AssistantState
 from src.agents.assistant.prompts import CONTINUE_CHAT_SYSTEM, CONTINUE_CHAT_PROMPT
@@ -15,8 +16,8 @@ def continue_chat_node(state: AssistantState) -> AssistantState:
   # Get client from memory manager
   client = get_memory_manager().get_client()
 
-  # Detect user language
-  user_language = _detect_user_language(state["messages"])
+  # Language is detected once per turn in run_assistant
+  user_language = state.get("user_language") or _detect_user_language(state["messages"])
   logger.log("LANGUAGE_DETECT", f"Detected language: {user_language}", level="INFO")
     
   missing_cat = get_next_category_to_ask(state["missing_categories"])
@@ -52,20 +53,30 @@ def continue_chat_node(state: AssistantState) -> AssistantState:
     If user says "you decide" or "tự quyết định đi" for these categories, that's OK.
     Just acknowledge and move to the next required category.
   """
-  try:
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-          {"role": "system", "content": system_prompt},
-          {"role": "user", "content": prompt}
-        ],
-        temperature=0.7
-    )
-    assistant_message = response.choices[0].message.content
-    
-  except Exception as e:
-    logger.log("CHAT_ERROR", f"Error generating response: {e}", level="ERROR")
-    assistant_message = "I'm having trouble connecting to my brain right now. Could you repeat that?"
+  draft = state.get("turn_draft") or {}
+  if draft.get("reply_kind") == "continue":
+    # Reply already drafted by the fused turn
+    logger.log("CHAT_FUSED", "Using reply from the fused turn", level="INFO")
+    assistant_message = draft["reply"]
+  else:
+    try:
+      response = chat_completion(
+          client,
+          "continue_chat",
+          model="gpt-4o-mini",
+          messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+          ],
+          temperature=0.7
+      )
+      assistant_message = response.choices[0].message.content
+      
+    except Exception as e:
+      logger.log("CHAT_ERROR", f"Error generating response: {e}", level="ERROR")
+      assistant_message = "I'm having trouble connecting to my brain right now. Could you repeat that?"
+  
+  state["turn_draft"] = None
 
   # Add to messages
   state["messages"].append({
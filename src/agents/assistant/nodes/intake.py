@@ -38,10 +38,15 @@ def intake_node(state: AssistantState) -> AssistantState:
   # Extract requirements using LLM
   logger.log("EXTRACTION_START", "Extracting requirements from message", level="INFO")
   
-  extracted = extract_requirements(
-    state["current_message"],
-    state["requirements"]
-  )
+  drafted = (state.get("turn_draft") or {}).get("requirements")
+  if drafted is not None:
+    extracted = drafted
+    logger.log("EXTRACTION_FUSED", "Using requirements from the fused turn", level="INFO")
+  else:
+    extracted = extract_requirements(
+      state["current_message"],
+      state["requirements"]
+    )
   
   logger.log("EXTRACTION_RESULT", 
             f"Extracted {sum(len(items) for items in extracted.values())} new items",
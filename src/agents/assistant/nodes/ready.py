@@ -1,5 +1,6 @@
 from src.utils.tracing import logger
 from src.utils.langfuse_tracer import trace_node
+from src.utils.llm_metrics import chat_completion
 from src.memory.singleton import get_memory_manager
 from src.agents.assistant.state import AssistantState
 from src.agents.assistant.utils import _detect_user_language
@@ -15,8 +16,8 @@ def ready_node(state: AssistantState) -> AssistantState:
   # Get client from memory manager
   client = get_memory_manager().get_client()
   
-  # Detect user language
-  user_language = _detect_user_language(state["messages"])
+  # Language is detected once per turn in run_assistant
+  user_language = state.get("user_language") or _detect_user_language(state["messages"])
   logger.log("LANGUAGE_DETECT", f"Detected language: {user_language}", level="INFO")
     
   # Format requirements summary
@@ -42,20 +43,30 @@ def ready_node(state: AssistantState) -> AssistantState:
     - YOU MUST respond in {user_language}
     - Be enthusiastic and clear
   """
-  try:
-    response = client.chat.completions.create(
-      model="gpt-4o-mini",
-      messages=[
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": prompt}
-      ],
-      temperature=0.7
-    )
-    ready_message = response.choices[0].message.content
-    
-  except Exception as e:
-    logger.log("READY_ERROR", f"Error generating message: {e}", level="ERROR")
-    ready_message = "We have gathered enough requirements. Shall we proceed to generate the SRS?"
+  draft = state.get("turn_draft") or {}
+  if draft.get("reply_kind") == "ready":
+    # Reply already drafted by the fused turn
+    logger.log("READY_FUSED", "Using reply from the fused turn", level="INFO")
+    ready_message = draft["reply"]
+  else:
+    try:
+      response = chat_completion(
+        client,
+        "ready",
+        model="gpt-4o-mini",
+        messages=[
+          {"role": "system", "content": system_prompt},
+          {"role": "user", "content": prompt}
+        ],
+        temperature=0.7
+      )
+      ready_message = response.choices[0].message.content
+      
+    except Exception as e:
+      logger.log("READY_ERROR", f"Error generating message: {e}", level="ERROR")
+      ready_message = "We have gathered enough requirements. Shall we proceed to generate the SRS?"
+  
+  state["turn_draft"] = None
 
   # Add to messages
   state["messages"].append({
@@ -1,11 +1,21 @@
+import os
+from typing import Dict
+
 from src.utils.tracing import logger
 from src.agents.srs.state import SRSState
-from src.agents.srs.graph import create_srs_graph
+from src.agents.srs.graph import get_srs_graph, initial_srs_state, srs_run_snapshot
 from src.agents.assistant.state import AssistantState
+from src.jobs import get_job_runner, save_srs_run, load_srs_run
+from src.memory.checkpointer import new_run_thread_id, release_thread
+from src.utils.usage import usage_ledger
 from src.utils.langfuse_tracer import trace_node, LangfuseTracer
 
+# =============================== CONFIGURATION ================================
+# Run SRS generation as a background job (set to 0 to run inline in the turn)
+SRS_BACKGROUND_JOBS = os.getenv("SRS_BACKGROUND_JOBS", "1") == "1"
+
 @trace_node("triggner_node")
-def trigger_node(state: AssistantState) -> AssistantState:
+async def trigger_node(state: AssistantState) -> AssistantState:
   """
   Trigger Node: Call SRS Agent and generate document
   
@@ -14,6 +24,18 @@ def trigger_node(state: AssistantState) -> AssistantState:
   logger.log("NODE_START", "Trigger Node - Calling SRS Agent", level="AGENT")
   logger.log("AGENT_COMMUNICATION", "Assistant → SRS Agent", level="INFO")
   
+  # Refuse further generation once the conversation used its token budget
+  if usage_ledger.session_budget_exceeded(state["session_id"]):
+    logger.log("SRS_BUDGET_EXCEEDED", "Session token budget exhausted, SRS not generated",
+              data=usage_ledger.session_totals(state["session_id"])["total"], level="WARNING")
+    state["messages"].append({
+      "role": "assistant",
+      "content": "This conversation has reached its token budget, so I can't generate another SRS. "
+                 "Please start a new project to continue."
+    })
+    state["current_phase"] = "complete"
+    return state
+  
   # ============================================================================
   # STEP 1: Format requirements for SRS Agent
   # ============================================================================
@@ -25,18 +47,41 @@ def trigger_node(state: AssistantState) -> AssistantState:
             f"Formatted input: {project_description[:200]}...",
             level="SUCCESS")
   
+  # ============================================================================
+  # STEP 2: Submit as a background job (chat turn returns immediately)
+  # ============================================================================
+  # Previous generation, if any: unchanged workers are reused
+  metadata = state.get("srs_metadata") or {}
+  previous_run = load_srs_run(metadata.get("run_id")) or metadata.get("run")
+  
+  if SRS_BACKGROUND_JOBS:
+    job_id = get_job_runner().submit(state["session_id"], project_description, previous_run)
+    
+    state["srs_job_id"] = job_id
+    state["messages"].append({
+      "role": "assistant",
+      "content": "Generating your SRS document now (research → planning → workers → synthesis). "
+                 "It will appear in the artifact panel as soon as it is ready."
+    })
+    state["current_phase"] = "srs_generation"
+    
+    logger.log("NODE_COMPLETE", f"Trigger Node complete - SRS job {job_id} submitted", level="SUCCESS")
+    return state
+  
+  return await _run_srs_inline(state, project_description, previous_run)
+
+async def _run_srs_inline(
+  state: AssistantState,
+  project_description: str,
+  previous_run: Dict = None
+) -> AssistantState:
+  """
+  Run the SRS graph inside the chat turn (SRS_BACKGROUND_JOBS=0)
+  """
   # ============================================================================
   # STEP 2: Prepare SRS Agent initial state
   # ============================================================================
-  srs_initial_state: SRSState = {
-    "project_query": project_description,
-    "research_results": [],
-    "agent_plan": [],
-    "worker_outputs": [],
-    "final_srs": "",
-    "current_phase": "start",
-    "messages": []
-  }
+  srs_initial_state: SRSState = initial_srs_state(project_description, previous_run)
   
   srs_tracer = LangfuseTracer("SRS Agent Execution")
   srs_tracer.start(input_data={"project_query": project_description[:200]})
@@ -46,11 +91,9 @@ def trigger_node(state: AssistantState) -> AssistantState:
             level="INFO")
   
   # ============================================================================
-  # STEP 3: Create SRS Agent graph
+  # STEP 3: Get compiled SRS Agent graph
   # ============================================================================
-  logger.log("SRS_GRAPH_CREATE", "Creating SRS Agent graph", level="INFO")
-  
-  srs_app = create_srs_graph()
+  srs_app = get_srs_graph()
   
   logger.log("SRS_GRAPH_READY", "SRS Agent graph ready", level="SUCCESS")
   
@@ -59,20 +102,24 @@ def trigger_node(state: AssistantState) -> AssistantState:
   # ============================================================================
   logger.log("SRS_EXECUTION_START", "Executing SRS Agent workflow", level="INFO")
   
+  # Unique per run: regenerations never accumulate in one thread
+  thread_id = new_run_thread_id(f"srs_{state['session_id']}")
+  
   try:
-    # Run synchronously (LangGraph stream)
-    config = {"configurable": {"thread_id": f"srs_{state['session_id']}"}}
+    # Run on the assistant's event loop (LangGraph astream)
+    config = {"configurable": {"thread_id": thread_id}}
     
     final_srs_state = None
-    for output in srs_app.stream(srs_initial_state, config):
-      node_name = list(output.keys())[0]
-      node_state = output[node_name]
-      
-      logger.log("SRS_NODE_COMPLETE", 
-                f"SRS Agent node completed: {node_name}",
-                level="INFO")
-      
-      final_srs_state = node_state
+    with usage_ledger.run_scope(thread_id):
+      async for output in srs_app.astream(srs_initial_state, config):
+        node_name = list(output.keys())[0]
+        node_state = output[node_name]
+        
+        logger.log("SRS_NODE_COMPLETE", 
+                  f"SRS Agent node completed: {node_name}",
+                  level="INFO")
+        
+        final_srs_state = node_state
     
     # ==========================================================================
     # STEP 5: Extract SRS result
@@ -86,37 +133,13 @@ def trigger_node(state: AssistantState) -> AssistantState:
         "word_count": len(srs_document.split())
       })
       
-      logger.log("SRS_SUCCESS", 
-                f"SRS generated successfully - {len(srs_document)} characters",
-                data={"word_count": len(srs_document.split())},
-                level="SUCCESS")
-      
-      # Update Assistant state
-      state["srs_document"] = srs_document
-      state["srs_metadata"] = {
-        "word_count": len(srs_document.split()),
-        "generated_at": "now",
-        "requirements_used": state["requirements"]
-      }
-      
-      # Generate success message
-      success_msg = f"""
-        **SRS Document Generated Successfully!**
-
-        **Statistics:**
-        - Words: {len(srs_document.split())}
-        - Sections: {srs_document.count('##')}
-
-        The complete SRS document is ready! Would you like to:
-        - Export it to Markdown
-        - Make modifications
-        - Generate a new version
-      """
-                    
-      state["messages"].append({
-        "role": "assistant",
-        "content": success_msg
-      })
+      run_id = save_srs_run(state["session_id"], project_description, srs_run_snapshot(final_srs_state))
+      apply_srs_result(
+        state,
+        srs_document,
+        usage=usage_ledger.run_totals(thread_id),
+        run_id=run_id
+      )
         
     else:
       logger.log("SRS_ERROR", "SRS Agent returned no document", level="ERROR")
@@ -139,6 +162,9 @@ def trigger_node(state: AssistantState) -> AssistantState:
       "content": f"Error generating SRS: {str(e)}"
     })
   
+  finally:
+    release_thread(thread_id)
+  
   # Update phase
   state["current_phase"] = "complete"
   
@@ -147,6 +173,62 @@ def trigger_node(state: AssistantState) -> AssistantState:
   
   return state
 
+def apply_srs_result(
+  state: AssistantState,
+  srs_document: str,
+  usage: Dict = None,
+  run_id: str = None
+) -> AssistantState:
+  """
+  Store a generated SRS in the Assistant state and announce it
+  (used inline and when a background job finishes)
+  
+  Args:
+    usage: Token/cost totals of the SRS run (UsageLedger.run_totals)
+    run_id: Job ID whose run_state (srs_run_snapshot) the next regeneration
+      reuses; the snapshot itself stays in the job store, not in the
+      checkpointed state
+  """
+  logger.log("SRS_SUCCESS", 
+            f"SRS generated successfully - {len(srs_document)} characters",
+            data={"word_count": len(srs_document.split())},
+            level="SUCCESS")
+  
+  # Update Assistant state
+  state["srs_document"] = srs_document
+  state["srs_metadata"] = {
+    "word_count": len(srs_document.split()),
+    "generated_at": "now",
+    "requirements_used": state["requirements"],
+    "usage": {
+      "srs": usage or usage_ledger.run_totals(),
+      "session": usage_ledger.session_totals(state["session_id"])["total"]
+    },
+    "run_id": run_id
+  }
+  
+  # Generate success message
+  success_msg = f"""
+    **SRS Document Generated Successfully!**
+
+    **Statistics:**
+    - Words: {len(srs_document.split())}
+    - Sections: {srs_document.count('##')}
+
+    The complete SRS document is ready! Would you like to:
+    - Export it to Markdown
+    - Make modifications
+    - Generate a new version
+  """
+                
+  state["messages"].append({
+    "role": "assistant",
+    "content": success_msg
+  })
+  state["current_phase"] = "complete"
+  
+  return state
+
 def _format_requirements_for_srs(requirements: dict) -> str:
   """
   Format requirements dict into text for SRS input
@@ -2,6 +2,8 @@ from src.utils.tracing import logger
 from src.utils.langfuse_tracer import trace_node
 from src.agents.assistant.state import AssistantState
 from src.agents.assistant.utils import calculate_completeness, is_ready_for_srs
+from src.agents.assistant.nodes.trigger import _format_requirements_for_srs
+from src.agents.srs.nodes import research_prefetch, SRS_RESEARCH_PREFETCH, SRS_PREFETCH_THRESHOLD
 
 @trace_node("validator_node")
 def validator_node(state: AssistantState) -> AssistantState:
@@ -29,6 +31,11 @@ def validator_node(state: AssistantState) -> AssistantState:
   state["is_ready_for_srs"] = is_ready
   state["current_phase"] = "validation"
   
+  # Near readiness: start the SRS research before the user confirms.
+  # Reused only if the SRS input is unchanged at confirmation.
+  if SRS_RESEARCH_PREFETCH and score >= SRS_PREFETCH_THRESHOLD:
+    research_prefetch.start(state["session_id"], _format_requirements_for_srs(state["requirements"]))
+  
   logger.log("NODE_COMPLETE", "Validator Node complete", level="SUCCESS")
   
   return state
\ No newline at end of file
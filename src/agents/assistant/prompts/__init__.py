@@ -6,4 +6,5 @@ from .chat_prompt import (
 
   READY_FOR_SRS_PROMPT
 )
-from .classifier_prompt import CLASSIFICATION_SYSTEM, CLASSIFICATION_PROMPT
\ No newline at end of file
+from .classifier_prompt import CLASSIFICATION_SYSTEM, CLASSIFICATION_PROMPT
+from .fused_prompt import FUSED_TURN_SYSTEM, FUSED_TURN_PROMPT
@@ -12,6 +12,8 @@ class AssistantState(TypedDict):
   # Current interaction
   current_message: str
   messages: List[Dict[str, str]]  # [{"role": "user", "content": "..."}]
+  user_language: Optional[str]  # Detected once per turn, used by the reply nodes
+  turn_draft: Optional[Dict]  # Fused-turn result (is_confirmed, requirements, reply_kind, reply)
   
   # Requirements tracking
   requirements: Dict[str, List[str]]  # {"project_type": ["Web App"], "core_features": [...]}
@@ -41,6 +43,8 @@ class AssistantState(TypedDict):
   # SRS output (when generated)
   srs_document: Optional[str]  # Final SRS content
   srs_metadata: Optional[Dict]  # Additional info
+  srs_job_id: Optional[str]  # Background SRS job (while it is running)
+  token_usage: Optional[Dict]  # Session token/cost totals (UsageLedger.session_totals)
   
   # Memory context
   relevant_history: List[Dict]
@@ -14,6 +14,8 @@ from .classifier import classify_confirmation
 
 from .languague_detector import _detect_user_language
 
+from .fused_turn import fused_turn, ASSISTANT_FUSED_TURN
+
 __all__ = [
   "calculate_completeness",
   "is_ready_for_srs", 
@@ -22,5 +24,7 @@ __all__ = [
   "extract_requirements",
   "merge_requirements",
   "classify_confirmation",
-  "_detect_user_language"
+  "_detect_user_language",
+  "fused_turn",
+  "ASSISTANT_FUSED_TURN"
 ]
\ No newline at end of file
@@ -2,6 +2,7 @@ import json
 from src.utils.tracing import logger
 from src.agents.assistant.prompts import CLASSIFICATION_SYSTEM, CLASSIFICATION_PROMPT
 from src.memory.singleton import get_memory_manager
+from src.utils.llm_cache import cached_chat_completion
 
 def classify_confirmation(user_message: str) -> bool:
   """
@@ -12,7 +13,9 @@ def classify_confirmation(user_message: str) -> bool:
   prompt = CLASSIFICATION_PROMPT.format(user_message=user_message)
   
   try:
-    response = client.chat.completions.create(
+    content = cached_chat_completion(
+      client,
+      call_site="classify_confirmation",
       model="gpt-4o-mini",
       messages=[
         {"role": "system", "content": CLASSIFICATION_SYSTEM},
@@ -22,7 +25,6 @@ def classify_confirmation(user_message: str) -> bool:
       temperature=0.0
     )
     
-    content = response.choices[0].message.content
     data = json.loads(content)
     logger.log("CLASSIFIER", f"Classification result: {data}", level="INFO")
     return data.get("is_confirmed", False)
@@ -2,6 +2,7 @@ import json
 from src.utils.tracing import logger
 from src.memory.singleton import get_memory_manager
 from src.utils.langfuse_tracer import trace_llm_call
+from src.utils.llm_cache import cached_chat_completion
 from src.agents.assistant.prompts import EXTRACTION_SYSTEM, EXTRACTION_PROMPT
 
 @trace_llm_call("requirement_extraction", model="gpt-4o-mini") 
@@ -20,7 +21,9 @@ def extract_requirements(user_message: str, current_requirements: dict) -> dict:
   )
   
   try:
-    response = client.chat.completions.create(
+    content = cached_chat_completion(
+      client,
+      call_site="extract_requirements",
       model="gpt-4o-mini",
       messages=[
         {"role": "system", "content": EXTRACTION_SYSTEM},
@@ -30,7 +33,6 @@ def extract_requirements(user_message: str, current_requirements: dict) -> dict:
       temperature=0.2
     )
     
-    content = response.choices[0].message.content
     return json.loads(content)
       
   except Exception as e:
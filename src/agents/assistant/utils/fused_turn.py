@@ -0,0 +1,101 @@
+import os
+import json
+from typing import Dict, Optional
+
+from src.utils.tracing import logger
+from src.utils.llm_metrics import chat_completion
+from src.memory.singleton import get_memory_manager
+from src.agents.assistant.prompts import FUSED_TURN_SYSTEM, FUSED_TURN_PROMPT
+from .scorer import CATEGORY_CONFIG
+
+# One structured call instead of classifier + extractor + reply (opt-in)
+ASSISTANT_FUSED_TURN = os.getenv("ASSISTANT_FUSED_TURN", "0") == "1"
+
+REPLY_KINDS = ("continue", "ready")
+
+def _completeness_rules() -> str:
+  return "\n".join(
+    f"- {category}: weight {config['weight']}, min {config['min_items']} items"
+    for category, config in CATEGORY_CONFIG.items()
+    if config["required"]
+  )
+
+def _valid_requirements(value) -> Optional[Dict]:
+  """Known categories -> list of non-empty strings, None if malformed"""
+  if not isinstance(value, dict):
+    return None
+
+  requirements = {}
+  for category, items in value.items():
+    if category not in CATEGORY_CONFIG:
+      continue
+    if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+      return None
+    cleaned = [item.strip() for item in items if item.strip()]
+    if cleaned:
+      requirements[category] = cleaned
+  return requirements
+
+def fused_turn(
+  user_message: str,
+  current_requirements: Dict,
+  user_language: str,
+  offer_pending: bool
+) -> Dict:
+  """
+  Classify confirmation, extract requirements and draft the reply in one call
+
+  Returns:
+    {"is_confirmed", "requirements", "reply_kind", "reply"}; a field that is
+    missing or fails validation is None and the caller uses the regular path
+  """
+  fallback = {"is_confirmed": None, "requirements": None, "reply_kind": None, "reply": None}
+  client = get_memory_manager().get_client()
+
+  prompt = FUSED_TURN_PROMPT.format(
+    user_message=user_message,
+    offer_pending="true" if offer_pending else "false",
+    current_requirements=json.dumps(current_requirements, indent=2, ensure_ascii=False) if current_requirements else "{}",
+    completeness_rules=_completeness_rules(),
+    user_language=user_language
+  )
+
+  try:
+    response = chat_completion(
+      client,
+      "fused_turn",
+      model="gpt-4o-mini",
+      messages=[
+        {"role": "system", "content": FUSED_TURN_SYSTEM},
+        {"role": "user", "content": prompt}
+      ],
+      response_format={"type": "json_object"},
+      temperature=0.4
+    )
+    data = json.loads(response.choices[0].message.content)
+
+  except Exception as e:
+    logger.log("FUSED_TURN_ERROR", f"Fused turn failed, using regular path: {e}", level="ERROR")
+    return fallback
+
+  if not isinstance(data, dict):
+    return fallback
+
+  reply = data.get("reply")
+  reply_kind = data.get("reply_kind")
+  valid_reply = isinstance(reply, str) and reply.strip() and reply_kind in REPLY_KINDS
+
+  result = {
+    "is_confirmed": data.get("is_confirmed") if isinstance(data.get("is_confirmed"), bool) else None,
+    "requirements": _valid_requirements(data.get("requirements")),
+    "reply_kind": reply_kind if valid_reply else None,
+    "reply": reply.strip() if valid_reply else None
+  }
+
+  logger.log("FUSED_TURN", "Fused turn result",
+            data={
+              "is_confirmed": result["is_confirmed"],
+              "requirements_valid": result["requirements"] is not None,
+              "reply_kind": result["reply_kind"]
+            }, level="INFO")
+  return result
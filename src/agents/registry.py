@@ -0,0 +1,47 @@
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from src.utils.tracing import logger
+
+class GraphRegistry:
+  """
+  Process-wide registry of compiled LangGraph apps
+
+  Each graph is built and compiled once, then shared by every session.
+  Compiled graphs are stateless; conversations are isolated by the
+  thread_id passed in the run config.
+
+  Usage:
+    app = graph_registry.get("assistant", create_assistant_graph)
+  """
+
+  def __init__(self):
+    self._graphs: Dict[str, Any] = {}
+    self._lock = threading.Lock()
+
+  def get(self, name: str, builder: Callable[[], Any]) -> Any:
+    """Return the compiled graph, building it on first use"""
+    graph = self._graphs.get(name)
+    if graph is not None:
+      return graph
+
+    with self._lock:
+      # Another session may have built it while we waited for the lock
+      graph = self._graphs.get(name)
+      if graph is None:
+        graph = builder()
+        self._graphs[name] = graph
+        logger.log("GRAPH_REGISTRY", f"Compiled graph cached: {name}", level="INFO")
+
+    return graph
+
+  def reset(self, name: Optional[str] = None):
+    """Drop one (or every) cached graph so it is rebuilt on next use"""
+    with self._lock:
+      if name is None:
+        self._graphs.clear()
+      else:
+        self._graphs.pop(name, None)
+
+# Global registry instance
+graph_registry = GraphRegistry()
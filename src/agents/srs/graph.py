@@ -1,9 +1,19 @@
+from typing import Dict, Optional
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.runnables import RunnableLambda
 
 from .state import SRSState
 from src.utils.tracing import logger
-from .nodes import research_node, planning_node, worker_node, synthesis_node
+from src.memory.checkpointer import get_checkpointer, new_run_thread_id, release_thread
+from src.agents.registry import graph_registry
+from src.utils.metrics import timed_node
+from .nodes import (
+  research_node, aresearch_node,
+  planning_node, aplanning_node,
+  worker_node, aworker_node,
+  synthesis_node, asynthesis_node
+)
+from .nodes.workers import worker_memo, parse_requirements, SRS_INCREMENTAL_REGEN
 
 def should_continue(state: SRSState) -> str:
   phase = state.get("current_phase", "")
@@ -24,11 +34,18 @@ def create_srs_graph():
   """
   workflow = StateGraph(SRSState)
 
-  # Add nodes
-  workflow.add_node("research", research_node)
-  workflow.add_node("planning", planning_node)   
-  workflow.add_node("workers", worker_node)       
-  workflow.add_node("synthesis", synthesis_node)
+  # Add nodes (sync for stream(), async for astream()), each timed per stage
+  for name, func, afunc in [
+    ("research", research_node, aresearch_node),
+    ("planning", planning_node, aplanning_node),
+    ("workers", worker_node, aworker_node),
+    ("synthesis", synthesis_node, asynthesis_node)
+  ]:
+    workflow.add_node(name, RunnableLambda(
+      timed_node("srs", name, func),
+      afunc=timed_node("srs", name, afunc),
+      name=name
+    ))
 
   workflow.set_entry_point("research")
 
@@ -69,46 +86,86 @@ def create_srs_graph():
     }
   )
 
-  memory = MemorySaver()
+  memory = get_checkpointer()
   app = workflow.compile(checkpointer=memory)
   return app
 
-async def generate_srs_langgraph(project_query: str) -> str:
+def get_srs_graph():
   """
-  Generate SRS using LangGraph
+  Get the compiled SRS graph (built once per process, shared by sessions)
   """
-  logger.start_session(project_query)
-  
-  print("\n" + "="*80)
-  print("SRS MULTI-AGENT SYSTEM - LANGGRAPH VERSION")
-  print("="*80 + "\n")
+  return graph_registry.get("srs", create_srs_graph)
+
+def initial_srs_state(project_query: str, previous_run: Optional[Dict] = None) -> SRSState:
+  """
+  Initial state for one SRS run
   
-  # Create graph
-  app = create_srs_graph()
+  Args:
+    previous_run: srs_run_snapshot of the last generation; its unchanged
+      workers are reused instead of rerun
+  """
+  previous_run = previous_run if SRS_INCREMENTAL_REGEN and previous_run else {}
   
-  # Initial state
-  initial_state = {
+  return {
     "project_query": project_query,
     "research_results": [],
+    "research_sources": [],
+    "research_tokens_saved": 0,
     "agent_plan": [],
+    "previous_plan": previous_run.get("agent_plan", []),
+    "worker_memo": previous_run.get("worker_memo", {}),
     "worker_outputs": [],
     "final_srs": "",
     "current_phase": "start",
     "messages": []
   }
+
+def srs_run_snapshot(final_state: SRSState) -> Dict:
+  """
+  What the next regeneration needs from a finished run: its plan and the
+  output of every worker, keyed by worker fingerprint
+  """
+  return {
+    "agent_plan": final_state.get("agent_plan", []),
+    "worker_memo": worker_memo(
+      final_state.get("agent_plan", []),
+      final_state.get("worker_outputs", []),
+      parse_requirements(final_state.get("project_query", ""))
+    )
+  }
+
+async def generate_srs_langgraph(project_query: str) -> str:
+  """
+  Generate SRS using LangGraph (async end to end, never blocks the event loop)
+  """
+  logger.start_session(project_query)
+  
+  print("\n" + "="*80)
+  print("SRS MULTI-AGENT SYSTEM - LANGGRAPH VERSION")
+  print("="*80 + "\n")
+  
+  # Get compiled graph
+  app = get_srs_graph()
+  
+  # Initial state
+  initial_state = initial_srs_state(project_query)
   
-  # Run the graph
-  config = {"configurable": {"thread_id": "srs_session_1"}}
+  # Run the graph (one thread per run, released once the document is out)
+  thread_id = new_run_thread_id("srs")
+  config = {"configurable": {"thread_id": thread_id}}
   
   logger.log("GRAPH_START", "Executing LangGraph workflow", level="INFO")
   
   final_state = None
-  for output in app.stream(initial_state, config):
-    # Each iteration gives us the state after a node execution
-    node_name = list(output.keys())[0]
-    node_state = output[node_name]
-    logger.log("GRAPH_STEP", f"Completed node: {node_name}", level="INFO")
-    final_state = node_state
+  try:
+    async for output in app.astream(initial_state, config):
+      # Each iteration gives us the state after a node execution
+      node_name = list(output.keys())[0]
+      node_state = output[node_name]
+      logger.log("GRAPH_STEP", f"Completed node: {node_name}", level="INFO")
+      final_state = node_state
+  finally:
+    release_thread(thread_id)
   
   logger.log("GRAPH_COMPLETE", "LangGraph workflow finished", level="SUCCESS")
   
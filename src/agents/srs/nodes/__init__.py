@@ -1,11 +1,24 @@
-from .research import research_node
-from .planning import planning_node
-from .workers import worker_node
-from .synthesis import synthesis_node
+from .research import (
+  research_node,
+  aresearch_node,
+  research_prefetch,
+  SRS_RESEARCH_PREFETCH,
+  SRS_PREFETCH_THRESHOLD
+)
+from .planning import planning_node, aplanning_node
+from .workers import worker_node, aworker_node
+from .synthesis import synthesis_node, asynthesis_node
 
 __all__ = [
   "research_node",
+  "aresearch_node",
+  "research_prefetch",
+  "SRS_RESEARCH_PREFETCH",
+  "SRS_PREFETCH_THRESHOLD",
   "planning_node",
+  "aplanning_node",
   "worker_node",
-  "synthesis_node"
-]
\ No newline at end of file
+  "aworker_node",
+  "synthesis_node",
+  "asynthesis_node"
+]
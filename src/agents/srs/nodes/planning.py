@@ -1,58 +1,101 @@
 import json
+import asyncio
+from typing import Dict, List, Optional, Tuple
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, ToolMessage
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 
-from src.agents.srs.prompts import PLANNER_PROMPT
+from src.agents.srs.prompts import PLANNER_PROMPT, PLANNER_REVISION_PROMPT
 from src.utils.tracing import logger
+from src.utils.llm_metrics import LLMMetricsHandler
+from src.utils.concurrency import run_concurrently
+from src.utils.prompt_budget import fit_texts, PLANNER_RESEARCH_BUDGET, PLANNER_TOOL_RESULTS_BUDGET
 from src.agents.srs.state import SRSState
-from src.tools import tools, tavily_search
+from src.tools import tools, search_web, asearch_web, format_search_results
+from src.utils.dedup import ResearchCorpus
 
 # =============================== CONFIGURATION ================================
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
+llm = ChatOpenAI(
+  model="gpt-4o-mini",
+  temperature=0.7,
+  callbacks=[LLMMetricsHandler("planning")]
+)
 llm_with_tools = llm.bind_tools(tools)
 
-# ================================ PLANNING NODE ===============================
-def planning_node(state: SRSState) -> SRSState:
-  """
-  Node 2: Planning phase - create agent execution plan
-  """
-  logger.log("NODE_START", "Planning Node", level="AGENT")
-  
+# =================================== HELPERS ==================================
+MAX_TOOL_CALLS = 3
+
+def _build_planning_prompt(state: SRSState) -> Tuple[List[HumanMessage], str]:
   project_query = state["project_query"]
-  research_summary = "\n\n".join(state["research_results"])
+  research_summary = "\n\n".join(
+    fit_texts(state["research_results"], PLANNER_RESEARCH_BUDGET, "Planner research")
+  )
   
   safe_prompt = PLANNER_PROMPT.replace("{", "{{").replace("}", "}}")
   safe_prompt = safe_prompt.replace("{{project_query}}", "{project_query}")
   safe_prompt = safe_prompt.replace("{{research_summary}}", "{research_summary}")
 
-  planning_prompt = [HumanMessage(content=safe_prompt.format(
+  content = safe_prompt.format(
     project_query=project_query,
     research_summary=research_summary
-  ))]
+  )
   
-  response = llm_with_tools.invoke(planning_prompt)
+  # Regeneration: ask the planner to keep unaffected agents verbatim
+  if state.get("previous_plan"):
+    content += PLANNER_REVISION_PROMPT.format(
+      previous_plan=json.dumps(state["previous_plan"], indent=2, ensure_ascii=False)
+    )
   
-  if response.tool_calls:
-    max_tool_calls = 3
-        
-    if len(response.tool_calls) > max_tool_calls:
-      logger.log("LIMIT_REACHED", f"LLM requested {len(response.tool_calls)} tools. Truncating to {max_tool_calls}.", level="WARNING")
-      response.tool_calls = response.tool_calls[:max_tool_calls]
-      
-    tool_outputs = []
-    for idx, tool_call in enumerate(response.tool_calls, 1):
-      logger.log("PLANNER_SEARCH", f"Additional search {idx}/{len(response.tool_calls)}", level="TOOL")
-      
-      result = tavily_search.invoke(tool_call["args"])
-      tool_outputs.append(ToolMessage(
-          content=str(result), 
-          tool_call_id=tool_call["id"]
-      ))
+  planning_prompt = [HumanMessage(content=content)]
+  
+  return planning_prompt, research_summary
+
+def _limit_tool_calls(response: AIMessage):
+  if len(response.tool_calls) > MAX_TOOL_CALLS:
+    logger.log("LIMIT_REACHED", f"LLM requested {len(response.tool_calls)} tools. Truncating to {MAX_TOOL_CALLS}.", level="WARNING")
+    response.tool_calls = response.tool_calls[:MAX_TOOL_CALLS]
     
-    final_response = llm.invoke(planning_prompt + [response] + tool_outputs)
-    plan_content = final_response.content
-  else:
-    plan_content = response.content
+  for idx, tool_call in enumerate(response.tool_calls, 1):
+    logger.log("PLANNER_SEARCH", f"Additional search {idx}/{len(response.tool_calls)}", level="TOOL")
+
+def _tool_call_args(tool_call: Dict) -> Tuple[str, str]:
+  args = tool_call["args"]
+  query = args.get("query", "")
+  logger.log("TOOL_CALL", f"Tavily Search: {query}",
+            data={"search_depth": args.get("search_depth", "advanced")}, level="TOOL")
+  return query, args.get("search_depth", "advanced")
+
+def _tool_message(corpus: ResearchCorpus, tool_call: Dict, results: List[Dict]) -> ToolMessage:
+  """Only results not already in the research corpus go back to the LLM"""
+  unique = corpus.add(results)
+  content = format_search_results(unique) or "No new results (already covered by the research above)."
+  return ToolMessage(content=content, tool_call_id=tool_call["id"])
+
+def _search_error(tool_call: Dict, error: Exception) -> ToolMessage:
+  logger.log("TOOL_ERROR", f"Tavily search failed: {str(error)}", level="ERROR")
+  return ToolMessage(content=f"Search error: {str(error)}", tool_call_id=tool_call["id"])
+
+def _budget_tool_outputs(tool_outputs: List[ToolMessage]) -> List[ToolMessage]:
+  """Fit the extra search results into the planner's tool-result budget"""
+  contents = fit_texts(
+    [message.content for message in tool_outputs],
+    PLANNER_TOOL_RESULTS_BUDGET,
+    "Planner tool results"
+  )
+  return [
+    ToolMessage(content=content, tool_call_id=message.tool_call_id)
+    for message, content in zip(tool_outputs, contents)
+  ]
+
+def _finish_planning(
+  state: SRSState,
+  plan_content: str,
+  research_summary: str,
+  corpus: Optional[ResearchCorpus] = None
+) -> SRSState:
+  """
+  Parse the plan (or fall back to the default team) and update state
+  """
+  project_query = state["project_query"]
   
   # Parse plan
   try:
@@ -112,8 +155,81 @@ def planning_node(state: SRSState) -> SRSState:
     ]
     logger.log("NODE_WARNING", "Using fallback plan with 3 agents", level="WARNING")
   
+  # Extra searches were deduplicated against the research corpus
+  tokens_saved = state.get("research_tokens_saved", 0)
+  if corpus is not None:
+    tokens_saved += corpus.tokens_saved
+    logger.log("RESEARCH_DEDUP", "Planner searches deduplicated",
+              data={**corpus.stats(), "run_tokens_saved": tokens_saved}, level="INFO")
+  
   return {
     **state,
     "agent_plan": agent_plan,
+    "research_sources": corpus.results if corpus is not None else state.get("research_sources", []),
+    "research_tokens_saved": tokens_saved,
     "current_phase": "planning_complete"
-  }
\ No newline at end of file
+  }
+
+# ================================ PLANNING NODE ===============================
+def planning_node(state: SRSState) -> SRSState:
+  """
+  Node 2: Planning phase - create agent execution plan
+  """
+  logger.log("NODE_START", "Planning Node", level="AGENT")
+  
+  planning_prompt, research_summary = _build_planning_prompt(state)
+  
+  response = llm_with_tools.invoke(planning_prompt)
+  
+  corpus = None
+  if response.tool_calls:
+    _limit_tool_calls(response)
+    corpus = ResearchCorpus.from_results(state.get("research_sources", []))
+    
+    def run_tool_call(tool_call: Dict) -> ToolMessage:
+      query, search_depth = _tool_call_args(tool_call)
+      try:
+        return _tool_message(corpus, tool_call, search_web(query, search_depth=search_depth))
+      except Exception as e:
+        return _search_error(tool_call, e)
+    
+    # Dispatch all extra searches at once, each result keeps its tool_call_id
+    tool_outputs = run_concurrently(run_tool_call, response.tool_calls)
+    
+    final_response = llm.invoke(planning_prompt + [response] + _budget_tool_outputs(tool_outputs))
+    plan_content = final_response.content
+  else:
+    plan_content = response.content
+  
+  return _finish_planning(state, plan_content, research_summary, corpus)
+
+async def aplanning_node(state: SRSState) -> SRSState:
+  """
+  Node 2 (async): same as planning_node, without blocking the event loop
+  """
+  logger.log("NODE_START", "Planning Node", level="AGENT")
+  
+  planning_prompt, research_summary = _build_planning_prompt(state)
+  
+  response = await llm_with_tools.ainvoke(planning_prompt)
+  
+  corpus = None
+  if response.tool_calls:
+    _limit_tool_calls(response)
+    corpus = ResearchCorpus.from_results(state.get("research_sources", []))
+    
+    async def run_tool_call(tool_call: Dict) -> ToolMessage:
+      query, search_depth = _tool_call_args(tool_call)
+      try:
+        return _tool_message(corpus, tool_call, await asearch_web(query, search_depth=search_depth))
+      except Exception as e:
+        return _search_error(tool_call, e)
+    
+    tool_outputs = await asyncio.gather(*(run_tool_call(tc) for tc in response.tool_calls))
+    
+    final_response = await llm.ainvoke(planning_prompt + [response] + _budget_tool_outputs(list(tool_outputs)))
+    plan_content = final_response.content
+  else:
+    plan_content = response.content
+  
+  return _finish_planning(state, plan_content, research_summary, corpus)
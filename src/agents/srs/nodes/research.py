@@ -1,41 +1,278 @@
-from src.tools import tavily_search
+import os
+import time
+import asyncio
+import hashlib
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Tuple
+
+from src.tools import search_web, asearch_web, format_search_results
+from src.utils.dedup import ResearchCorpus
 from src.utils.tracing import logger
+from src.utils.concurrency import run_concurrently
+from src.utils.metrics import CACHE_HITS, CACHE_MISSES
 from src.agents.srs.state import SRSState
 
-# ================================ RESERCH NODE ================================
-def research_node(state: SRSState) -> SRSState:
+# =============================== CONFIGURATION ================================
+MAX_SEARCHES = 3
+
+# Seconds to wait for the research searches before moving on to planning
+RESEARCH_QUERY_TIMEOUT = float(os.getenv("SRS_RESEARCH_QUERY_TIMEOUT", "20"))
+
+# Speculative research while the requirements approach readiness (opt-in)
+SRS_RESEARCH_PREFETCH = os.getenv("SRS_RESEARCH_PREFETCH", "0") == "1"
+# Completeness score that starts the prefetch (readiness itself is 0.8)
+SRS_PREFETCH_THRESHOLD = float(os.getenv("SRS_PREFETCH_THRESHOLD", "0.6"))
+# Seconds an unclaimed prefetch is kept
+SRS_PREFETCH_TTL_SECONDS = float(os.getenv("SRS_PREFETCH_TTL_SECONDS", "900"))
+# Slack for a prefetch to hand back its partial results after its own deadline
+PREFETCH_GRACE_SECONDS = 1.0
+
+# =================================== HELPERS ==================================
+def _research_queries(project_query: str) -> List[str]:
   """
-  Node 1: Research phase - gather information before planning
+  Define research queries (MAX 3 as per requirement)
   """
-  logger.log("NODE_START", "Research Node", level="AGENT")
-  
-  project_query = state["project_query"]
-  
-  # Define research queries (MAX 3 as per requirement)
   research_queries = [
     f"modern software architecture for {project_query}",
     f"best practices {project_query} 2025",
     f"tech stack recommendations {project_query}"
   ]
   
+  short_queries = [query[:350] for query in research_queries[:MAX_SEARCHES]]
+  
+  for search_count, short_q in enumerate(short_queries, 1):
+    logger.log("RESEARCH_SEARCH", f"Search {search_count}/{MAX_SEARCHES}: {short_q[:50]}...", level="TOOL")
+  
+  return short_queries
+
+def _on_timeout(query: str) -> None:
+  logger.log("RESEARCH_TIMEOUT", f"Search timed out after {RESEARCH_QUERY_TIMEOUT}s: {query[:50]}...", level="WARNING")
+  return None
+
+def _search(query: str) -> Optional[List[Dict]]:
+  try:
+    return search_web(query, search_depth="advanced")
+  except Exception as e:
+    logger.log("TOOL_ERROR", f"Tavily search failed: {str(e)}", level="ERROR")
+    return []
+
+async def _asearch(query: str) -> Optional[List[Dict]]:
+  try:
+    return await asyncio.wait_for(asearch_web(query, search_depth="advanced"), timeout=RESEARCH_QUERY_TIMEOUT)
+  except asyncio.TimeoutError:
+    return _on_timeout(query)
+  except Exception as e:
+    logger.log("TOOL_ERROR", f"Tavily search failed: {str(e)}", level="ERROR")
+    return []
+
+def _research_complete(
+  state: SRSState,
+  queries: List[str],
+  search_results: List[Optional[List[Dict]]],
+  duration: float
+) -> SRSState:
+  """
+  Deduplicate the results across queries (canonical URL + near-duplicate
+  content) and format one research block per query
+  """
+  corpus = ResearchCorpus()
   research_results = []
-  search_count = 0
-  max_searches = 3
   
-  for query in research_queries[:max_searches]:
-    search_count += 1
-    short_q = query[:350] 
+  for query, results in zip(queries, search_results):
+    if results is None:
+      research_results.append(f"Search timed out: {query}")
+      continue
     
-    logger.log("RESEARCH_SEARCH", f"Search {search_count}/{max_searches}: {short_q[:50]}...", level="TOOL")
-    
-    result = tavily_search.invoke({"query": short_q, "search_depth": "advanced"})
-    research_results.append(result)
+    unique = corpus.add(results)
+    research_results.append(format_search_results(unique) or "No new results found.")
   
+  logger.log("RESEARCH_DEDUP", "Research corpus deduplicated", data=corpus.stats(), level="INFO")
   logger.log("NODE_COMPLETE", "Research Node - gathered info", 
-          data={"num_searches": search_count, "max_allowed": max_searches}, level="SUCCESS")
+          data={
+            "num_searches": len(research_results), 
+            "max_allowed": MAX_SEARCHES,
+            "duration_seconds": round(duration, 2)
+          }, level="SUCCESS")
   
   return {
     **state,  
     "research_results": research_results,
+    "research_sources": corpus.results,
+    "research_tokens_saved": corpus.tokens_saved,
     "current_phase": "research_complete"
-  }
\ No newline at end of file
+  }
+
+def _run_searches(project_query: str) -> Tuple[List[str], List[Optional[List[Dict]]]]:
+  short_queries = _research_queries(project_query)
+  return short_queries, run_concurrently(
+    _search,
+    short_queries,
+    timeout=RESEARCH_QUERY_TIMEOUT,
+    on_timeout=_on_timeout
+  )
+
+# ============================== RESEARCH PREFETCH =============================
+def research_fingerprint(project_query: str) -> str:
+  return hashlib.sha256(project_query.encode("utf-8")).hexdigest()
+
+class ResearchPrefetcher:
+  """
+  Speculative research keyed by the fingerprint of the SRS input
+
+  The assistant starts it once the completeness score crosses
+  SRS_PREFETCH_THRESHOLD; the research node reuses it when the confirmed
+  input has the same fingerprint. A session keeps at most one prefetch,
+  a changed fingerprint discards the previous one.
+  """
+  def __init__(self, max_workers: int = 2, ttl: float = SRS_PREFETCH_TTL_SECONDS):
+    self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="srs-prefetch")
+    self._lock = threading.Lock()
+    self._ttl = ttl
+    self._entries: Dict[str, Tuple[Future, float]] = {}  # fingerprint -> (future, started)
+    self._sessions: Dict[str, str] = {}  # session_id -> fingerprint
+    self._counts = {"started": 0, "reused": 0, "discarded": 0}
+
+  def _discard(self, fingerprint: str):
+    entry = self._entries.pop(fingerprint, None)
+    if entry:
+      # Searches already running finish in the background, the result is dropped
+      entry[0].cancel()
+      self._counts["discarded"] += 1
+
+  def _expire(self):
+    now = time.monotonic()
+    for fingerprint in [f for f, (_, started) in self._entries.items() if now - started > self._ttl]:
+      self._discard(fingerprint)
+    self._sessions = {s: f for s, f in self._sessions.items() if f in self._entries}
+
+  def start(self, session_id: str, project_query: str) -> bool:
+    """
+    Start research for project_query unless it is already prefetched
+
+    Returns:
+      True if a new prefetch was started
+    """
+    fingerprint = research_fingerprint(project_query)
+    
+    with self._lock:
+      self._expire()
+      
+      previous = self._sessions.get(session_id)
+      if previous and previous != fingerprint:
+        self._discard(previous)
+      self._sessions[session_id] = fingerprint
+      
+      if fingerprint in self._entries:
+        return False
+      
+      future = self._executor.submit(contextvars.copy_context().run, _run_searches, project_query)
+      self._entries[fingerprint] = (future, time.monotonic())
+      self._counts["started"] += 1
+    
+    logger.log("RESEARCH_PREFETCH", "Speculative research started",
+              data={"session_id": session_id, "fingerprint": fingerprint[:12]}, level="INFO")
+    return True
+
+  def claim(self, project_query: str) -> Optional[Tuple[Future, float]]:
+    """
+    Take the prefetch for project_query (None if the input changed or expired)
+
+    Returns:
+      (future, seconds left until its searches hit RESEARCH_QUERY_TIMEOUT);
+      a prefetch still queued behind other sessions is cancelled instead,
+      searching now is faster than waiting for a worker
+    """
+    fingerprint = research_fingerprint(project_query)
+    
+    with self._lock:
+      self._expire()
+      entry = self._entries.pop(fingerprint, None)
+      self._sessions = {s: f for s, f in self._sessions.items() if f != fingerprint}
+      if entry and entry[0].cancel():
+        self._counts["discarded"] += 1
+        entry = None
+      elif entry:
+        self._counts["reused"] += 1
+    
+    if entry is None:
+      CACHE_MISSES.inc(cache="research_prefetch")
+      return None
+    
+    future, started = entry
+    remaining = max(0.0, started + RESEARCH_QUERY_TIMEOUT - time.monotonic()) + PREFETCH_GRACE_SECONDS
+    
+    CACHE_HITS.inc(cache="research_prefetch")
+    logger.log("RESEARCH_PREFETCH_HIT", "Reusing speculative research",
+              data={"fingerprint": fingerprint[:12], "wait_seconds": round(remaining, 2)}, level="INFO")
+    return future, remaining
+
+  def stats(self) -> Dict:
+    with self._lock:
+      return {**self._counts, "pending": len(self._entries)}
+
+research_prefetch = ResearchPrefetcher()
+
+def _prefetch_failed(e: Exception):
+  logger.log("RESEARCH_PREFETCH_ERROR", f"Prefetched research unusable, searching again: {e}", level="WARNING")
+
+def _prefetch_timed_out(project_query: str) -> Tuple[List[str], List[Optional[List[Dict]]]]:
+  """
+  The prefetch used up the search budget: searching again would double the
+  wait, so every query is reported as timed out
+  """
+  short_queries = _research_queries(project_query)
+  return short_queries, [_on_timeout(query) for query in short_queries]
+
+# ================================ RESERCH NODE ================================
+def research_node(state: SRSState) -> SRSState:
+  """
+  Node 1: Research phase - gather information before planning
+  All searches run concurrently, results keep the query order
+  """
+  logger.log("NODE_START", "Research Node", level="AGENT")
+  
+  started = time.perf_counter()
+  
+  prefetched = research_prefetch.claim(state["project_query"])
+  if prefetched is not None:
+    future, remaining = prefetched
+    try:
+      short_queries, search_results = future.result(timeout=remaining)
+      return _research_complete(state, short_queries, search_results, time.perf_counter() - started)
+    except FutureTimeoutError:
+      short_queries, search_results = _prefetch_timed_out(state["project_query"])
+      return _research_complete(state, short_queries, search_results, time.perf_counter() - started)
+    except Exception as e:
+      _prefetch_failed(e)
+  
+  short_queries, search_results = _run_searches(state["project_query"])
+  
+  return _research_complete(state, short_queries, search_results, time.perf_counter() - started)
+
+async def aresearch_node(state: SRSState) -> SRSState:
+  """
+  Node 1 (async): same as research_node, without blocking the event loop
+  """
+  logger.log("NODE_START", "Research Node", level="AGENT")
+  
+  started = time.perf_counter()
+  
+  prefetched = research_prefetch.claim(state["project_query"])
+  if prefetched is not None:
+    future, remaining = prefetched
+    try:
+      short_queries, search_results = await asyncio.wait_for(asyncio.wrap_future(future), timeout=remaining)
+      return _research_complete(state, short_queries, search_results, time.perf_counter() - started)
+    except asyncio.TimeoutError:
+      short_queries, search_results = _prefetch_timed_out(state["project_query"])
+      return _research_complete(state, short_queries, search_results, time.perf_counter() - started)
+    except Exception as e:
+      _prefetch_failed(e)
+  
+  short_queries = _research_queries(state["project_query"])
+  
+  search_results = await asyncio.gather(*(_asearch(query) for query in short_queries))
+  
+  return _research_complete(state, short_queries, list(search_results), time.perf_counter() - started)
@@ -0,0 +1,277 @@
+import re
+import json
+import asyncio
+from typing import Callable, Dict, List, Optional
+from langchain_openai import ChatOpenAI
+from langchain_core.messages import HumanMessage
+
+from src.agents.srs.prompts import SYNTHESIS_SECTIONS, SYNTHESIS_OUTLINE_PROMPT, SYNTHESIS_SECTION_PROMPT
+from src.utils.tracing import logger
+from src.utils.llm_metrics import LLMMetricsHandler
+from src.utils.concurrency import run_concurrently
+from src.utils.prompt_budget import fit_texts, SYNTHESIS_OUTLINE_BUDGET, SYNTHESIS_SECTION_BUDGET
+
+# =============================== CONFIGURATION ================================
+outline_llm = ChatOpenAI(
+  model="gpt-4o-mini",
+  temperature=0.3,
+  callbacks=[LLMMetricsHandler("synthesis_outline")]
+).bind(response_format={"type": "json_object"})
+
+section_llm = ChatOpenAI(
+  model="gpt-4o-mini",
+  temperature=0.7,
+  callbacks=[LLMMetricsHandler("synthesis_section")]
+)
+
+# ================================== OUTLINE ===================================
+def _outline_prompt(project_query: str, worker_outputs: List[Dict]) -> str:
+  digests = fit_texts(
+    [output["output"] for output in worker_outputs],
+    SYNTHESIS_OUTLINE_BUDGET,
+    "Synthesis outline digest"
+  )
+  worker_digest = "\n\n".join(
+    f"Agent #{output['agent_index']} ({output['role']}):\n{digest}"
+    for output, digest in zip(worker_outputs, digests)
+  )
+
+  return SYNTHESIS_OUTLINE_PROMPT.format(
+    project_query=project_query,
+    section_titles="\n".join(f"- {section['title']}" for section in SYNTHESIS_SECTIONS),
+    worker_digest=worker_digest
+  )
+
+def _parse_outline(content: str, project_query: str, worker_outputs: List[Dict]) -> Dict:
+  """
+  Validate the outline; anything missing falls back to "every report is
+  relevant, no extra points" so the sections can still be written
+  """
+  all_agents = [output["agent_index"] for output in worker_outputs]
+
+  try:
+    data = json.loads(content)
+    if not isinstance(data, dict):
+      raise ValueError("Outline must be an object")
+  except Exception as e:
+    logger.log("OUTLINE_PARSE_ERROR", f"Failed to parse outline: {str(e)}", level="ERROR")
+    data = {}
+
+  features = data.get("features")
+  outline = {
+    "project_name": str(data.get("project_name") or project_query.split("\n")[0][:80]),
+    "summary": str(data.get("summary") or ""),
+    "features": [str(feature) for feature in features] if isinstance(features, list) else [],
+    "sections": {}
+  }
+
+  planned = data.get("sections") if isinstance(data.get("sections"), dict) else {}
+  for section in SYNTHESIS_SECTIONS:
+    entry = planned.get(section["title"])
+    entry = entry if isinstance(entry, dict) else {}
+
+    points = entry.get("points")
+    agents = [
+      agent for agent in entry.get("agents") or []
+      if isinstance(agent, int) and agent in all_agents
+    ] if isinstance(entry.get("agents"), list) else []
+
+    outline["sections"][section["title"]] = {
+      "points": [str(point) for point in points] if isinstance(points, list) else [],
+      "agents": agents or all_agents
+    }
+
+  logger.log("SYNTHESIS_OUTLINE", f"Outline ready - {len(outline['features'])} features",
+            data={
+              "project_name": outline["project_name"],
+              "agents_per_section": {
+                title: entry["agents"] for title, entry in outline["sections"].items()
+              }
+            }, level="INFO")
+  return outline
+
+def build_outline(project_query: str, worker_outputs: List[Dict]) -> Dict:
+  """Short shared outline: project name, feature list, per-section points and reports"""
+  response = outline_llm.invoke([HumanMessage(content=_outline_prompt(project_query, worker_outputs))])
+  return _parse_outline(response.content, project_query, worker_outputs)
+
+async def abuild_outline(project_query: str, worker_outputs: List[Dict]) -> Dict:
+  """Async version of build_outline"""
+  response = await outline_llm.ainvoke([HumanMessage(content=_outline_prompt(project_query, worker_outputs))])
+  return _parse_outline(response.content, project_query, worker_outputs)
+
+# ================================== SECTIONS ==================================
+def _section_prompt(project_query: str, outline: Dict, section: Dict, worker_outputs: List[Dict]) -> str:
+  """Section prompt with only the reports the outline marked as relevant"""
+  entry = outline["sections"][section["title"]]
+  relevant = [output for output in worker_outputs if output["agent_index"] in entry["agents"]]
+
+  fitted = fit_texts(
+    [output["output"] for output in relevant],
+    SYNTHESIS_SECTION_BUDGET,
+    f"Synthesis section {section['title']}"
+  )
+  relevant = [{**output, "output": text} for output, text in zip(relevant, fitted)]
+
+  return SYNTHESIS_SECTION_PROMPT.format(
+    project_query=project_query,
+    project_name=outline["project_name"],
+    summary=outline["summary"] or "-",
+    features=", ".join(outline["features"]) or "decided by the System Features section",
+    title=section["title"],
+    blueprint=section["blueprint"],
+    points="\n".join(f"- {point}" for point in entry["points"]) or "- Follow the blueprint",
+    worker_outputs=json.dumps(relevant, indent=2, ensure_ascii=False)
+  )
+
+# ================================== STITCHING =================================
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*$")
+_HEADING_NUMBER = re.compile(r"^(?:\d+|x)(?:\.(?:\d+|x))*\.?\s+")
+_REQ_ID = re.compile(r"\bREQ-(\d+)\b")
+
+# Requirement IDs are defined only in this section (see SYNTHESIS_SECTION_PROMPT)
+REQ_SECTION_TITLE = "System Features"
+
+def _clean_title(title: str) -> str:
+  title = title.strip().strip("*").strip()
+  return _HEADING_NUMBER.sub("", title).strip()
+
+def number_section(text: str, section: Dict, req_ids: Optional[Dict[str, str]] = None) -> str:
+  """
+  Give one generated section its final heading and IEEE numbering
+  (n.i / n.i.j / n.i.j.k), whatever the writer used. With req_ids, its
+  REQ IDs are renumbered REQ-1, REQ-2... in first-seen order.
+  """
+  lines = text.strip().split("\n")
+
+  # The writer's own section heading is replaced by the canonical one
+  if lines and _HEADING.match(lines[0]):
+    lines = lines[1:]
+
+  number = section["number"]
+  title = f"{number}. {section['title']}" if number else section["title"]
+
+  in_fence = False
+  levels = []
+  for line in lines:
+    if line.lstrip().startswith("```"):
+      in_fence = not in_fence
+    elif not in_fence and _HEADING.match(line):
+      levels.append(len(_HEADING.match(line).group(1)))
+
+  # Shallowest subsection heading becomes ###
+  shift = 3 - min(levels) if levels else 0
+  counters = [0, 0, 0]
+
+  out = [f"## {title}"]
+  in_fence = False
+  for line in lines:
+    if line.lstrip().startswith("```"):
+      in_fence = not in_fence
+
+    match = None if in_fence else _HEADING.match(line)
+    if match:
+      level = min(max(len(match.group(1)) + shift, 3), 6)
+      heading = _clean_title(match.group(2)) if number else match.group(2).strip()
+      depth = level - 3
+
+      if number and depth < len(counters):
+        counters[depth] += 1
+        for deeper in range(depth + 1, len(counters)):
+          counters[deeper] = 0
+        numbering = [str(number)] + [str(max(count, 1)) for count in counters[:depth + 1]]
+        heading = f"{'.'.join(numbering)} {heading}"
+
+      line = f"{'#' * level} {heading}"
+
+    out.append(line)
+
+  text = "\n".join(out).rstrip()
+  if req_ids is None:
+    return text
+
+  def renumber(match):
+    old = match.group(0)
+    if old not in req_ids:
+      req_ids[old] = f"REQ-{len(req_ids) + 1}"
+    return req_ids[old]
+
+  return _REQ_ID.sub(renumber, text)
+
+def document_header(outline: Dict) -> str:
+  return f"# SOFTWARE REQUIREMENTS SPECIFICATION (SRS): {outline['project_name']}"
+
+class SectionStitcher:
+  """
+  Stitches sections in document order as they complete
+
+  Sections finish in any order; each one is numbered and handed to emit
+  as soon as every section before it is done, so streaming listeners
+  still receive the document top to bottom.
+  """
+  def __init__(self, outline: Dict, emit: Optional[Callable[[str], None]] = None):
+    self._texts: Dict[int, str] = {}
+    self._parts = [document_header(outline)]
+    self._next = 0
+    self._emit = emit
+    if emit:
+      emit(self._parts[0] + "\n\n")
+
+  def add(self, position: int, text: str):
+    self._texts[position] = text
+    while self._next in self._texts:
+      section = SYNTHESIS_SECTIONS[self._next]
+      # Sections are written independently: their REQ IDs are not the same requirements,
+      # so only the section that defines them is renumbered
+      req_ids = {} if section["title"].startswith(REQ_SECTION_TITLE) else None
+      part = number_section(self._texts.pop(self._next), section, req_ids)
+      self._parts.append(part)
+      if self._emit:
+        self._emit(part + "\n\n")
+      self._next += 1
+
+  def document(self) -> str:
+    return "\n\n".join(self._parts) + "\n"
+
+# =============================== MAP-REDUCE SRS ===============================
+def synthesize_by_sections(project_query: str, worker_outputs: List[Dict], emit=None) -> str:
+  """
+  Outline, then every major section concurrently, then stitch in order
+  """
+  outline = build_outline(project_query, worker_outputs)
+  stitcher = SectionStitcher(outline, emit)
+
+  def write_section(position: int) -> str:
+    section = SYNTHESIS_SECTIONS[position]
+    logger.log("SECTION_START", f"Writing section: {section['title']}", level="AGENT")
+    prompt = _section_prompt(project_query, outline, section, worker_outputs)
+    return section_llm.invoke([HumanMessage(content=prompt)]).content
+
+  texts = run_concurrently(write_section, range(len(SYNTHESIS_SECTIONS)))
+  for position, text in enumerate(texts):
+    stitcher.add(position, text)
+
+  return stitcher.document()
+
+async def asynthesize_by_sections(project_query: str, worker_outputs: List[Dict], emit=None) -> str:
+  """
+  Async version of synthesize_by_sections; sections are stitched (and
+  emitted) as soon as they and every section before them are done
+  """
+  outline = await abuild_outline(project_query, worker_outputs)
+  stitcher = SectionStitcher(outline, emit)
+
+  async def write_section(position: int):
+    section = SYNTHESIS_SECTIONS[position]
+    logger.log("SECTION_START", f"Writing section: {section['title']}", level="AGENT")
+    prompt = _section_prompt(project_query, outline, section, worker_outputs)
+    response = await section_llm.ainvoke([HumanMessage(content=prompt)])
+    return position, response.content
+
+  for next_done in asyncio.as_completed([write_section(p) for p in range(len(SYNTHESIS_SECTIONS))]):
+    position, text = await next_done
+    logger.log("SECTION_COMPLETE", f"Section done: {SYNTHESIS_SECTIONS[position]['title']}",
+              data={"length": len(text)}, level="SUCCESS")
+    stitcher.add(position, text)
+
+  return stitcher.document()
@@ -5,32 +5,49 @@ from langchain_core.messages import HumanMessage
 
 from src.agents.srs.prompts import SYNTHESIS_PROMPT
 from src.utils.tracing import logger
+from src.utils.llm_metrics import LLMMetricsHandler
+from src.utils.streaming import get_token_listener
+from src.utils.prompt_budget import fit_texts, SYNTHESIS_WORKERS_BUDGET
 from src.agents.srs.state import SRSState
+from .sections import synthesize_by_sections, asynthesize_by_sections
 
 # =============================== CONFIGURATION ================================
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
+llm = ChatOpenAI(
+  model="gpt-4o-mini",
+  temperature=0.7,
+  stream_usage=True,
+  callbacks=[LLMMetricsHandler("synthesis")]
+)
 
-# =============================== SYNTHESIZE NODE ==============================
-def synthesis_node(state: SRSState) -> SRSState:
-  """
-  Node 4: Synthesis - create final SRS document
-  """
-  logger.log("NODE_START", "Synthesis Node", level="AGENT")
-  
+# "single": the whole document in one sequential generation, streamed token by token
+# "sections": outline, then every major section concurrently, then stitch
+# (faster, but listeners only receive whole sections, the first one late)
+SRS_SYNTHESIS_MODE = os.getenv("SRS_SYNTHESIS_MODE", "single")
+
+# =================================== HELPERS ==================================
+def _build_synthesis_prompt(state: SRSState) -> str:
   project_query = state["project_query"]
   worker_outputs = state["worker_outputs"]
   
+  # Fit the worker outputs into the synthesis budget (each gets a fair share)
+  fitted = fit_texts(
+    [output["output"] for output in worker_outputs],
+    SYNTHESIS_WORKERS_BUDGET,
+    "Synthesis worker outputs"
+  )
+  worker_outputs = [
+    {**output, "output": text} for output, text in zip(worker_outputs, fitted)
+  ]
+  
   # Format worker prompt
   worker_outputs_format = json.dumps(worker_outputs, indent=2, ensure_ascii=False)
   
-  synthesis_prompt = SYNTHESIS_PROMPT.format(
+  return SYNTHESIS_PROMPT.format(
     project_query=project_query, 
     worker_outputs=worker_outputs_format
   )
-  
-  response = llm.invoke([HumanMessage(content=synthesis_prompt)])
-  final_srs = response.content
-  
+
+def _synthesis_complete(state: SRSState, final_srs: str) -> SRSState:
   logger.log("NODE_COMPLETE", "Synthesis Node - SRS generated", 
             data={"doc_length": len(final_srs)}, level="SUCCESS")
   
@@ -38,4 +55,62 @@ def synthesis_node(state: SRSState) -> SRSState:
     **state,
     "final_srs": final_srs,
     "current_phase": "complete"
-  }
\ No newline at end of file
+  }
+
+# =============================== SYNTHESIZE NODE ==============================
+def synthesis_node(state: SRSState) -> SRSState:
+  """
+  Node 4: Synthesis - create final SRS document
+  """
+  logger.log("NODE_START", "Synthesis Node", level="AGENT")
+  
+  token_listener = get_token_listener()
+  
+  if SRS_SYNTHESIS_MODE == "sections":
+    final_srs = synthesize_by_sections(state["project_query"], state["worker_outputs"], emit=token_listener)
+    return _synthesis_complete(state, final_srs)
+  
+  synthesis_prompt = _build_synthesis_prompt(state)
+  
+  if token_listener is None:
+    response = llm.invoke([HumanMessage(content=synthesis_prompt)])
+    final_srs = response.content
+  else:
+    # Streaming mode: forward tokens to the UI/CLI as they arrive
+    logger.log("SYNTHESIS_STREAM", "Streaming SRS tokens to listener", level="INFO")
+    parts = []
+    for chunk in llm.stream([HumanMessage(content=synthesis_prompt)]):
+      if chunk.content:
+        parts.append(chunk.content)
+        token_listener(chunk.content)
+    final_srs = "".join(parts)
+  
+  return _synthesis_complete(state, final_srs)
+
+async def asynthesis_node(state: SRSState) -> SRSState:
+  """
+  Node 4 (async): same as synthesis_node, without blocking the event loop
+  """
+  logger.log("NODE_START", "Synthesis Node", level="AGENT")
+  
+  token_listener = get_token_listener()
+  
+  if SRS_SYNTHESIS_MODE == "sections":
+    final_srs = await asynthesize_by_sections(state["project_query"], state["worker_outputs"], emit=token_listener)
+    return _synthesis_complete(state, final_srs)
+  
+  synthesis_prompt = _build_synthesis_prompt(state)
+  
+  if token_listener is None:
+    response = await llm.ainvoke([HumanMessage(content=synthesis_prompt)])
+    final_srs = response.content
+  else:
+    logger.log("SYNTHESIS_STREAM", "Streaming SRS tokens to listener", level="INFO")
+    parts = []
+    async for chunk in llm.astream([HumanMessage(content=synthesis_prompt)]):
+      if chunk.content:
+        parts.append(chunk.content)
+        token_listener(chunk.content)
+    final_srs = "".join(parts)
+  
+  return _synthesis_complete(state, final_srs)
@@ -1,62 +1,313 @@
+import os
+import re
 import json
-from typing import Dict
+import time
+import asyncio
+import hashlib
+from typing import Dict, List, Optional
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
 
 from src.utils.tracing import logger
+from src.utils.llm_metrics import LLMMetricsHandler
+from src.utils.usage import usage_ledger
+from src.utils.concurrency import run_concurrently
+from src.utils.prompt_budget import fit_text, fit_fields, WORKER_TASK_BUDGET
 from src.agents.srs.state import SRSState
 from src.agents.srs.prompts import WORKER_PROMPT_TEMPLATE
 
 # =============================== CONFIGURATION ================================
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
+llm = ChatOpenAI(
+  model="gpt-4o-mini",
+  temperature=0.7,
+  callbacks=[LLMMetricsHandler("workers")]
+)
 
-# ================================ WORKER NODE =================================
-def worker_node(state: SRSState) -> SRSState:
+# Max number of sub-agents calling the LLM at the same time
+MAX_CONCURRENT_WORKERS = int(os.getenv("SRS_MAX_CONCURRENT_WORKERS", "5"))
+
+# Regenerations reuse the previous run's output of unchanged workers
+SRS_INCREMENTAL_REGEN = os.getenv("SRS_INCREMENTAL_REGEN", "1") == "1"
+
+# ================================ MEMOIZATION =================================
+_BULLET = re.compile(r"^(?:[-*•]|\d+[.)])\s+")
+
+def _normalize(text: str) -> str:
+  return " ".join(_BULLET.sub("", text.strip()).lower().split())
+
+def parse_requirements(project_query: str) -> Dict[str, List[str]]:
   """
-  Node 3: Worker execution - run all sub-agents
-  This node handles parallel execution internally
+  Split the SRS input (see trigger._format_requirements_for_srs) into
+  project-wide context lines ("Technology Stack: ...") and the items a
+  worker can cover ("Core Features: Task assignment")
+  """
+  context, items = [], []
+  category = ""
+  for raw in project_query.split("\n"):
+    line = " ".join(raw.split())
+    if not line:
+      continue
+    if _BULLET.match(line):
+      item = _BULLET.sub("", line)
+      items.append(f"{category}: {item}" if category else item)
+    elif line.endswith(":"):
+      category = line[:-1]
+    else:
+      context.append(line)
+  return {"context": context, "items": items}
+
+def requirement_slice(agent_config: Dict, requirements: Dict[str, List[str]]) -> List[str]:
+  """
+  Requirements a worker depends on: the project-wide context plus the items
+  the planner listed in requirements_covered (every item when it listed none
+  we can recognise, so a change anywhere reruns it)
   """
-  logger.log("NODE_START", "Worker Node - parallel execution", level="AGENT")
-  
-  agent_plan = state["agent_plan"]
-  
-  def run_single_worker(agent_config: Dict, index: int) -> Dict:
-    role = agent_config.get("agent_role", "Generic Agent")
-    specialty = agent_config.get("specialty", "")
-    task = agent_config.get("task", {})
-    
-    logger.log("WORKER_START", f"Agent #{index}: {role}", level="AGENT")
-    
-    # Format worker prompt
-    task_format = json.dumps(task, indent=2) if isinstance(task, dict) else str(task)
-    
-    worker_prompt = WORKER_PROMPT_TEMPLATE.format(
-      role=role,
-      specialty=specialty,
-      task=task_format
+  covered = agent_config.get("requirements_covered")
+  wanted = [_normalize(str(entry)) for entry in covered] if isinstance(covered, list) else []
+  wanted = [entry for entry in wanted if len(entry) >= 3]
+
+  picked = [
+    item for item in requirements["items"]
+    if any(
+      entry in _normalize(item) or _normalize(item.split(": ", 1)[-1]) in entry
+      for entry in wanted
     )
-    
-    response = llm.invoke([HumanMessage(content=worker_prompt)])
-    output_text = response.content
-    
-    logger.log("WORKER_COMPLETE", f"Agent #{index}: {role} done", level="SUCCESS")
-    
-    return {
-      "agent_index": index,
-      "role": role,
-      "output": output_text
-    }
+  ]
+  return requirements["context"] + (picked or requirements["items"])
+
+def worker_fingerprint(agent_config: Dict, requirements: Dict[str, List[str]]) -> str:
+  """
+  Hash of the worker's role and requirement slice plus the model and
+  template. The task text is left out: the planner rewords it on every run.
+  """
+  payload = json.dumps({
+    "role": agent_config.get("agent_role", "Generic Agent"),
+    "requirements": requirement_slice(agent_config, requirements),
+    "model": llm.model_name,
+    "template": WORKER_PROMPT_TEMPLATE
+  }, sort_keys=True, ensure_ascii=False, default=str)
+  return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def worker_memo(agent_plan: List[Dict], worker_outputs: List[Dict], requirements: Dict[str, List[str]]) -> Dict[str, str]:
+  """Fingerprint -> output of every worker that ran (or was reused) in a run"""
+  return {
+    worker_fingerprint(agent_plan[output["agent_index"] - 1], requirements): output["output"]
+    for output in worker_outputs
+    if 0 < output["agent_index"] <= len(agent_plan)
+  }
+
+def _log_plan_diff(
+  previous_plan: List[Dict],
+  agent_plan: List[Dict],
+  memo: Dict[str, str],
+  requirements: Dict[str, List[str]]
+):
+  previous_roles = {agent.get("agent_role") for agent in previous_plan}
+  current_roles = {agent.get("agent_role") for agent in agent_plan}
+  reused = [
+    agent.get("agent_role") for agent in agent_plan
+    if worker_fingerprint(agent, requirements) in memo
+  ]
   
+  logger.log("PLAN_DIFF", f"Regeneration: reusing {len(reused)} of {len(agent_plan)} workers",
+            data={
+              "reused": reused,
+              "changed": sorted(r for r in current_roles & previous_roles if r not in reused),
+              "added": sorted(current_roles - previous_roles),
+              "removed": sorted(previous_roles - current_roles)
+            }, level="INFO")
+
+def _reused_output(
+  agent_config: Dict,
+  index: int,
+  memo: Optional[Dict[str, str]],
+  requirements: Optional[Dict[str, List[str]]]
+) -> Optional[Dict]:
+  if not memo or requirements is None:
+    return None
+  output_text = memo.get(worker_fingerprint(agent_config, requirements))
+  if output_text is None:
+    return None
+  
+  role = agent_config.get("agent_role", "Generic Agent")
+  logger.log("WORKER_REUSED", f"Agent #{index}: {role} unchanged, reusing previous output", level="INFO")
+  return {
+    "agent_index": index,
+    "role": role,
+    "output": output_text
+  }
+
+# ================================ WORKER ENGINE ===============================
+def _build_worker_prompt(agent_config: Dict, index: int) -> tuple:
+  role = agent_config.get("agent_role", "Generic Agent")
+  specialty = agent_config.get("specialty", "")
+  task = agent_config.get("task", {})
+  
+  logger.log("WORKER_START", f"Agent #{index}: {role}", level="AGENT")
+  
+  # Format worker prompt (a task object is compacted field by field so it stays valid JSON)
+  if isinstance(task, dict):
+    task_format = json.dumps(fit_fields(task, WORKER_TASK_BUDGET, f"Worker #{index} task"), indent=2)
+  else:
+    task_format = fit_text(str(task), WORKER_TASK_BUDGET, f"Worker #{index} task")
+  
+  worker_prompt = WORKER_PROMPT_TEMPLATE.format(
+    role=role,
+    specialty=specialty,
+    task=task_format
+  )
+  
+  return role, worker_prompt
+
+def _worker_output(index: int, role: str, output_text: str, duration: float) -> Dict:
+  logger.log("WORKER_COMPLETE", f"Agent #{index}: {role} done", 
+            data={"agent_index": index, "duration_seconds": round(duration, 2)}, level="SUCCESS")
+  
+  return {
+    "agent_index": index,
+    "role": role,
+    "output": output_text
+  }
+
+def run_single_worker(agent_config: Dict, index: int) -> Dict:
+  """
+  Run one sub-agent and return its output
+  """
+  started = time.perf_counter()
+  role, worker_prompt = _build_worker_prompt(agent_config, index)
+  
+  response = llm.invoke([HumanMessage(content=worker_prompt)])
+  
+  return _worker_output(index, role, response.content, time.perf_counter() - started)
+
+async def arun_single_worker(agent_config: Dict, index: int) -> Dict:
+  """
+  Run one sub-agent without blocking the event loop
+  """
+  started = time.perf_counter()
+  role, worker_prompt = _build_worker_prompt(agent_config, index)
+  
+  response = await llm.ainvoke([HumanMessage(content=worker_prompt)])
+  
+  return _worker_output(index, role, response.content, time.perf_counter() - started)
+
+def run_workers(
+  agent_plan: List[Dict],
+  max_concurrency: int = MAX_CONCURRENT_WORKERS,
+  memo: Optional[Dict[str, str]] = None,
+  requirements: Optional[Dict[str, List[str]]] = None
+) -> List[Dict]:
+  """
+  Fan out every agent in the plan at once (bounded by max_concurrency)
+  Agents found in memo (worker_memo of the previous run, keyed against
+  parse_requirements of this run's input) are not rerun
+  Results are returned in agent_index order
+  """
   worker_outputs = []
+  indexed_agents = []
   for idx, agent in enumerate(agent_plan, 1):
-    output = run_single_worker(agent, idx)
-    worker_outputs.append(output)
-    
+    reused = _reused_output(agent, idx, memo, requirements)
+    if reused:
+      worker_outputs.append(reused)
+    else:
+      indexed_agents.append((idx, agent))
+  
+  worker_outputs += run_concurrently(
+    lambda item: run_single_worker(item[1], item[0]),
+    indexed_agents,
+    max_workers=max_concurrency
+  )
+  
+  return sorted(worker_outputs, key=lambda output: output["agent_index"])
+
+async def arun_workers(
+  agent_plan: List[Dict],
+  max_concurrency: int = MAX_CONCURRENT_WORKERS,
+  memo: Optional[Dict[str, str]] = None,
+  requirements: Optional[Dict[str, List[str]]] = None
+) -> List[Dict]:
+  """
+  Async version of run_workers (semaphore-bounded asyncio.gather)
+  """
+  semaphore = asyncio.Semaphore(max(1, max_concurrency))
+  
+  async def bounded(agent_config: Dict, index: int) -> Dict:
+    reused = _reused_output(agent_config, index, memo, requirements)
+    if reused:
+      return reused
+    async with semaphore:
+      return await arun_single_worker(agent_config, index)
+  
+  worker_outputs = await asyncio.gather(*(
+    bounded(agent, idx) for idx, agent in enumerate(agent_plan, 1)
+  ))
+  
+  return sorted(worker_outputs, key=lambda output: output["agent_index"])
+
+# ================================ WORKER NODE =================================
+def _run_memo(state: SRSState, requirements: Dict[str, List[str]]) -> Dict[str, str]:
+  """Previous run's worker outputs (empty on a first generation)"""
+  memo = state.get("worker_memo") or {}
+  if not memo:
+    return {}
+  
+  _log_plan_diff(state.get("previous_plan") or [], state["agent_plan"], memo, requirements)
+  return memo
+
+def _budgeted_plan(agent_plan: List[Dict], memo: Dict[str, str], requirements: Dict[str, List[str]]) -> List[Dict]:
+  """
+  Drop the last planned agents that need a new LLM call when the token
+  budget cannot cover them all (reused outputs cost nothing)
+  """
+  fresh = [agent for agent in agent_plan if worker_fingerprint(agent, requirements) not in memo]
+  limit = usage_ledger.worker_limit(len(fresh))
+  if limit >= len(fresh):
+    return agent_plan
+  
+  logger.log("WORKER_BUDGET", f"Token budget: running {limit} of {len(fresh)} new agents",
+            data={"remaining_tokens": usage_ledger.remaining_srs_tokens()}, level="WARNING")
+  dropped = {id(agent) for agent in fresh[limit:]}
+  return [agent for agent in agent_plan if id(agent) not in dropped]
+
+def _workers_complete(state: SRSState, agent_plan: List[Dict], worker_outputs: List[Dict], duration: float) -> SRSState:
+  """agent_plan is the plan that actually ran, agent_index refers to it"""
   logger.log("NODE_COMPLETE", f"Worker Node - {len(worker_outputs)} agents completed", 
-            data={"num_workers": len(worker_outputs)}, level="SUCCESS")
+            data={"num_workers": len(worker_outputs), "duration_seconds": round(duration, 2)}, level="SUCCESS")
   
   return {
     **state,
+    "agent_plan": agent_plan,
     "worker_outputs": worker_outputs,
     "current_phase": "workers_complete"
-  }
\ No newline at end of file
+  }
+
+def worker_node(state: SRSState) -> SRSState:
+  """
+  Node 3: Worker execution - run all sub-agents
+  This node handles parallel execution internally
+  """
+  logger.log("NODE_START", "Worker Node - parallel execution", 
+            data={"num_agents": len(state["agent_plan"]), "max_concurrency": MAX_CONCURRENT_WORKERS}, level="AGENT")
+  
+  started = time.perf_counter()
+  requirements = parse_requirements(state["project_query"])
+  memo = _run_memo(state, requirements)
+  agent_plan = _budgeted_plan(state["agent_plan"], memo, requirements)
+  worker_outputs = run_workers(agent_plan, memo=memo, requirements=requirements)
+  
+  return _workers_complete(state, agent_plan, worker_outputs, time.perf_counter() - started)
+
+async def aworker_node(state: SRSState) -> SRSState:
+  """
+  Node 3 (async): run all sub-agents concurrently on the event loop
+  """
+  logger.log("NODE_START", "Worker Node - parallel execution", 
+            data={"num_agents": len(state["agent_plan"]), "max_concurrency": MAX_CONCURRENT_WORKERS}, level="AGENT")
+  
+  started = time.perf_counter()
+  requirements = parse_requirements(state["project_query"])
+  memo = _run_memo(state, requirements)
+  agent_plan = _budgeted_plan(state["agent_plan"], memo, requirements)
+  worker_outputs = await arun_workers(agent_plan, memo=memo, requirements=requirements)
+  
+  return _workers_complete(state, agent_plan, worker_outputs, time.perf_counter() - started)
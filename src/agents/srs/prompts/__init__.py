@@ -1,4 +1,9 @@
-from .planner_prompt import PLANNER_PROMPT
+from .planner_prompt import PLANNER_PROMPT, PLANNER_REVISION_PROMPT
 from .worker_prompt import WORKER_PROMPT_TEMPLATE
-from .synthesis_prompt import SYNTHESIS_PROMPT
+from .synthesis_prompt import (
+  SYNTHESIS_PROMPT,
+  SYNTHESIS_SECTIONS,
+  SYNTHESIS_OUTLINE_PROMPT,
+  SYNTHESIS_SECTION_PROMPT
+)
 
@@ -67,6 +67,7 @@ You must:
 - Create **3 to 5 agents**.
 - Assign **professional personas** (Senior Frontend Engineer, Database Architect, Backend Engineer, AI Specialist, DevOps Lead, QA/Test Agent).
 - Provide each agent **full project context** inside their task payload so they never ask questions.
+- List in `requirements_covered` the requirement lines of the project (copied verbatim, without the leading "- ") that the agent's work depends on.
 
 ---
 
@@ -78,6 +79,7 @@ Return ONLY a JSON list in the exact structure below:
   {
     "agent_role": "Database Architect",
     "specialty": "Data modeling and optimization",
+    "requirements_covered": ["Order history per customer", "Must handle 10,000 concurrent users"],
     "task": {
       "objective": "Design database schema for [project]",
       "requirements": "Detailed list of what needs to be designed",
@@ -87,4 +89,17 @@ Return ONLY a JSON list in the exact structure below:
   }
 ]
 ```
-"""
\ No newline at end of file
+"""
+PLANNER_REVISION_PROMPT = """
+
+---
+
+## REGENERATION
+This SRS was generated before with the team below. The requirements may have changed.
+Keep every agent whose scope is NOT affected by the changes EXACTLY as it is
+(same agent_role and requirements_covered) so its previous work can be reused.
+Only rewrite, add or remove agents whose scope the changed requirements affect.
+
+PREVIOUS TEAM:
+{previous_plan}
+"""
@@ -72,4 +72,91 @@ You must output a COMPLETE SRS following this exact structure:
 - **NO Conversation**: Output the document directly. 
 - **NO Code Implementation**: Only logic and specifications. 
 - **Traceability**: Every REQ-ID must map to a feature.
-"""
\ No newline at end of file
+"""
+def _blueprint_sections(prompt: str) -> list:
+  """
+  Split the blueprint of SYNTHESIS_PROMPT into its major sections so the
+  section-parallel synthesis shares one source of truth with the single pass
+  """
+  blueprint = prompt.split("\n## 1. ", 1)[1].split("\n## OUTPUT FORMAT", 1)[0]
+  sections = []
+  for part in ("1. " + blueprint).split("\n## "):
+    heading, _, body = part.partition("\n")
+    number, _, title = heading.strip().partition(". ")
+    if not number.isdigit():
+      number, title = None, heading.strip()
+    sections.append({
+      "number": int(number) if number else None,
+      "title": title.strip(),
+      "blueprint": body.strip()
+    })
+  return sections
+
+SYNTHESIS_SECTIONS = _blueprint_sections(SYNTHESIS_PROMPT)
+
+SYNTHESIS_OUTLINE_PROMPT = """
+# ROLE: Lead Technical Architect
+
+You are planning a Software Requirements Specification (SRS) for:
+{project_query}
+
+Several writers will each write ONE section of it at the same time, so they need a shared outline.
+
+SRS SECTIONS:
+{section_titles}
+
+SPECIALIST REPORTS (digest):
+{worker_digest}
+
+Return ONLY this JSON structure:
+{{
+  "project_name": "Short product name",
+  "summary": "2-3 sentences describing the product",
+  "features": ["Feature name", "..."],
+  "sections": {{
+    "<section title>": {{
+      "points": ["Key point this section must cover", "..."],
+      "agents": [1, 2]
+    }}
+  }}
+}}
+
+Rules:
+- "features": the 4-8 system features, in the order the System Features section presents them.
+- "agents": the agent numbers (#) whose reports are relevant to that section.
+- Resolve conflicts between the reports in the points, so every writer follows the same decisions.
+"""
+
+SYNTHESIS_SECTION_PROMPT = """
+# ROLE: Lead Technical Architect & Documentation Specialist
+
+You are writing ONE section of the Software Requirements Specification (SRS) for:
+{project_query}
+
+SHARED OUTLINE (other writers follow it too - stay consistent with it):
+- Project name: {project_name}
+- Summary: {summary}
+- System features, in order: {features}
+
+WRITE ONLY THIS SECTION: {title}
+Blueprint of the section:
+{blueprint}
+
+Points to cover:
+{points}
+
+Relevant specialist reports:
+{worker_outputs}
+
+## OUTPUT FORMAT:
+- Start with the heading "## {title}".
+- Use ### for subsections and #### for their subsections, WITHOUT numbers (numbering is added afterwards).
+- Use **Mermaid.js** for diagrams and **Tables** for data dictionaries and requirements.
+- Language: Professional, Technical, "The system shall...".
+- Requirement IDs (REQ-1, REQ-2, ...) are defined ONLY in the System Features section.
+
+## CRITICAL RULES:
+- **NO Conversation**: Output the section directly, nothing before or after it.
+- **NO Code Implementation**: Only logic and specifications.
+- Do NOT write other sections.
+"""
@@ -10,7 +10,11 @@ class SRSState(TypedDict):
   
   # Planning phase
   research_results: List[str]
+  research_sources: List[Dict]   # deduplicated search results (title, url, content)
+  research_tokens_saved: int     # prompt tokens avoided by deduplication
   agent_plan: List[Dict]
+  previous_plan: List[Dict]      # plan of the previous generation (regeneration only)
+  worker_memo: Dict[str, str]    # worker fingerprint -> output of the previous generation
   
   # Execution phase
   worker_outputs: List[Dict]
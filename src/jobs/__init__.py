@@ -0,0 +1,71 @@
+import json
+import threading
+from typing import Dict, Optional
+
+from .store import JobStore, PostgresJobStore, create_job_store, JOB_QUEUED, JOB_RUNNING, JOB_COMPLETE, JOB_FAILED
+from .runner import SRSJobRunner
+
+# Global store and runner (one per process), created on first use so importing
+# this package opens no database and starts no threads
+_store = None
+_runner = None
+_lock = threading.Lock()
+
+def get_job_store() -> JobStore:
+  """Shared SRS job store (also holds the run state of inline generations)"""
+  global _store
+
+  with _lock:
+    if _store is None:
+      _store = create_job_store()
+  return _store
+
+def get_job_runner() -> SRSJobRunner:
+  """Shared background SRS job runner"""
+  global _runner
+
+  store = get_job_store()
+  with _lock:
+    if _runner is None:
+      _runner = SRSJobRunner(store)
+  return _runner
+
+def get_srs_job(job_id: str):
+  """Fetch a background SRS job (status, phase, partial_result, result)"""
+  return get_job_store().get(job_id)
+
+def save_srs_run(session_id: str, project_query: str, run: Dict) -> str:
+  """
+  Keep the run state (plan + worker memo) of an SRS generated inline, so the
+  conversation only stores its ID like it does for background jobs
+  """
+  store = get_job_store()
+  job_id = store.create(session_id, project_query)
+  store.update(
+    job_id,
+    status=JOB_COMPLETE,
+    phase="complete",
+    run_state=json.dumps(run, ensure_ascii=False)
+  )
+  return job_id
+
+def load_srs_run(job_id: Optional[str]) -> Optional[Dict]:
+  """Run state of a finished generation (srs_run_snapshot), None if unknown"""
+  job = get_job_store().get(job_id) if job_id else None
+  return json.loads(job["run_state"]) if job and job.get("run_state") else None
+
+__all__ = [
+  "JobStore",
+  "PostgresJobStore",
+  "create_job_store",
+  "SRSJobRunner",
+  "get_job_store",
+  "get_job_runner",
+  "get_srs_job",
+  "save_srs_run",
+  "load_srs_run",
+  "JOB_QUEUED",
+  "JOB_RUNNING",
+  "JOB_COMPLETE",
+  "JOB_FAILED"
+]
@@ -0,0 +1,148 @@
+import os
+import json
+import time
+import asyncio
+import threading
+from contextvars import copy_context
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from src.utils.tracing import logger
+from src.utils.langfuse_tracer import LangfuseTracer
+from src.utils.streaming import TokenBuffer, stream_tokens_to
+from src.memory.checkpointer import release_thread
+from src.utils.usage import usage_ledger
+from .store import JobStore, JOB_RUNNING, JOB_COMPLETE, JOB_FAILED, SRS_JOB_HEARTBEAT_SECONDS
+
+# =============================== CONFIGURATION ================================
+# Number of SRS pipelines running at the same time in this process
+SRS_JOB_WORKERS = int(os.getenv("SRS_JOB_WORKERS", "2"))
+
+# Seconds between partial-result writes while synthesis is streaming
+PARTIAL_FLUSH_SECONDS = 1.0
+
+# Phase shown once a node has finished
+PHASE_AFTER_NODE = {
+  "research": "planning",
+  "planning": "workers",
+  "workers": "synthesis",
+  "synthesis": "complete"
+}
+
+class SRSJobRunner:
+  """
+  Runs SRS generation in the background so the chat turn returns immediately
+
+  Usage:
+    job_id = get_job_runner().submit(session_id, project_query)
+    job = get_job_runner().store.get(job_id)  # status, phase, partial_result, result
+  """
+
+  def __init__(self, store: JobStore, max_workers: int = SRS_JOB_WORKERS):
+    self.store = store
+    self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="srs-job")
+
+    self._recover()
+
+    # Heartbeat for this process's jobs; also catches jobs of a process that
+    # died moments ago (not stale yet when this one started)
+    threading.Thread(target=self._heartbeat_loop, name="srs-job-heartbeat", daemon=True).start()
+
+  def _recover(self):
+    interrupted = self.store.fail_interrupted()
+    if interrupted:
+      logger.log("SRS_JOB_RECOVERY", f"Marked {interrupted} interrupted jobs as failed", level="WARNING")
+
+  def _heartbeat_loop(self):
+    while True:
+      time.sleep(SRS_JOB_HEARTBEAT_SECONDS)
+      try:
+        self.store.heartbeat()
+        self._recover()
+      except Exception as e:
+        logger.log("SRS_JOB_HEARTBEAT_ERROR", f"Job heartbeat failed: {e}", level="ERROR")
+
+  def submit(self, session_id: str, project_query: str, previous_run: Optional[Dict] = None) -> str:
+    """
+    Queue an SRS generation and return the job ID
+
+    Args:
+      previous_run: srs_run_snapshot of the last generation (regeneration)
+    """
+    job_id = self.store.create(session_id, project_query)
+    self._executor.submit(copy_context().run, self._run, job_id, session_id, project_query, previous_run)
+
+    logger.log("SRS_JOB_SUBMITTED", f"SRS job queued: {job_id}",
+              data={"session_id": session_id}, level="INFO")
+    return job_id
+
+  def _run(self, job_id: str, session_id: str, project_query: str, previous_run: Optional[Dict]):
+    """Worker thread entry point (own event loop per job)"""
+    try:
+      asyncio.run(self._arun(job_id, session_id, project_query, previous_run))
+    except Exception as e:
+      logger.log("SRS_JOB_FAILED", f"SRS job {job_id} failed: {str(e)}", level="ERROR")
+      self.store.update(job_id, status=JOB_FAILED, error=str(e))
+
+  async def _arun(self, job_id: str, session_id: str, project_query: str, previous_run: Optional[Dict]):
+    from src.agents.srs.graph import get_srs_graph, initial_srs_state, srs_run_snapshot
+
+    logger.bind_session(session_id)
+    self.store.update(job_id, status=JOB_RUNNING, phase="research")
+    logger.log("SRS_JOB_START", f"SRS job running: {job_id}", level="INFO")
+
+    tracer = LangfuseTracer("SRS Agent Execution")
+    tracer.start(input_data={"project_query": project_query[:200], "job_id": job_id})
+
+    # Persist the streamed synthesis so the UI can show it while it grows
+    buffer = TokenBuffer()
+    last_flush = [time.monotonic()]
+
+    def on_token(token: str):
+      buffer.append(token)
+      if time.monotonic() - last_flush[0] >= PARTIAL_FLUSH_SECONDS:
+        last_flush[0] = time.monotonic()
+        self.store.update(job_id, partial_result=buffer.text())
+
+    app = get_srs_graph()
+    # One thread per job: regenerations never pile onto the same history
+    thread_id = f"srs_{session_id}_{job_id}"
+    config = {"configurable": {"thread_id": thread_id}}
+
+    final_state = None
+    try:
+      with stream_tokens_to(on_token), usage_ledger.run_scope(job_id):
+        async for output in app.astream(initial_srs_state(project_query, previous_run), config):
+          node_name = list(output.keys())[0]
+          final_state = output[node_name]
+
+          logger.log("SRS_NODE_COMPLETE", f"SRS Agent node completed: {node_name}", level="INFO")
+          self.store.update(job_id, phase=PHASE_AFTER_NODE.get(node_name, node_name))
+
+      if not final_state or not final_state.get("final_srs"):
+        raise RuntimeError("SRS Agent returned no document")
+
+    except Exception as e:
+      tracer.end(output_data={"success": False, "error": str(e)})
+      raise
+    finally:
+      release_thread(thread_id)
+
+    srs_document = final_state["final_srs"]
+    self.store.update(
+      job_id,
+      status=JOB_COMPLETE,
+      phase="complete",
+      result=srs_document,
+      partial_result=None,
+      usage=json.dumps(usage_ledger.run_totals(job_id)),
+      run_state=json.dumps(srs_run_snapshot(final_state), ensure_ascii=False)
+    )
+
+    tracer.end(output_data={
+      "success": True,
+      "document_length": len(srs_document),
+      "word_count": len(srs_document.split())
+    })
+    logger.log("SRS_JOB_COMPLETE", f"SRS job finished: {job_id}",
+              data={"word_count": len(srs_document.split())}, level="SUCCESS")
@@ -0,0 +1,324 @@
+import os
+import time
+import uuid
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+
+from src.utils.tracing import logger
+from src.memory.checkpointer import CHECKPOINT_BACKEND
+
+# "postgres": jobs are visible to every replica sharing the database
+# "sqlite": local file, only the process (host) that created a job sees it
+# Follows CHECKPOINT_BACKEND by default, so jobs and conversations live together
+SRS_JOB_STORE_BACKEND = os.getenv(
+  "SRS_JOB_STORE_BACKEND",
+  "postgres" if CHECKPOINT_BACKEND == "postgres" else "sqlite"
+)
+SRS_JOB_STORE_CONNECT_TIMEOUT = float(os.getenv("SRS_JOB_STORE_CONNECT_TIMEOUT", "5"))
+JOB_STORE_PATH = os.getenv("SRS_JOB_STORE_PATH", os.path.join("data", "srs_jobs.db"))
+
+# Active jobs are touched every SRS_JOB_HEARTBEAT_SECONDS by their process;
+# a job of another process silent for SRS_JOB_STALE_SECONDS is orphaned
+SRS_JOB_HEARTBEAT_SECONDS = float(os.getenv("SRS_JOB_HEARTBEAT_SECONDS", "10"))
+SRS_JOB_STALE_SECONDS = float(os.getenv("SRS_JOB_STALE_SECONDS", "60"))
+
+# Identifies this process run. Unlike the PID it is never reused after a
+# restart (a container's app is PID 1 every time).
+BOOT_ID = uuid.uuid4().hex
+
+# Job lifecycle
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETE = "complete"
+JOB_FAILED = "failed"
+
+_COLUMNS = (
+  "id", "session_id", "status", "phase", "project_query",
+  "result", "partial_result", "error", "usage", "run_state", "owner_pid", "owner_boot",
+  "created_at", "updated_at"
+)
+
+class JobStore:
+  """
+  Durable SQLite store for background SRS jobs
+
+  A job survives page refreshes and restarts: its status, current phase
+  (research, planning, workers, synthesis) and result can be fetched by ID.
+  """
+
+  def __init__(self, path: str = JOB_STORE_PATH):
+    self.path = path
+    self._lock = threading.Lock()
+    self._conn = None
+
+  def _connect(self) -> sqlite3.Connection:
+    if self._conn is None:
+      directory = os.path.dirname(self.path)
+      if directory:
+        os.makedirs(directory, exist_ok=True)
+
+      conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+      conn.execute("PRAGMA journal_mode=WAL")
+      conn.execute("""
+        CREATE TABLE IF NOT EXISTS srs_jobs (
+          id TEXT PRIMARY KEY,
+          session_id TEXT NOT NULL,
+          status TEXT NOT NULL,
+          phase TEXT NOT NULL,
+          project_query TEXT NOT NULL,
+          result TEXT,
+          partial_result TEXT,
+          error TEXT,
+          usage TEXT,
+          run_state TEXT,
+          owner_pid INTEGER NOT NULL,
+          owner_boot TEXT,
+          created_at REAL NOT NULL,
+          updated_at REAL NOT NULL
+        )
+      """)
+      conn.execute("CREATE INDEX IF NOT EXISTS idx_srs_jobs_session ON srs_jobs (session_id, created_at)")
+
+      # Databases created before token accounting / incremental regeneration
+      columns = {row[1] for row in conn.execute("PRAGMA table_info(srs_jobs)")}
+      if "usage" not in columns:
+        conn.execute("ALTER TABLE srs_jobs ADD COLUMN usage TEXT")
+      if "run_state" not in columns:
+        conn.execute("ALTER TABLE srs_jobs ADD COLUMN run_state TEXT")
+      if "owner_boot" not in columns:
+        conn.execute("ALTER TABLE srs_jobs ADD COLUMN owner_boot TEXT")
+      conn.commit()
+      self._conn = conn
+    return self._conn
+
+  def create(self, session_id: str, project_query: str) -> str:
+    """Register a new queued job and return its ID"""
+    job_id = f"srs-job-{uuid.uuid4().hex[:12]}"
+    now = time.time()
+
+    with self._lock:
+      conn = self._connect()
+      conn.execute(
+        """
+        INSERT INTO srs_jobs (id, session_id, status, phase, project_query, owner_pid, owner_boot, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (job_id, session_id, JOB_QUEUED, "queued", project_query, os.getpid(), BOOT_ID, now, now)
+      )
+      conn.commit()
+
+    return job_id
+
+  def update(self, job_id: str, **fields):
+    """Update status / phase / result / partial_result / error / usage, run_state (JSON)"""
+    allowed = {"status", "phase", "result", "partial_result", "error", "usage", "run_state"}
+    unknown = set(fields) - allowed
+    if unknown:
+      raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    values = list(fields.values()) + [time.time(), job_id]
+
+    with self._lock:
+      conn = self._connect()
+      conn.execute(f"UPDATE srs_jobs SET {assignments}, updated_at = ? WHERE id = ?", values)
+      conn.commit()
+
+  def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch a job by ID"""
+    with self._lock:
+      conn = self._connect()
+      row = conn.execute(
+        f"SELECT {', '.join(_COLUMNS)} FROM srs_jobs WHERE id = ?",
+        (job_id,)
+      ).fetchone()
+    return dict(zip(_COLUMNS, row)) if row else None
+
+  def latest_for_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+    """Most recent job of a conversation"""
+    with self._lock:
+      conn = self._connect()
+      row = conn.execute(
+        f"""
+        SELECT {', '.join(_COLUMNS)} FROM srs_jobs
+        WHERE session_id = ? ORDER BY created_at DESC LIMIT 1
+        """,
+        (session_id,)
+      ).fetchone()
+    return dict(zip(_COLUMNS, row)) if row else None
+
+  def heartbeat(self, boot_id: str = BOOT_ID) -> int:
+    """Touch every queued/running job owned by this process run"""
+    with self._lock:
+      conn = self._connect()
+      touched = conn.execute(
+        "UPDATE srs_jobs SET updated_at = ? WHERE owner_boot = ? AND status IN (?, ?)",
+        (time.time(), boot_id, JOB_QUEUED, JOB_RUNNING)
+      ).rowcount
+      conn.commit()
+    return touched
+
+  def fail_interrupted(self, stale_seconds: float = SRS_JOB_STALE_SECONDS, boot_id: str = BOOT_ID) -> int:
+    """
+    Mark jobs left queued/running by a dead process as failed: owned by
+    another process run and without a heartbeat for stale_seconds
+    """
+    with self._lock:
+      conn = self._connect()
+      now = time.time()
+      rows = conn.execute(
+        """
+        SELECT id FROM srs_jobs
+        WHERE status IN (?, ?) AND (owner_boot IS NULL OR owner_boot != ?) AND updated_at < ?
+        """,
+        (JOB_QUEUED, JOB_RUNNING, boot_id, now - stale_seconds)
+      ).fetchall()
+
+      orphaned = [job_id for (job_id,) in rows]
+      for job_id in orphaned:
+        conn.execute(
+          "UPDATE srs_jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+          (JOB_FAILED, "Interrupted by a restart, please generate again", now, job_id)
+        )
+      conn.commit()
+
+    return len(orphaned)
+
+# =============================== POSTGRES STORE ===============================
+_PG_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS srs_jobs (
+  id TEXT PRIMARY KEY,
+  session_id TEXT NOT NULL,
+  status TEXT NOT NULL,
+  phase TEXT NOT NULL,
+  project_query TEXT NOT NULL,
+  result TEXT,
+  partial_result TEXT,
+  error TEXT,
+  usage TEXT,
+  run_state TEXT,
+  owner_pid INTEGER NOT NULL,
+  owner_boot TEXT,
+  created_at DOUBLE PRECISION NOT NULL,
+  updated_at DOUBLE PRECISION NOT NULL
+)
+"""
+
+class PostgresJobStore(JobStore):
+  """
+  JobStore in Postgres, next to the checkpoints
+
+  Same interface and table as the SQLite store; a job started by one replica
+  can be polled from any other (a load-balanced page refresh).
+  """
+
+  def __init__(self, pool):
+    self.pool = pool
+    with self.pool.connection() as conn:
+      conn.execute(_PG_SCHEMA_SQL)
+      conn.execute("CREATE INDEX IF NOT EXISTS idx_srs_jobs_session ON srs_jobs (session_id, created_at)")
+
+  def _execute(self, sql: str, params=()) -> int:
+    with self.pool.connection() as conn:
+      return conn.execute(sql, params).rowcount
+
+  def _fetch(self, sql: str, params=()) -> list:
+    with self.pool.connection() as conn:
+      return conn.execute(sql, params).fetchall()
+
+  def create(self, session_id: str, project_query: str) -> str:
+    """Register a new queued job and return its ID"""
+    job_id = f"srs-job-{uuid.uuid4().hex[:12]}"
+    now = time.time()
+    self._execute(
+      """
+      INSERT INTO srs_jobs (id, session_id, status, phase, project_query, owner_pid, owner_boot, created_at, updated_at)
+      VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+      """,
+      (job_id, session_id, JOB_QUEUED, "queued", project_query, os.getpid(), BOOT_ID, now, now)
+    )
+    return job_id
+
+  def update(self, job_id: str, **fields):
+    """Update status / phase / result / partial_result / error / usage, run_state (JSON)"""
+    allowed = {"status", "phase", "result", "partial_result", "error", "usage", "run_state"}
+    unknown = set(fields) - allowed
+    if unknown:
+      raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+
+    assignments = ", ".join(f"{name} = %s" for name in fields)
+    values = list(fields.values()) + [time.time(), job_id]
+    self._execute(f"UPDATE srs_jobs SET {assignments}, updated_at = %s WHERE id = %s", values)
+
+  def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch a job by ID"""
+    rows = self._fetch(f"SELECT {', '.join(_COLUMNS)} FROM srs_jobs WHERE id = %s", (job_id,))
+    return dict(zip(_COLUMNS, rows[0])) if rows else None
+
+  def latest_for_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+    """Most recent job of a conversation"""
+    rows = self._fetch(
+      f"""
+      SELECT {', '.join(_COLUMNS)} FROM srs_jobs
+      WHERE session_id = %s ORDER BY created_at DESC LIMIT 1
+      """,
+      (session_id,)
+    )
+    return dict(zip(_COLUMNS, rows[0])) if rows else None
+
+  def heartbeat(self, boot_id: str = BOOT_ID) -> int:
+    """Touch every queued/running job owned by this process run"""
+    return self._execute(
+      "UPDATE srs_jobs SET updated_at = %s WHERE owner_boot = %s AND status IN (%s, %s)",
+      (time.time(), boot_id, JOB_QUEUED, JOB_RUNNING)
+    )
+
+  def fail_interrupted(self, stale_seconds: float = SRS_JOB_STALE_SECONDS, boot_id: str = BOOT_ID) -> int:
+    """
+    Mark jobs left queued/running by a dead process as failed: owned by
+    another process run and without a heartbeat for stale_seconds
+    """
+    now = time.time()
+    rows = self._fetch(
+      """
+      UPDATE srs_jobs SET status = %s, error = %s, updated_at = %s
+      WHERE status IN (%s, %s) AND (owner_boot IS NULL OR owner_boot != %s) AND updated_at < %s
+      RETURNING id
+      """,
+      (JOB_FAILED, "Interrupted by a restart, please generate again", now,
+       JOB_QUEUED, JOB_RUNNING, boot_id, now - stale_seconds)
+    )
+    return len(rows)
+
+def create_job_store() -> JobStore:
+  """
+  Job store for SRS_JOB_STORE_BACKEND
+  Falls back to the local SQLite store when Postgres is not reachable.
+  """
+  if SRS_JOB_STORE_BACKEND == "postgres":
+    try:
+      from psycopg_pool import ConnectionPool
+      from src.memory.checkpointer import _psycopg_url
+      from src.memory.memory_manager import build_database_url
+
+      pool = ConnectionPool(
+        conninfo=_psycopg_url(build_database_url()),
+        min_size=1,
+        max_size=4,
+        kwargs={"autocommit": True, "prepare_threshold": 0},
+        open=True
+      )
+      try:
+        pool.wait(timeout=SRS_JOB_STORE_CONNECT_TIMEOUT)
+      except Exception:
+        pool.close()
+        raise
+      store = PostgresJobStore(pool)
+      logger.log("SRS_JOB_STORE", "Using Postgres job store", level="SUCCESS")
+      return store
+    except Exception as e:
+      logger.log("SRS_JOB_STORE_ERROR",
+                f"Postgres job store unavailable, using SQLite ({JOB_STORE_PATH}): {e}", level="WARNING")
+
+  return JobStore()
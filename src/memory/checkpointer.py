@@ -0,0 +1,397 @@
+import os
+import re
+import time
+import uuid
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.postgres import PostgresSaver
+
+from src.utils.tracing import logger
+from src.utils.metrics import metrics
+from src.memory.memory_manager import build_database_url
+
+# =============================== CONFIGURATION ================================
+# "postgres" (default): conversations survive restarts and are shared by replicas
+# "memory": in-process MemorySaver
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "postgres")
+CHECKPOINT_POOL_MIN_SIZE = int(os.getenv("CHECKPOINT_POOL_MIN_SIZE", "1"))
+CHECKPOINT_POOL_MAX_SIZE = int(os.getenv("CHECKPOINT_POOL_MAX_SIZE", "10"))
+# Seconds to wait for a first Postgres connection before falling back to memory
+CHECKPOINT_CONNECT_TIMEOUT = float(os.getenv("CHECKPOINT_CONNECT_TIMEOUT", "5"))
+
+# Retention policy (applies to both backends)
+CHECKPOINT_MAX_PER_THREAD = int(os.getenv("CHECKPOINT_MAX_PER_THREAD", "20"))
+CHECKPOINT_MAX_THREADS = int(os.getenv("CHECKPOINT_MAX_THREADS", "1000"))
+CHECKPOINT_IDLE_TTL_SECONDS = float(os.getenv("CHECKPOINT_IDLE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Postgres pruning runs in the background at most once per interval
+CHECKPOINT_PRUNE_INTERVAL_SECONDS = float(os.getenv("CHECKPOINT_PRUNE_INTERVAL_SECONDS", "300"))
+
+def new_run_thread_id(prefix: str) -> str:
+  """Unique thread_id for a one-shot graph run (e.g. one SRS generation)"""
+  return f"{prefix}_{uuid.uuid4().hex[:12]}"
+
+def _approx_size(value: Any) -> int:
+  """Rough byte size of serialized checkpoint data (bytes/str in nested tuples)"""
+  if isinstance(value, (bytes, bytearray, str)):
+    return len(value)
+  if isinstance(value, (tuple, list)):
+    return sum(_approx_size(item) for item in value)
+  if isinstance(value, dict):
+    return sum(_approx_size(item) for item in value.values())
+  return 0
+
+# ============================== IN-MEMORY SAVER ===============================
+class RetentionMemorySaver(MemorySaver):
+  """
+  MemorySaver with a retention policy
+
+  - keeps the newest CHECKPOINT_MAX_PER_THREAD checkpoints of each thread
+  - keeps at most CHECKPOINT_MAX_THREADS threads (least recently written evicted)
+  - drops threads idle for more than CHECKPOINT_IDLE_TTL_SECONDS
+  """
+
+  def __init__(self, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    self._last_write: "OrderedDict[str, float]" = OrderedDict()
+    self._retention_lock = threading.Lock()
+
+  def put(self, config, *args, **kwargs):
+    # aput() delegates to put() in MemorySaver, so this covers both paths
+    result = super().put(config, *args, **kwargs)
+
+    configurable = config["configurable"]
+    self._prune(configurable["thread_id"], configurable.get("checkpoint_ns", ""))
+    return result
+
+  def _prune(self, thread_id: str, checkpoint_ns: str):
+    now = time.time()
+
+    with self._retention_lock:
+      self._last_write[thread_id] = now
+      self._last_write.move_to_end(thread_id)
+
+      # 1. Per-thread cap (checkpoint IDs are time-ordered)
+      checkpoints = self.storage.get(thread_id, {}).get(checkpoint_ns, {})
+      excess = len(checkpoints) - CHECKPOINT_MAX_PER_THREAD
+      if excess > 0:
+        dropped = []
+        for checkpoint_id in sorted(checkpoints)[:excess]:
+          dropped.append(checkpoints.pop(checkpoint_id, None))
+          self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+        self._prune_blobs(thread_id, checkpoint_ns, dropped, checkpoints.values())
+
+      # 2. Idle threads, then least recently written past the thread cap
+      expired = [
+        tid for tid, last in self._last_write.items()
+        if now - last > CHECKPOINT_IDLE_TTL_SECONDS
+      ]
+      overflow = len(self._last_write) - len(expired) - CHECKPOINT_MAX_THREADS
+      if overflow > 0:
+        active = [tid for tid in self._last_write if tid not in expired]
+        expired.extend(active[:overflow])
+
+      for tid in expired:
+        self._drop_thread(tid)
+
+  def _channel_versions(self, saved) -> Dict[str, Any]:
+    """channel_versions of a stored checkpoint entry (serialized in newer langgraph)"""
+    checkpoint = saved[0] if isinstance(saved, tuple) else saved
+    if isinstance(checkpoint, tuple):
+      checkpoint = self.serde.loads_typed(checkpoint)
+    return checkpoint.get("channel_versions", {}) if isinstance(checkpoint, dict) else {}
+
+  def _prune_blobs(self, thread_id: str, checkpoint_ns: str, dropped: List, remaining):
+    """
+    Delete the channel values only the dropped checkpoints referenced
+    (blobs hold most of the bytes; the checkpoints only point at them)
+    """
+    blobs = getattr(self, "blobs", None)
+    if not blobs:
+      return
+
+    referenced = set()
+    for saved in remaining:
+      referenced.update(self._channel_versions(saved).items())
+
+    for saved in dropped:
+      if saved is None:
+        continue
+      for channel, version in self._channel_versions(saved).items():
+        if (channel, version) not in referenced:
+          blobs.pop((thread_id, checkpoint_ns, channel, version), None)
+
+  def _drop_thread(self, thread_id: str):
+    self._last_write.pop(thread_id, None)
+    if hasattr(self, "delete_thread"):
+      self.delete_thread(thread_id)
+      return
+
+    # Older langgraph versions: remove the thread by hand
+    self.storage.pop(thread_id, None)
+    for key in [key for key in self.writes if key[0] == thread_id]:
+      self.writes.pop(key, None)
+
+  def release_thread(self, thread_id: str):
+    """Forget a finished one-shot run right away"""
+    with self._retention_lock:
+      self._drop_thread(thread_id)
+
+  def stats(self) -> Dict[str, Any]:
+    """Memory-usage gauge for the checkpoint store"""
+    with self._retention_lock:
+      threads = list(self.storage.items())
+      num_checkpoints = sum(
+        len(checkpoints)
+        for namespaces in dict(threads).values()
+        for checkpoints in namespaces.values()
+      )
+      approx_bytes = _approx_size(dict(threads)) + _approx_size(dict(self.writes))
+      approx_bytes += _approx_size(dict(getattr(self, "blobs", {})))
+
+    return {
+      "backend": "memory",
+      "threads": len(threads),
+      "checkpoints": num_checkpoints,
+      "approx_bytes": approx_bytes
+    }
+
+# =============================== POSTGRES SAVER ===============================
+_PRUNE_CHECKPOINTS_SQL = """
+DELETE FROM checkpoints c
+USING (
+  SELECT thread_id, checkpoint_ns, checkpoint_id,
+         row_number() OVER (
+           PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+         ) AS rn
+  FROM checkpoints
+) ranked
+WHERE c.thread_id = ranked.thread_id
+  AND c.checkpoint_ns = ranked.checkpoint_ns
+  AND c.checkpoint_id = ranked.checkpoint_id
+  AND ranked.rn > %s
+"""
+
+_PRUNE_WRITES_SQL = """
+DELETE FROM checkpoint_writes w
+WHERE NOT EXISTS (
+  SELECT 1 FROM checkpoints c
+  WHERE c.thread_id = w.thread_id
+    AND c.checkpoint_ns = w.checkpoint_ns
+    AND c.checkpoint_id = w.checkpoint_id
+)
+"""
+
+# Channel values no remaining checkpoint references. Only versions older than
+# one a checkpoint references: a put() in flight writes its (newer) blobs
+# before its checkpoint row.
+_PRUNE_BLOBS_SQL = """
+DELETE FROM checkpoint_blobs b
+WHERE NOT EXISTS (
+  SELECT 1 FROM checkpoints c
+  WHERE c.thread_id = b.thread_id
+    AND c.checkpoint_ns = b.checkpoint_ns
+    AND c.checkpoint -> 'channel_versions' ->> b.channel = b.version
+)
+AND EXISTS (
+  SELECT 1 FROM checkpoints c
+  WHERE c.thread_id = b.thread_id
+    AND c.checkpoint_ns = b.checkpoint_ns
+    AND c.checkpoint -> 'channel_versions' ->> b.channel > b.version
+)
+"""
+
+_STALE_THREADS_SQL = """
+SELECT thread_id FROM (
+  SELECT thread_id,
+         max((checkpoint->>'ts')::timestamptz) AS last_ts,
+         row_number() OVER (ORDER BY max((checkpoint->>'ts')::timestamptz) DESC) AS recency
+  FROM checkpoints
+  GROUP BY thread_id
+) threads
+WHERE last_ts < now() - make_interval(secs => %s) OR recency > %s
+"""
+
+_STATS_SQL = """
+SELECT
+  (SELECT count(DISTINCT thread_id) FROM checkpoints) AS threads,
+  (SELECT count(*) FROM checkpoints) AS checkpoints,
+  pg_total_relation_size('checkpoints')
+    + pg_total_relation_size('checkpoint_blobs')
+    + pg_total_relation_size('checkpoint_writes') AS approx_bytes
+"""
+
+class PooledPostgresSaver(PostgresSaver):
+  """
+  PostgresSaver on a psycopg connection pool, usable from any event loop
+
+  The async methods run the sync implementation on a worker thread, so the
+  pool is not bound to one event loop (Streamlit starts a new loop per turn).
+  The retention policy is applied by a background prune at most once per
+  CHECKPOINT_PRUNE_INTERVAL_SECONDS, including the channel blobs only pruned
+  checkpoints referenced.
+  """
+
+  def __init__(self, pool, *args, **kwargs):
+    super().__init__(pool, *args, **kwargs)
+    self.pool = pool
+    self._last_prune = 0.0
+    self._prune_lock = threading.Lock()
+
+  async def aget_tuple(self, *args, **kwargs):
+    return await asyncio.to_thread(self.get_tuple, *args, **kwargs)
+
+  async def alist(self, *args, **kwargs):
+    items = await asyncio.to_thread(lambda: list(self.list(*args, **kwargs)))
+    for item in items:
+      yield item
+
+  async def aput(self, *args, **kwargs):
+    return await asyncio.to_thread(self.put, *args, **kwargs)
+
+  async def aput_writes(self, *args, **kwargs):
+    return await asyncio.to_thread(self.put_writes, *args, **kwargs)
+
+  async def adelete_thread(self, *args, **kwargs):
+    return await asyncio.to_thread(self.delete_thread, *args, **kwargs)
+
+  def put(self, *args, **kwargs):
+    result = super().put(*args, **kwargs)
+    self._maybe_prune()
+    return result
+
+  def _maybe_prune(self):
+    now = time.monotonic()
+    if now - self._last_prune < CHECKPOINT_PRUNE_INTERVAL_SECONDS:
+      return
+    self._last_prune = now
+    threading.Thread(target=self.prune, name="checkpoint-prune", daemon=True).start()
+
+  def prune(self) -> List[str]:
+    """Apply the retention policy, returns the deleted thread IDs"""
+    if not self._prune_lock.acquire(blocking=False):
+      return []
+
+    try:
+      with self.pool.connection() as conn:
+        with conn.cursor() as cur:
+          cur.execute(_PRUNE_CHECKPOINTS_SQL, (CHECKPOINT_MAX_PER_THREAD,))
+          cur.execute(_PRUNE_WRITES_SQL)
+          cur.execute(_PRUNE_BLOBS_SQL)
+          cur.execute(_STALE_THREADS_SQL, (CHECKPOINT_IDLE_TTL_SECONDS, CHECKPOINT_MAX_THREADS))
+          stale_threads = [row["thread_id"] for row in cur.fetchall()]
+
+      for thread_id in stale_threads:
+        self.delete_thread(thread_id)
+
+      logger.log("CHECKPOINT_PRUNE", f"Pruned checkpoints, dropped {len(stale_threads)} threads",
+                data=self.stats(), level="INFO")
+      return stale_threads
+
+    except Exception as e:
+      logger.log("CHECKPOINT_PRUNE_ERROR", f"Checkpoint pruning failed: {e}", level="ERROR")
+      return []
+    finally:
+      self._prune_lock.release()
+
+  def release_thread(self, thread_id: str):
+    """Forget a finished one-shot run right away"""
+    self.delete_thread(thread_id)
+
+  def stats(self) -> Dict[str, Any]:
+    """Memory-usage gauge for the checkpoint store"""
+    with self.pool.connection() as conn:
+      with conn.cursor() as cur:
+        cur.execute(_STATS_SQL)
+        row = cur.fetchone()
+
+    return {
+      "backend": "postgres",
+      "threads": row["threads"],
+      "checkpoints": row["checkpoints"],
+      "approx_bytes": row["approx_bytes"]
+    }
+
+def _psycopg_url(db_url: str) -> str:
+  """SQLAlchemy URL (postgresql+psycopg2://...) -> libpq URL (postgresql://...)"""
+  return re.sub(r"^postgresql\+\w+://", "postgresql://", db_url)
+
+def _create_postgres_saver() -> PooledPostgresSaver:
+  from psycopg.rows import dict_row
+  from psycopg_pool import ConnectionPool
+
+  pool = ConnectionPool(
+    conninfo=_psycopg_url(build_database_url()),
+    min_size=CHECKPOINT_POOL_MIN_SIZE,
+    max_size=CHECKPOINT_POOL_MAX_SIZE,
+    kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+    open=True
+  )
+
+  # Fail fast when Postgres is unreachable (setup() would wait the pool's full timeout)
+  try:
+    pool.wait(timeout=CHECKPOINT_CONNECT_TIMEOUT)
+  except Exception:
+    pool.close()
+    raise
+
+  saver = PooledPostgresSaver(pool)
+  saver.setup()
+  return saver
+
+# ================================ SINGLETON ===================================
+_checkpointer = None
+_lock = threading.Lock()
+
+def get_checkpointer():
+  """
+  Shared checkpointer for every compiled graph (threads keyed by session)
+  Falls back to an in-memory saver when Postgres is not reachable.
+  """
+  global _checkpointer
+
+  with _lock:
+    if _checkpointer is None:
+      if CHECKPOINT_BACKEND == "postgres":
+        try:
+          _checkpointer = _create_postgres_saver()
+          logger.log("CHECKPOINTER", "Using Postgres checkpointer",
+                    data={"max_pool_size": CHECKPOINT_POOL_MAX_SIZE}, level="SUCCESS")
+        except Exception as e:
+          logger.log("CHECKPOINTER_ERROR",
+                    f"Postgres checkpointer unavailable, using MemorySaver: {e}", level="WARNING")
+
+      if _checkpointer is None:
+        _checkpointer = RetentionMemorySaver()
+
+  return _checkpointer
+
+def release_thread(thread_id: str):
+  """Delete the checkpoints of a finished one-shot run (e.g. an SRS generation)"""
+  try:
+    get_checkpointer().release_thread(thread_id)
+  except Exception as e:
+    logger.log("CHECKPOINT_RELEASE_ERROR", f"Could not release {thread_id}: {e}", level="WARNING")
+
+def checkpoint_store_stats() -> Dict[str, Any]:
+  """Threads, checkpoints and approximate bytes held by the checkpoint store"""
+  return get_checkpointer().stats()
+
+def _checkpoint_store_gauge() -> Dict[tuple, float]:
+  # Scrapes never create (or connect) a checkpointer of their own
+  if _checkpointer is None:
+    return {}
+  stats = _checkpointer.stats()
+  return {
+    (stats["backend"], kind): stats[kind]
+    for kind in ("threads", "checkpoints", "approx_bytes")
+  }
+
+CHECKPOINT_STORE_SIZE = metrics.gauge(
+  "srs_checkpoint_store", "Checkpoint store size (threads, checkpoints, approx_bytes)",
+  ("backend", "kind"), _checkpoint_store_gauge
+)
@@ -7,6 +7,21 @@ from memori import Memori
 
 load_dotenv()
 
+def build_database_url() -> str:
+    """
+    Database URL from DATABASE_CONNECTION_STRING, or built from POSTGRES_* variables.
+    """
+    db_url = os.getenv("DATABASE_CONNECTION_STRING")
+    if not db_url:
+        user = os.getenv("POSTGRES_USER", "postgres")
+        password = os.getenv("POSTGRES_PASSWORD", "postgres")
+        host = os.getenv("POSTGRES_HOST", "localhost")
+        port = os.getenv("POSTGRES_PORT", "5432")
+        dbname = os.getenv("POSTGRES_DB", "memori_db")
+        # Construct SQLAlchemy connection string
+        db_url = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{dbname}"
+    return db_url
+
 class MemoryManager:
     """
     Manages the Memori + OpenAI integration.
@@ -15,15 +30,7 @@ class MemoryManager:
         self.api_key = os.getenv("OPENAI_API_KEY")
         
         # Try to get full connection string, or construct it from components
-        self.db_url = os.getenv("DATABASE_CONNECTION_STRING")
-        if not self.db_url:
-            user = os.getenv("POSTGRES_USER", "postgres")
-            password = os.getenv("POSTGRES_PASSWORD", "postgres")
-            host = os.getenv("POSTGRES_HOST", "localhost")
-            port = os.getenv("POSTGRES_PORT", "5432")
-            dbname = os.getenv("POSTGRES_DB", "memori_db")
-            # Construct SQLAlchemy connection string
-            self.db_url = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{dbname}"
+        self.db_url = build_database_url()
         
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY environment variable is not set.")
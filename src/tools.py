@@ -1,52 +1,165 @@
 import os
+from typing import Dict, List
 from dotenv import load_dotenv
-from tavily import TavilyClient
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
 from src.utils.tracing import logger
+from src.utils.cache import CACHE_DIR, SQLiteCache, make_cache_key
+from src.utils.metrics import CACHE_HITS, CACHE_MISSES
+from src.utils.search_client import AsyncSearchClient
 
 load_dotenv()
 
-tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+# Shared, pooled client: identical concurrent queries become one request
+search_client = AsyncSearchClient(
+  api_key=os.getenv("TAVILY_API_KEY"),
+  max_connections=int(os.getenv("TAVILY_MAX_CONNECTIONS", "20"))
+)
 
-@tool
-def tavily_search(query: str, search_depth: str = "advanced") -> str:
+# ================================ SEARCH CACHE ================================
+SEARCH_MAX_RESULTS = 5
+
+# Set TAVILY_CACHE_BYPASS=1 to always hit the network (results are still stored)
+SEARCH_CACHE_BYPASS = os.getenv("TAVILY_CACHE_BYPASS", "0") == "1"
+
+search_cache = SQLiteCache(
+  os.path.join(CACHE_DIR, "search_cache.db"),
+  namespace="tavily",
+  ttl_seconds=float(os.getenv("TAVILY_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+  max_entries=int(os.getenv("TAVILY_CACHE_MAX_ENTRIES", "2000"))
+)
+
+def _normalize_query(query: str) -> str:
+  """Lowercase and collapse whitespace so equivalent queries share a key"""
+  return " ".join(query.lower().split())
+
+def _search_key(query: str, search_depth: str, max_results: int) -> str:
+  return make_cache_key(_normalize_query(query), search_depth, max_results)
+
+def _parse_results(response: Dict) -> List[Dict]:
+  results = []
+  for result in response.get('results', []):
+    results.append({
+      "title": result.get('title', ''),
+      "url": result.get('url', ''),
+      "content": result.get('content', '')[:500]
+    })
+  return results
+
+def _cached_results(key: str, query: str, bypass_cache: bool):
+  if bypass_cache:
+    return None
+
+  cached = search_cache.get(key)
+  if cached is None:
+    CACHE_MISSES.inc(cache="tavily")
+  else:
+    CACHE_HITS.inc(cache="tavily")
+    logger.log("SEARCH_CACHE_HIT", f"Cached results for: {query[:50]}...",
+              data=search_cache.stats(), level="INFO")
+  return cached
+
+def search_web(
+  query: str,
+  search_depth: str = "advanced",
+  max_results: int = SEARCH_MAX_RESULTS,
+  bypass_cache: bool = SEARCH_CACHE_BYPASS
+) -> List[Dict]:
+  """
+  Search the web with Tavily, going through the persistent search cache
+
+  Returns:
+    List of {"title", "url", "content"} dicts
+  """
+  key = _search_key(query, search_depth, max_results)
+
+  cached = _cached_results(key, query, bypass_cache)
+  if cached is not None:
+    return cached
+
+  response = search_client.search(key, {
+    "query": query,
+    "search_depth": search_depth,
+    "max_results": max_results
+  })
+
+  results = _parse_results(response)
+  search_cache.set(key, results)
+  return results
+
+async def asearch_web(
+  query: str,
+  search_depth: str = "advanced",
+  max_results: int = SEARCH_MAX_RESULTS,
+  bypass_cache: bool = SEARCH_CACHE_BYPASS
+) -> List[Dict]:
+  """
+  Async version of search_web (same cache, same coalesced client)
+  """
+  key = _search_key(query, search_depth, max_results)
+
+  cached = _cached_results(key, query, bypass_cache)
+  if cached is not None:
+    return cached
+
+  response = await search_client.asearch(key, {
+    "query": query,
+    "search_depth": search_depth,
+    "max_results": max_results
+  })
+
+  results = _parse_results(response)
+  search_cache.set(key, results)
+  return results
+
+def format_search_results(results: List[Dict]) -> str:
+  """Render search results as the markdown block fed to the LLM"""
+  return "\n\n".join([
+    f"**{r['title']}**\nURL: {r['url']}\n{r['content']}"
+    for r in results
+  ])
+
+def _tool_response(results: List[Dict]) -> str:
+  formatted = format_search_results(results)
+
+  logger.log("TOOL_RESPONSE", f"Tavily returned {len(results)} results",
+            data={"num_results": len(results)}, level="TOOL")
+
+  return formatted if formatted else "No results found."
+
+def _tavily_search(query: str, search_depth: str = "advanced") -> str:
   """
   Search the web for technical information using Tavily.
-  
+
   Args:
     query: Search query (e.g., 'best microservices architecture 2024')
     search_depth: 'basic' or 'advanced' (default: advanced)
   """
-  logger.log("TOOL_CALL", f"Tavily Search: {query}", 
+  logger.log("TOOL_CALL", f"Tavily Search: {query}",
+            data={"search_depth": search_depth}, level="TOOL")
+
+  try:
+    return _tool_response(search_web(query, search_depth=search_depth))
+
+  except Exception as e:
+    logger.log("TOOL_ERROR", f"Tavily search failed: {str(e)}", level="ERROR")
+    return f"Search error: {str(e)}"
+
+async def _atavily_search(query: str, search_depth: str = "advanced") -> str:
+  logger.log("TOOL_CALL", f"Tavily Search: {query}",
             data={"search_depth": search_depth}, level="TOOL")
-  
+
   try:
-    response = tavily_client.search(
-      query=query,
-      search_depth=search_depth,
-      max_results=5
-    )
-    
-    results = []
-    for result in response.get('results', []):
-      results.append({
-        "title": result.get('title', ''),
-        "url": result.get('url', ''),
-        "content": result.get('content', '')[:500]
-      })
-    
-    formatted = "\n\n".join([
-      f"**{r['title']}**\nURL: {r['url']}\n{r['content']}"
-      for r in results
-    ])
-    
-    logger.log("TOOL_RESPONSE", f"Tavily returned {len(results)} results", 
-              data={"num_results": len(results)}, level="TOOL")
-    
-    return formatted if formatted else "No results found."
-      
+    return _tool_response(await asearch_web(query, search_depth=search_depth))
+
   except Exception as e:
     logger.log("TOOL_ERROR", f"Tavily search failed: {str(e)}", level="ERROR")
     return f"Search error: {str(e)}"
 
-tools = [tavily_search]
\ No newline at end of file
+# Same tool for invoke() and ainvoke(): async callers never block the loop
+tavily_search = StructuredTool.from_function(
+  func=_tavily_search,
+  coroutine=_atavily_search,
+  name="tavily_search"
+)
+
+tools = [tavily_search]
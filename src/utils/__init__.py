@@ -5,7 +5,8 @@ from .langfuse_tracer import (
   trace_llm_call,
   trace_graph_execution, 
   log_agent_decision,
-  flush_langfuse
+  flush_langfuse,
+  exporter as langfuse_exporter
 )
 
 __all__ = [
@@ -15,6 +16,7 @@ __all__ = [
   "trace_llm_call",
   "trace_graph_execution", 
   "log_agent_decision",
-  "flush_langfuse"
+  "flush_langfuse",
+  "langfuse_exporter"
 ]
   
\ No newline at end of file
@@ -0,0 +1,237 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+
+def make_cache_key(*parts: Any) -> str:
+  """
+  Build a stable cache key from JSON-serializable parts
+  """
+  raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+  return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class SQLiteCache:
+  """
+  Persistent key/value cache backed by SQLite
+
+  - TTL expiry (entries older than ttl_seconds are treated as misses)
+  - LRU size cap (least recently read entries are evicted past max_entries)
+  - Hit/miss counters for the current process
+
+  Several caches can share one database file through different namespaces.
+
+  Usage:
+    cache = SQLiteCache(".cache/search.db", namespace="tavily", ttl_seconds=3600)
+    value = cache.get(key)
+    if value is None:
+      value = compute()
+      cache.set(key, value)
+  """
+
+  def __init__(
+    self,
+    path: str,
+    namespace: str = "default",
+    ttl_seconds: Optional[float] = 86400,
+    max_entries: int = 1000
+  ):
+    self.path = path
+    self.namespace = namespace
+    self.ttl_seconds = ttl_seconds
+    self.max_entries = max_entries
+    self.hits = 0
+    self.misses = 0
+    self._lock = threading.Lock()
+    self._conn = None
+
+  def _connect(self) -> sqlite3.Connection:
+    """Open the database lazily (first access)"""
+    if self._conn is None:
+      directory = os.path.dirname(self.path)
+      if directory:
+        os.makedirs(directory, exist_ok=True)
+
+      conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+      conn.execute("PRAGMA journal_mode=WAL")
+      conn.execute("""
+        CREATE TABLE IF NOT EXISTS cache_entries (
+          namespace TEXT NOT NULL,
+          key TEXT NOT NULL,
+          value TEXT NOT NULL,
+          created_at REAL NOT NULL,
+          accessed_at REAL NOT NULL,
+          PRIMARY KEY (namespace, key)
+        )
+      """)
+      conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_cache_entries_lru
+        ON cache_entries (namespace, accessed_at)
+      """)
+      conn.commit()
+      self._conn = conn
+    return self._conn
+
+  def get(self, key: str) -> Optional[Any]:
+    """Return the cached value, or None on miss/expiry"""
+    now = time.time()
+
+    with self._lock:
+      conn = self._connect()
+      row = conn.execute(
+        "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+        (self.namespace, key)
+      ).fetchone()
+
+      if row is None:
+        self.misses += 1
+        return None
+
+      value, created_at = row
+      if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+        conn.execute(
+          "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+          (self.namespace, key)
+        )
+        conn.commit()
+        self.misses += 1
+        return None
+
+      conn.execute(
+        "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+        (now, self.namespace, key)
+      )
+      conn.commit()
+      self.hits += 1
+
+    return json.loads(value)
+
+  def set(self, key: str, value: Any):
+    """Store a JSON-serializable value and evict past the size cap"""
+    now = time.time()
+    payload = json.dumps(value, ensure_ascii=False)
+
+    with self._lock:
+      conn = self._connect()
+      conn.execute(
+        """
+        INSERT OR REPLACE INTO cache_entries (namespace, key, value, created_at, accessed_at)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        (self.namespace, key, payload, now, now)
+      )
+
+      # LRU eviction: keep only the max_entries most recently read
+      conn.execute(
+        """
+        DELETE FROM cache_entries
+        WHERE namespace = ? AND key NOT IN (
+          SELECT key FROM cache_entries
+          WHERE namespace = ?
+          ORDER BY accessed_at DESC
+          LIMIT ?
+        )
+        """,
+        (self.namespace, self.namespace, self.max_entries)
+      )
+      conn.commit()
+
+  def clear(self):
+    """Drop every entry in this namespace"""
+    with self._lock:
+      conn = self._connect()
+      conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+      conn.commit()
+
+  def size(self) -> int:
+    """Number of entries stored in this namespace"""
+    with self._lock:
+      conn = self._connect()
+      row = conn.execute(
+        "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?",
+        (self.namespace,)
+      ).fetchone()
+    return row[0]
+
+  def stats(self) -> Dict[str, Any]:
+    """Hit/miss counters for logging"""
+    total = self.hits + self.misses
+    return {
+      "namespace": self.namespace,
+      "hits": self.hits,
+      "misses": self.misses,
+      "hit_rate": round(self.hits / total, 3) if total else 0.0,
+      "size": self.size()
+    }
+
+class MemoryCache:
+  """
+  In-process cache with the same interface as SQLiteCache
+  (TTL expiry, LRU size cap, hit/miss counters). Nothing survives a restart.
+  """
+
+  def __init__(
+    self,
+    namespace: str = "default",
+    ttl_seconds: Optional[float] = 86400,
+    max_entries: int = 1000
+  ):
+    self.namespace = namespace
+    self.ttl_seconds = ttl_seconds
+    self.max_entries = max_entries
+    self.hits = 0
+    self.misses = 0
+    self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, key: str) -> Optional[Any]:
+    """Return the cached value, or None on miss/expiry"""
+    with self._lock:
+      entry = self._entries.get(key)
+
+      if entry is None:
+        self.misses += 1
+        return None
+
+      value, created_at = entry
+      if self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds:
+        del self._entries[key]
+        self.misses += 1
+        return None
+
+      self._entries.move_to_end(key)
+      self.hits += 1
+
+    return json.loads(value)
+
+  def set(self, key: str, value: Any):
+    """Store a JSON-serializable value and evict past the size cap"""
+    payload = json.dumps(value, ensure_ascii=False)
+
+    with self._lock:
+      self._entries[key] = (payload, time.time())
+      self._entries.move_to_end(key)
+      while len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+
+  def size(self) -> int:
+    return len(self._entries)
+
+  def stats(self) -> Dict[str, Any]:
+    total = self.hits + self.misses
+    return {
+      "namespace": self.namespace,
+      "hits": self.hits,
+      "misses": self.misses,
+      "hit_rate": round(self.hits / total, 3) if total else 0.0,
+      "size": self.size()
+    }
@@ -0,0 +1,54 @@
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Iterable, List, Optional
+
+def run_concurrently(
+  func: Callable[[Any], Any],
+  items: Iterable[Any],
+  max_workers: Optional[int] = None,
+  timeout: Optional[float] = None,
+  on_timeout: Optional[Callable[[Any], Any]] = None
+) -> List[Any]:
+  """
+  Run func over items on a bounded thread pool
+
+  Args:
+    func: Callable applied to each item
+    items: Inputs, dispatched all at once (up to max_workers in flight)
+    max_workers: Max number of calls in flight (default: one per item)
+    timeout: Shared deadline in seconds for every call (None = wait forever)
+    on_timeout: Builds the fallback result for an item that timed out
+
+  Returns:
+    Results in the same order as items
+  """
+  items = list(items)
+  if not items:
+    return []
+
+  workers = max(1, min(max_workers or len(items), len(items)))
+  executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="srs-worker")
+
+  # Each call gets its own copy of the caller's context (session, tracing...)
+  futures = [
+    executor.submit(contextvars.copy_context().run, func, item)
+    for item in items
+  ]
+
+  deadline = time.monotonic() + timeout if timeout is not None else None
+  results = []
+
+  try:
+    for item, future in zip(items, futures):
+      remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+      try:
+        results.append(future.result(timeout=remaining))
+      except FutureTimeoutError:
+        future.cancel()
+        results.append(on_timeout(item) if on_timeout else None)
+  finally:
+    # Never block on calls that already missed the deadline
+    executor.shutdown(wait=deadline is None, cancel_futures=True)
+
+  return results
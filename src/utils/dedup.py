@@ -0,0 +1,143 @@
+import re
+import zlib
+import random
+import threading
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .prompt_budget import count_tokens
+
+# =============================== CONFIGURATION ================================
+SHINGLE_SIZE = 5           # words per shingle
+NUM_PERMUTATIONS = 64      # MinHash signature length
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+# Query parameters that never change the page content
+TRACKING_PARAMS = {"fbclid", "gclid", "ref", "ref_src", "source", "mc_cid", "mc_eid"}
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1337)  # fixed seed: signatures are stable across runs
+_PERMUTATIONS = [
+  (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+  for _ in range(NUM_PERMUTATIONS)
+]
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# ================================ CANONICAL URL ===============================
+def canonical_url(url: str) -> str:
+  """
+  Normalize a URL so trivially different links compare equal
+  (scheme/host case, www., fragment, tracking params, param order, trailing /)
+  """
+  if not url:
+    return ""
+
+  parts = urlsplit(url.strip())
+  host = parts.netloc.lower()
+  if host.startswith("www."):
+    host = host[4:]
+
+  query = sorted(
+    (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+    if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+  )
+  path = parts.path.rstrip("/") or "/"
+
+  return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme,
+                     host, path, urlencode(query), ""))
+
+# ================================== MINHASH ===================================
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+  words = [word.lower() for word in _WORD.findall(text)]
+  if len(words) <= size:
+    return {" ".join(words)} if words else set()
+  return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def minhash(text: str) -> Optional[List[int]]:
+  """MinHash signature of the text's word shingles (None for empty text)"""
+  hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles(text)]
+  if not hashes:
+    return None
+  return [
+    min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+    for a, b in _PERMUTATIONS
+  ]
+
+def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+  """Estimated Jaccard similarity of two signatures"""
+  return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+# ================================== CORPUS ====================================
+class ResearchCorpus:
+  """
+  Deduplicated set of search results for one SRS run
+
+  A result is dropped when its canonical URL was already seen, or when its
+  content is a near duplicate (MinHash Jaccard >= threshold) of a kept one.
+
+  Usage:
+    corpus = ResearchCorpus()
+    unique = corpus.add(search_web(query))
+    corpus.stats()  # duplicates dropped and tokens saved
+  """
+
+  def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+    self.threshold = threshold
+    self.results: List[Dict] = []
+    self.duplicate_urls = 0
+    self.near_duplicates = 0
+    self.tokens_saved = 0
+
+    self._urls = set()
+    self._signatures: List[List[int]] = []
+    self._lock = threading.Lock()
+
+  @classmethod
+  def from_results(cls, results: List[Dict]) -> "ResearchCorpus":
+    """Rebuild a corpus from results kept earlier in the run"""
+    corpus = cls()
+    corpus.add(results)
+    return corpus
+
+  def _result_tokens(self, result: Dict) -> int:
+    return count_tokens(f"**{result.get('title', '')}**\nURL: {result.get('url', '')}\n{result.get('content', '')}")
+
+  def add(self, results: List[Dict]) -> List[Dict]:
+    """Add results and return the ones that are new"""
+    unique = []
+
+    for result in results:
+      url = canonical_url(result.get("url", ""))
+      signature = minhash(f"{result.get('title', '')} {result.get('content', '')}")
+
+      with self._lock:
+        if url and url in self._urls:
+          self.duplicate_urls += 1
+          self.tokens_saved += self._result_tokens(result)
+          continue
+
+        if signature is not None and any(
+          similarity(signature, kept) >= self.threshold for kept in self._signatures
+        ):
+          self.near_duplicates += 1
+          self.tokens_saved += self._result_tokens(result)
+          continue
+
+        if url:
+          self._urls.add(url)
+        if signature is not None:
+          self._signatures.append(signature)
+        self.results.append(result)
+
+      unique.append(result)
+
+    return unique
+
+  def stats(self) -> Dict[str, int]:
+    return {
+      "unique_results": len(self.results),
+      "duplicate_urls": self.duplicate_urls,
+      "near_duplicates": self.near_duplicates,
+      "tokens_saved": self.tokens_saved
+    }
@@ -1,8 +1,21 @@
+import os
 import re
+import hashlib
+import threading
 from io import BytesIO
+from collections import OrderedDict
 from docx import Document
 from docx.shared import Pt
 
+from .metrics import CACHE_HITS, CACHE_MISSES
+from .ooxml_writer import convert_to_docx_stream
+
+# Number of recent exports kept in memory (one per distinct SRS content)
+DOCX_EXPORT_CACHE_SIZE = int(os.getenv("DOCX_EXPORT_CACHE_SIZE", "8"))
+
+# "ooxml": streaming WordprocessingML writer, "python-docx": object model
+DOCX_EXPORT_ENGINE = os.getenv("DOCX_EXPORT_ENGINE", "ooxml")
+
 def convert_to_docx(markdown_text: str) -> BytesIO:
   """
   Convert Markdown content to a DOCX file in memory.
@@ -77,3 +90,54 @@ def convert_to_docx(markdown_text: str) -> BytesIO:
   file_stream.seek(0)
   
   return file_stream
+
+DOCX_ENGINES = {
+  "ooxml": convert_to_docx_stream,
+  "python-docx": convert_to_docx
+}
+
+class DocxExportCache:
+  """
+  Small LRU of finished DOCX exports keyed by a hash of the Markdown
+
+  Streamlit reruns the whole script on every interaction; with this cache
+  the document is only converted again when the SRS content changed.
+  """
+  def __init__(self, max_entries: int = DOCX_EXPORT_CACHE_SIZE):
+    self.max_entries = max(1, max_entries)
+    self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, markdown_text: str) -> bytes:
+    """DOCX bytes for markdown_text, converted on first request only"""
+    key = hashlib.sha256(markdown_text.encode("utf-8")).hexdigest()
+    
+    with self._lock:
+      if key in self._entries:
+        self._entries.move_to_end(key)
+        CACHE_HITS.inc(cache="docx_export")
+        return self._entries[key]
+    
+    CACHE_MISSES.inc(cache="docx_export")
+    data = DOCX_ENGINES.get(DOCX_EXPORT_ENGINE, convert_to_docx_stream)(markdown_text).getvalue()
+    
+    with self._lock:
+      self._entries[key] = data
+      self._entries.move_to_end(key)
+      while len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
+    
+    return data
+
+  def stats(self) -> dict:
+    with self._lock:
+      return {
+        "entries": len(self._entries),
+        "bytes": sum(len(data) for data in self._entries.values())
+      }
+
+docx_export_cache = DocxExportCache()
+
+def export_docx(markdown_text: str) -> bytes:
+  """Cached convert_to_docx (bytes, ready for a download button)"""
+  return docx_export_cache.get(markdown_text)
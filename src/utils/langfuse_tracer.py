@@ -1,13 +1,52 @@
 import os
-from typing import Dict, Any
+import time
+import uuid
+import queue
+import atexit
+import random
+import inspect
+import functools
+import threading
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
 from dotenv import load_dotenv
 from contextlib import contextmanager
 
 from langfuse import Langfuse
 from langfuse.decorators import observe, langfuse_context
 
+from .tracing import logger
+
 load_dotenv()
 
+# =============================== CONFIGURATION ================================
+# Tracing is on when keys are set, unless LANGFUSE_TRACING=0. When off, the
+# decorators below return the undecorated function (zero overhead).
+TRACING_ENABLED = (
+  os.getenv("LANGFUSE_TRACING", "1") == "1"
+  and bool(os.getenv("LANGFUSE_PUBLIC_KEY"))
+  and bool(os.getenv("LANGFUSE_SECRET_KEY"))
+)
+
+# Fraction of traces (chat turns / SRS runs) that are recorded
+LANGFUSE_SAMPLE_RATE = float(os.getenv("LANGFUSE_SAMPLE_RATE", "1.0"))
+
+# Background export: bounded queue, batch flush by size or interval
+LANGFUSE_MAX_QUEUE = int(os.getenv("LANGFUSE_MAX_QUEUE", "10000"))
+LANGFUSE_FLUSH_AT = int(os.getenv("LANGFUSE_FLUSH_AT", "50"))
+LANGFUSE_FLUSH_INTERVAL = float(os.getenv("LANGFUSE_FLUSH_INTERVAL", "5"))
+
+# Sampling decision of the current trace (None: no root trace yet)
+_trace_sampled: ContextVar[Optional[bool]] = ContextVar("langfuse_sampled", default=None)
+
+def _sample() -> bool:
+  return TRACING_ENABLED and random.random() < LANGFUSE_SAMPLE_RATE
+
+def _is_sampled() -> bool:
+  """Sampling decision of the enclosing trace, or a new one for a root"""
+  sampled = _trace_sampled.get()
+  return _sample() if sampled is None else sampled
+
 # =========================== LANGFUSE CLIENT SETUP ============================
 langfuse_client = None
 
@@ -22,11 +61,13 @@ def init_langfuse():
   secret_key = os.getenv("LANGFUSE_SECRET_KEY")
   host = os.getenv("LANGFUSE_BASE_URL", "https://cloud.langfuse.com")
   
-  if public_key and secret_key:
+  if TRACING_ENABLED:
     langfuse_client = Langfuse(
       public_key=public_key,
       secret_key=secret_key,
-      host=host
+      host=host,
+      flush_at=LANGFUSE_FLUSH_AT,
+      flush_interval=LANGFUSE_FLUSH_INTERVAL
     )
     print("Langfuse initialized")
     return langfuse_client
@@ -37,11 +78,131 @@ def init_langfuse():
 def get_langfuse():
   """Get Langfuse client (lazy init)"""
   global langfuse_client
-  if langfuse_client is None:
+  if langfuse_client is None and TRACING_ENABLED:
     langfuse_client = init_langfuse()
   return langfuse_client
 
+# ============================= BACKGROUND EXPORTER ============================
+class BatchExporter:
+  """
+  Runs Langfuse calls on a background thread so requests never wait on tracing
+
+  - Bounded queue: when full, new operations are dropped (and counted)
+  - Operations run in submission order, so a span can use the trace created
+    by an earlier operation
+  - The client is flushed every flush_at operations or flush_interval seconds
+
+  Usage:
+    exporter.submit(lambda client: client.trace(name="..."))
+  """
+
+  def __init__(
+    self,
+    max_queue: int = LANGFUSE_MAX_QUEUE,
+    flush_at: int = LANGFUSE_FLUSH_AT,
+    flush_interval: float = LANGFUSE_FLUSH_INTERVAL
+  ):
+    self.flush_at = flush_at
+    self.flush_interval = flush_interval
+    self.dropped = 0
+    self.exported = 0
+
+    self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+    self._flush_requested = threading.Event()
+    self._thread = None
+    self._lock = threading.Lock()
+
+  def _ensure_thread(self):
+    if self._thread is None:
+      with self._lock:
+        if self._thread is None:
+          self._thread = threading.Thread(target=self._run, name="langfuse-exporter", daemon=True)
+          self._thread.start()
+          atexit.register(self.shutdown)
+
+  def submit(self, operation: Callable[[Any], Any]) -> bool:
+    """Queue operation(client), False if it was dropped"""
+    if not TRACING_ENABLED:
+      return False
+
+    self._ensure_thread()
+    try:
+      self._queue.put_nowait(operation)
+      return True
+    except queue.Full:
+      self.dropped += 1
+      return False
+
+  def request_flush(self):
+    """Ask the background thread to flush soon (does not wait)"""
+    self._flush_requested.set()
+
+  def _run(self):
+    pending = 0
+    last_flush = time.monotonic()
+
+    while True:
+      try:
+        operation = self._queue.get(timeout=self.flush_interval)
+      except queue.Empty:
+        operation = None
+
+      client = get_langfuse()
+      if operation is not None:
+        try:
+          if client is not None:
+            operation(client)
+            pending += 1
+            self.exported += 1
+        except Exception as e:
+          logger.log("LANGFUSE_EXPORT_ERROR", f"Trace export failed: {e}", level="WARNING")
+        finally:
+          self._queue.task_done()
+
+      due = time.monotonic() - last_flush >= self.flush_interval
+      if client is not None and pending and (
+        pending >= self.flush_at or due or self._flush_requested.is_set()
+      ):
+        try:
+          client.flush()
+        except Exception as e:
+          logger.log("LANGFUSE_EXPORT_ERROR", f"Langfuse flush failed: {e}", level="WARNING")
+        pending = 0
+        last_flush = time.monotonic()
+        self._flush_requested.clear()
+
+  def shutdown(self, timeout: float = 5.0):
+    """Drain the queue (bounded wait) and flush, used at process exit"""
+    deadline = time.monotonic() + timeout
+    while self._queue.unfinished_tasks and time.monotonic() < deadline:
+      time.sleep(0.05)
+
+    client = get_langfuse()
+    if client is not None:
+      try:
+        client.flush()
+      except Exception:
+        pass
+
+  def stats(self) -> Dict[str, int]:
+    return {
+      "queued": self._queue.qsize(),
+      "exported": self.exported,
+      "dropped": self.dropped
+    }
+
+exporter = BatchExporter()
+
 # ============================== TRACE DECORATORS ==============================
+@contextmanager
+def _root_trace(sampled: bool):
+  """Pin the sampling decision for everything nested in this trace"""
+  token = _trace_sampled.set(sampled)
+  try:
+    yield
+  finally:
+    _trace_sampled.reset(token)
+
 def trace_agent(name: str, agent_type: str = "agent"):
   """
   Decorator for agent-level tracing
@@ -56,10 +217,37 @@ def trace_agent(name: str, agent_type: str = "agent"):
   - Input/output
   - Duration
   - Cost
+  
+  Each call is a trace: it is sampled once (LANGFUSE_SAMPLE_RATE) and nested
+  nodes/LLM calls follow that decision. Unsampled calls run the function directly.
   """
   def decorator(func):
+    if not TRACING_ENABLED:
+      return func
+    
+    if inspect.iscoroutinefunction(func):
+      @observe(name=name, as_type="generation")
+      async def observed_async(*args, **kwargs):
+        langfuse_context.update_current_observation(
+          metadata={
+            "agent_type": agent_type,
+            "function": func.__name__
+          }
+        )
+        return await func(*args, **kwargs)
+      
+      @functools.wraps(func)
+      async def async_wrapper(*args, **kwargs):
+        sampled = _is_sampled()
+        with _root_trace(sampled):
+          if not sampled:
+            return await func(*args, **kwargs)
+          return await observed_async(*args, **kwargs)
+      
+      return async_wrapper
+    
     @observe(name=name, as_type="generation")
-    def wrapper(*args, **kwargs):
+    def observed(*args, **kwargs):
         # Add metadata
         langfuse_context.update_current_observation(
             metadata={
@@ -73,6 +261,14 @@ def trace_agent(name: str, agent_type: str = "agent"):
         
         return result
     
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+      sampled = _is_sampled()
+      with _root_trace(sampled):
+        if not sampled:
+          return func(*args, **kwargs)
+        return observed(*args, **kwargs)
+    
     return wrapper
   return decorator
 
@@ -91,36 +287,67 @@ def trace_node(node_name: str):
   - Duration
   """
   def decorator(func):
-    @observe(name=node_name, as_type="span")
-    def wrapper(state, *args, **kwargs):
-      # Log input state (safe extraction)
-      input_summary = {
-        "current_phase": state.get("current_phase", "unknown"),
-        "validation_score": state.get("validation_score", 0),
-      }
+    if not TRACING_ENABLED:
+      return func
+    
+    if inspect.iscoroutinefunction(func):
+      @observe(name=node_name, as_type="span")
+      async def observed_async(state, *args, **kwargs):
+        _update_node_input(state)
+        result = await func(state, *args, **kwargs)
+        _update_node_output(result)
+        return result
       
-      langfuse_context.update_current_observation(
-        input=input_summary
-      )
+      @functools.wraps(func)
+      async def async_wrapper(state, *args, **kwargs):
+        if not _is_sampled():
+          return await func(state, *args, **kwargs)
+        return await observed_async(state, *args, **kwargs)
+      
+      return async_wrapper
+    
+    @observe(name=node_name, as_type="span")
+    def observed(state, *args, **kwargs):
+      _update_node_input(state)
       
       # Execute node
       result = func(state, *args, **kwargs)
       
-      # Log output state
-      output_summary = {
-        "current_phase": result.get("current_phase", "unknown"),
-        "validation_score": result.get("validation_score", 0),
-      }
-      
-      langfuse_context.update_current_observation(
-        output=output_summary
-      )
+      _update_node_output(result)
       
       return result
     
+    @functools.wraps(func)
+    def wrapper(state, *args, **kwargs):
+      if not _is_sampled():
+        return func(state, *args, **kwargs)
+      return observed(state, *args, **kwargs)
+    
     return wrapper
   return decorator
 
+def _update_node_input(state: Dict[str, Any]):
+  """Log input state (safe extraction)"""
+  input_summary = {
+    "current_phase": state.get("current_phase", "unknown"),
+    "validation_score": state.get("validation_score", 0),
+  }
+  
+  langfuse_context.update_current_observation(
+    input=input_summary
+  )
+
+def _update_node_output(result: Dict[str, Any]):
+  """Log output state"""
+  output_summary = {
+    "current_phase": result.get("current_phase", "unknown"),
+    "validation_score": result.get("validation_score", 0),
+  }
+  
+  langfuse_context.update_current_observation(
+    output=output_summary
+  )
+
 def trace_llm_call(call_name: str, model: str = "gpt-4o-mini"):
   """
   Decorator for LLM call tracing
@@ -138,11 +365,14 @@ def trace_llm_call(call_name: str, model: str = "gpt-4o-mini"):
   - Cost
   """
   def decorator(func):
+    if not TRACING_ENABLED:
+      return func
+    
     @observe(
       name=call_name,
       as_type="generation"
     )
-    def wrapper(*args, **kwargs):
+    def observed(*args, **kwargs):
       # Add model metadata
       langfuse_context.update_current_observation(
         model=model,
@@ -166,6 +396,12 @@ def trace_llm_call(call_name: str, model: str = "gpt-4o-mini"):
       
       return result
     
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+      if not _is_sampled():
+        return func(*args, **kwargs)
+      return observed(*args, **kwargs)
+    
     return wrapper
   return decorator
 
@@ -179,23 +415,20 @@ def trace_graph_execution(graph_name: str, initial_state: Dict[str, Any]):
     with trace_graph_execution("Assistant Agent", initial_state):
       for output in app.stream(state):
         ...
-  """
-  client = get_langfuse()
   
-  if client:
-    trace = client.trace(
-      name=graph_name,
-      input={"initial_state": _safe_state_summary(initial_state)},
-      metadata={"graph_type": "langgraph"}
-    )
-    
-    try:
-      yield trace
-    finally:
-      # Flush to send data
-      client.flush()
-  else:
+  Yields a LangfuseTracer (None when tracing is off or the trace is not
+  sampled). Export happens in the background, nothing is flushed here.
+  """
+  if not TRACING_ENABLED or not _is_sampled():
     yield None
+    return
+  
+  tracer = LangfuseTracer(graph_name, metadata={"graph_type": "langgraph"})
+  tracer.start(input_data={"initial_state": _safe_state_summary(initial_state)})
+  try:
+    yield tracer
+  finally:
+    tracer.end()
 
 def _safe_state_summary(state: Dict[str, Any]) -> Dict[str, Any]:
   """
@@ -219,59 +452,99 @@ class LangfuseTracer:
     tracer = LangfuseTracer("Assistant Agent")
     tracer.start()
     
-    span = tracer.start_span("intake_node")
+    tracer.start_span("intake_node")
     # ... node execution
-    tracer.end_span(span, output=result)
+    tracer.end_span("intake_node", output_data=result)
     
     tracer.end()
+  
+  Every call only enqueues work on the background exporter. The sampling
+  decision is taken in start() (or inherited from the enclosing trace).
   """
   
-  def __init__(self, trace_name: str):
-    self.client = get_langfuse()
+  def __init__(self, trace_name: str, metadata: Dict = None):
     self.trace_name = trace_name
+    self.metadata = metadata or {}
+    self.trace_id = None
     self.trace = None
     self.spans = {}
+    self._sampled_token = None
   
   def start(self, input_data: Dict = None):
-    """Start a new trace"""
-    if self.client:
-      self.trace = self.client.trace(
+    """Start a new trace (no-op if tracing is off or not sampled)"""
+    if not TRACING_ENABLED:
+      return
+    
+    sampled = _is_sampled()
+    self._sampled_token = _trace_sampled.set(sampled)
+    if not sampled:
+      return
+    
+    self.trace_id = uuid.uuid4().hex
+    
+    def create_trace(client):
+      self.trace = client.trace(
+        id=self.trace_id,
         name=self.trace_name,
-        input=input_data or {}
+        input=input_data or {},
+        metadata=self.metadata
       )
+    
+    exporter.submit(create_trace)
   
   def start_span(self, span_name: str, input_data: Dict = None):
     """Start a new span within trace"""
-    if self.trace:
-      span = self.trace.span(
-        name=span_name,
-        input=input_data or {}
-      )
-      self.spans[span_name] = span
-      return span
-    return None
+    if not self.trace_id:
+      return None
+    
+    def create_span(client):
+      if self.trace is not None:
+        self.spans[span_name] = self.trace.span(name=span_name, input=input_data or {})
+    
+    exporter.submit(create_span)
+    return span_name
   
   def end_span(self, span_name: str, output_data: Dict = None):
     """End a span"""
-    if span_name in self.spans:
-      span = self.spans[span_name]
-      span.end(output=output_data or {})
+    if not self.trace_id:
+      return
+    
+    def finish_span(client):
+      span = self.spans.pop(span_name, None)
+      if span is not None:
+        span.end(output=output_data or {})
+    
+    exporter.submit(finish_span)
   
   def log_event(self, event_name: str, data: Dict = None):
     """Log an event in the trace"""
-    if self.trace:
-      self.trace.event(
-        name=event_name,
-        input=data or {}
-      )
+    if not self.trace_id:
+      return
+    
+    def create_event(client):
+      if self.trace is not None:
+        self.trace.event(name=event_name, input=data or {})
+    
+    exporter.submit(create_event)
   
   def end(self, output_data: Dict = None):
-    """End the trace"""
-    if self.trace:
-      self.trace.update(output=output_data or {})
+    """End the trace and restore the enclosing sampling decision"""
+    if self._sampled_token is not None:
+      try:
+        _trace_sampled.reset(self._sampled_token)
+      except ValueError:
+        # Ended from a different context than start(); nothing to restore there
+        pass
+      self._sampled_token = None
+    
+    if not self.trace_id:
+      return
+    
+    def finish_trace(client):
+      if self.trace is not None:
+        self.trace.update(output=output_data or {})
     
-    if self.client:
-      self.client.flush()
+    exporter.submit(finish_trace)
 
 # ============================== UTILITY FUNCTIONS =============================
 def log_agent_decision(decision: str, reasoning: str, metadata: Dict = None):
@@ -279,7 +552,7 @@ def log_agent_decision(decision: str, reasoning: str, metadata: Dict = None):
   Log an agent decision point
   Useful for debugging routing logic
   """
-  if langfuse_context:
+  if TRACING_ENABLED and _trace_sampled.get():
     langfuse_context.update_current_observation(
       output={
         "decision": decision,
@@ -290,9 +563,7 @@ def log_agent_decision(decision: str, reasoning: str, metadata: Dict = None):
 
 def flush_langfuse():
   """
-  Flush Langfuse to send all pending data
-  Call this at end of request/session
+  Ask the background exporter to send pending data soon
+  Does not block: export already happens in batches off the request path
   """
-  client = get_langfuse()
-  if client:
-    client.flush()
\ No newline at end of file
+  exporter.request_flush()
@@ -0,0 +1,100 @@
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .tracing import logger
+from .cache import CACHE_DIR, MemoryCache, SQLiteCache, make_cache_key
+from .metrics import CACHE_HITS, CACHE_MISSES
+from .llm_metrics import chat_completion
+
+# =============================== CONFIGURATION ================================
+# Backend used for every call site: "sqlite" (default), "memory" or "none"
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "sqlite")
+LLM_CACHE_PATH = os.path.join(CACHE_DIR, "llm_cache.db")
+
+# Per-call-site limits. Only deterministic, JSON-mode calls belong here.
+CALL_SITE_CONFIG: Dict[str, Dict[str, Any]] = {
+  "classify_confirmation": {
+    "ttl_seconds": 30 * 24 * 3600,
+    "max_entries": 5000
+  },
+  "extract_requirements": {
+    "ttl_seconds": 7 * 24 * 3600,
+    "max_entries": 2000
+  }
+}
+
+# ============================== CACHE BACKENDS ================================
+CACHE_BACKENDS: Dict[str, Callable[[str, Dict[str, Any]], Any]] = {
+  "sqlite": lambda call_site, config: SQLiteCache(
+    LLM_CACHE_PATH,
+    namespace=f"llm:{call_site}",
+    ttl_seconds=config["ttl_seconds"],
+    max_entries=config["max_entries"]
+  ),
+  "memory": lambda call_site, config: MemoryCache(
+    namespace=f"llm:{call_site}",
+    ttl_seconds=config["ttl_seconds"],
+    max_entries=config["max_entries"]
+  )
+}
+
+_caches: Dict[str, Any] = {}
+
+def register_cache_backend(name: str, factory: Callable[[str, Dict[str, Any]], Any]):
+  """
+  Plug in another backend. factory(call_site, config) must return an object
+  with get(key) / set(key, value) / stats() like SQLiteCache.
+  """
+  CACHE_BACKENDS[name] = factory
+
+def get_call_site_cache(call_site: str):
+  """Get (or lazily create) the cache for a call site, None if disabled"""
+  config = CALL_SITE_CONFIG.get(call_site)
+  factory = CACHE_BACKENDS.get(LLM_CACHE_BACKEND)
+
+  if config is None or factory is None:
+    return None
+
+  if call_site not in _caches:
+    _caches[call_site] = factory(call_site, config)
+  return _caches[call_site]
+
+def llm_cache_stats() -> Dict[str, Dict[str, Any]]:
+  """Hit/miss metrics for every call site used so far"""
+  return {call_site: cache.stats() for call_site, cache in _caches.items()}
+
+# ============================== CACHED COMPLETION =============================
+def cached_chat_completion(client, call_site: str, **params) -> str:
+  """
+  Call client.chat.completions.create(**params) through the response cache
+
+  The key covers model, messages and every other parameter, so changing the
+  prompt or temperature never returns a stale answer.
+
+  Returns:
+    The message content of the first choice
+  """
+  cache = get_call_site_cache(call_site)
+  key = make_cache_key(params) if cache is not None else None
+
+  if cache is not None:
+    started = time.perf_counter()
+    cached = cache.get(key)
+    if cached is not None:
+      CACHE_HITS.inc(cache=f"llm:{call_site}")
+      logger.log("LLM_CACHE_HIT", f"{call_site}: cached response",
+                data={
+                  "lookup_ms": round((time.perf_counter() - started) * 1000, 2),
+                  **cache.stats()
+                }, level="INFO")
+      return cached
+    CACHE_MISSES.inc(cache=f"llm:{call_site}")
+
+  response = chat_completion(client, call_site, **params)
+  content = response.choices[0].message.content
+
+  if cache is not None and content is not None:
+    cache.set(key, content)
+
+  return content
@@ -0,0 +1,118 @@
+import time
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from .metrics import LLM_LATENCY, TOKENS
+from .usage import usage_ledger
+
+def record_llm_call(call_site: str, model: str, seconds: float, usage: Optional[Dict[str, int]]):
+  """
+  Record one LLM call (metrics + usage ledger)
+
+  Args:
+    usage: {"prompt_tokens", "completion_tokens", "cached_tokens"} (may be None)
+  """
+  LLM_LATENCY.observe(seconds, call_site=call_site, model=model)
+
+  if not usage:
+    return
+  TOKENS.inc(usage.get("prompt_tokens", 0), call_site=call_site, model=model, kind="prompt")
+  TOKENS.inc(usage.get("completion_tokens", 0), call_site=call_site, model=model, kind="completion")
+  TOKENS.inc(usage.get("cached_tokens", 0), call_site=call_site, model=model, kind="cached")
+  usage_ledger.record(call_site, model, usage)
+
+def openai_usage(response) -> Dict[str, int]:
+  """Token usage of an OpenAI chat completion response"""
+  usage = getattr(response, "usage", None)
+  if usage is None:
+    return {}
+
+  details = getattr(usage, "prompt_tokens_details", None)
+  return {
+    "prompt_tokens": usage.prompt_tokens or 0,
+    "completion_tokens": usage.completion_tokens or 0,
+    "cached_tokens": (getattr(details, "cached_tokens", 0) or 0) if details else 0
+  }
+
+def chat_completion(client, call_site: str, **params):
+  """
+  client.chat.completions.create(**params) with latency and token metrics
+
+  Returns:
+    The raw OpenAI response
+  """
+  started = time.perf_counter()
+  response = client.chat.completions.create(**params)
+
+  record_llm_call(
+    call_site,
+    params.get("model", ""),
+    time.perf_counter() - started,
+    openai_usage(response)
+  )
+  return response
+
+class LLMMetricsHandler(BaseCallbackHandler):
+  """
+  LangChain callback recording latency and tokens of ChatOpenAI calls
+
+  Usage:
+    llm = ChatOpenAI(model="gpt-4o-mini", callbacks=[LLMMetricsHandler("planning")])
+  """
+
+  # Called on the caller's thread/context so the ledger sees the session
+  run_inline = True
+
+  def __init__(self, call_site: str):
+    self.call_site = call_site
+    self._started: Dict[UUID, tuple] = {}
+
+  def _start(self, run_id: UUID, kwargs: Dict[str, Any]):
+    params = kwargs.get("invocation_params") or {}
+    model = params.get("model_name") or params.get("model") or ""
+    self._started[run_id] = (time.perf_counter(), model)
+
+  def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any):
+    self._start(run_id, kwargs)
+
+  def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any):
+    self._start(run_id, kwargs)
+
+  def on_llm_error(self, error, *, run_id: UUID, **kwargs: Any):
+    self._started.pop(run_id, None)
+
+  def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+    started = self._started.pop(run_id, None)
+    if started is None:
+      return
+
+    started_at, model = started
+    llm_output = response.llm_output or {}
+    record_llm_call(
+      self.call_site,
+      llm_output.get("model_name") or model,
+      time.perf_counter() - started_at,
+      _langchain_usage(response)
+    )
+
+def _langchain_usage(response: LLMResult) -> Dict[str, int]:
+  # Streaming and newer langchain-openai report usage on the message
+  for generations in response.generations:
+    for generation in generations:
+      metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+      if metadata:
+        return {
+          "prompt_tokens": metadata.get("input_tokens", 0),
+          "completion_tokens": metadata.get("output_tokens", 0),
+          "cached_tokens": (metadata.get("input_token_details") or {}).get("cache_read", 0) or 0
+        }
+
+  token_usage = (response.llm_output or {}).get("token_usage") or {}
+  return {
+    "prompt_tokens": token_usage.get("prompt_tokens", 0),
+    "completion_tokens": token_usage.get("completion_tokens", 0),
+    "cached_tokens": (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0) or 0
+  }
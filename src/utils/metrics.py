@@ -0,0 +1,362 @@
+import os
+import time
+import inspect
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# =============================== CONFIGURATION ================================
+# Expose /metrics on this local port (unset: no server)
+METRICS_PORT = os.getenv("METRICS_PORT")
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+# Or write the exposition text to this file every METRICS_FILE_INTERVAL seconds
+METRICS_FILE = os.getenv("METRICS_FILE")
+METRICS_FILE_INTERVAL = float(os.getenv("METRICS_FILE_INTERVAL", "15"))
+
+# Latency buckets in seconds (LLM and search calls range from ms to minutes)
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+# Percentiles are computed over the most recent observations of each series
+QUANTILES = (0.5, 0.95, 0.99)
+QUANTILE_WINDOW = int(os.getenv("METRICS_QUANTILE_WINDOW", "2048"))
+
+LabelValues = Tuple[str, ...]
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+  pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+  if extra:
+    pairs.append(extra)
+  return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value: str) -> str:
+  return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+  if not sorted_values:
+    return 0.0
+  index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+  return sorted_values[index]
+
+# ================================ METRIC TYPES ================================
+class Counter:
+  """Monotonic counter with labels"""
+
+  type_name = "counter"
+
+  def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = ()):
+    self.name = name
+    self.description = description
+    self.labelnames = labelnames
+    self._values: Dict[LabelValues, float] = {}
+    self._lock = threading.Lock()
+
+  def inc(self, amount: float = 1, **labels):
+    key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+    with self._lock:
+      self._values[key] = self._values.get(key, 0) + amount
+
+  def value(self, **labels) -> float:
+    key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+    return self._values.get(key, 0)
+
+  def render(self) -> List[str]:
+    with self._lock:
+      items = sorted(self._values.items())
+    return [
+      f"{self.name}_total{_format_labels(self.labelnames, key)} {value}"
+      for key, value in items
+    ]
+
+class Histogram:
+  """
+  Cumulative-bucket histogram with labels, plus p50/p95/p99 over a sliding
+  window of recent observations (exported as <name>_quantile gauges)
+  """
+
+  type_name = "histogram"
+
+  def __init__(
+    self,
+    name: str,
+    description: str,
+    labelnames: Tuple[str, ...] = (),
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+  ):
+    self.name = name
+    self.description = description
+    self.labelnames = labelnames
+    self.buckets = tuple(sorted(buckets))
+    self._series: Dict[LabelValues, Dict] = {}
+    self._lock = threading.Lock()
+
+  def observe(self, value: float, **labels):
+    key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+    with self._lock:
+      series = self._series.get(key)
+      if series is None:
+        series = {
+          "buckets": [0] * len(self.buckets),
+          "sum": 0.0,
+          "count": 0,
+          "window": deque(maxlen=QUANTILE_WINDOW)
+        }
+        self._series[key] = series
+
+      for index, bound in enumerate(self.buckets):
+        if value <= bound:
+          series["buckets"][index] += 1
+          break
+      series["sum"] += value
+      series["count"] += 1
+      series["window"].append(value)
+
+  @contextmanager
+  def time(self, **labels):
+    started = time.perf_counter()
+    try:
+      yield
+    finally:
+      self.observe(time.perf_counter() - started, **labels)
+
+  def summary(self) -> List[Dict]:
+    """Per-series count and p50/p95/p99 (for CLI/UI display)"""
+    with self._lock:
+      snapshot = [(key, s["count"], sorted(s["window"])) for key, s in sorted(self._series.items())]
+
+    return [
+      {
+        **dict(zip(self.labelnames, key)),
+        "count": count,
+        **{f"p{int(q * 100)}": round(_percentile(window, q), 3) for q in QUANTILES}
+      }
+      for key, count, window in snapshot
+    ]
+
+  def quantiles(self, **labels) -> Dict[float, float]:
+    key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+    with self._lock:
+      series = self._series.get(key)
+      window = sorted(series["window"]) if series else []
+    return {q: _percentile(window, q) for q in QUANTILES}
+
+  def render(self) -> List[str]:
+    with self._lock:
+      snapshot = [
+        (key, list(s["buckets"]), s["sum"], s["count"])
+        for key, s in sorted(self._series.items())
+      ]
+
+    lines = []
+    for key, buckets, total, count in snapshot:
+      cumulative = 0
+      for bound, bucket_count in zip(self.buckets, buckets):
+        cumulative += bucket_count
+        le = f'le="{bound}"'
+        lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+      inf = 'le="+Inf"'
+      lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, inf)} {count}")
+      lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {round(total, 6)}")
+      lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+    return lines
+
+  def render_quantiles(self) -> List[str]:
+    with self._lock:
+      snapshot = [(key, sorted(s["window"])) for key, s in sorted(self._series.items())]
+
+    lines = []
+    for key, window in snapshot:
+      for q in QUANTILES:
+        labels = _format_labels(self.labelnames, key, f'quantile="{q}"')
+        lines.append(f"{self.name}_quantile{labels} {round(_percentile(window, q), 6)}")
+    return lines
+
+class Gauge:
+  """Gauge read from a callback at render time (e.g. the size of a store)"""
+
+  type_name = "gauge"
+
+  def __init__(
+    self,
+    name: str,
+    description: str,
+    labelnames: Tuple[str, ...],
+    collect: Callable[[], Dict[LabelValues, float]]
+  ):
+    self.name = name
+    self.description = description
+    self.labelnames = labelnames
+    self._collect = collect
+
+  def render(self) -> List[str]:
+    try:
+      values = self._collect()
+    except Exception:
+      # An unreachable store must not break the whole exposition
+      return []
+    return [
+      f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+      for key, value in sorted(values.items())
+    ]
+
+# ================================== REGISTRY ==================================
+class MetricsRegistry:
+  """
+  In-process metrics rendered in the Prometheus text exposition format
+
+  Usage:
+    latency = metrics.histogram("srs_node_seconds", "Node latency", ("stage",))
+    with latency.time(stage="research"):
+      ...
+    print(metrics.render())
+  """
+
+  def __init__(self):
+    self._metrics: Dict[str, object] = {}
+    self._lock = threading.Lock()
+
+  def _register(self, metric):
+    with self._lock:
+      return self._metrics.setdefault(metric.name, metric)
+
+  def counter(self, name: str, description: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+    return self._register(Counter(name, description, labelnames))
+
+  def histogram(
+    self,
+    name: str,
+    description: str,
+    labelnames: Tuple[str, ...] = (),
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+  ) -> Histogram:
+    return self._register(Histogram(name, description, labelnames, buckets))
+
+  def gauge(
+    self,
+    name: str,
+    description: str,
+    labelnames: Tuple[str, ...],
+    collect: Callable[[], Dict[LabelValues, float]]
+  ) -> Gauge:
+    return self._register(Gauge(name, description, labelnames, collect))
+
+  def render(self) -> str:
+    with self._lock:
+      metrics = list(self._metrics.values())
+
+    lines = []
+    for metric in metrics:
+      exported_name = f"{metric.name}_total" if metric.type_name == "counter" else metric.name
+      lines.append(f"# HELP {exported_name} {metric.description}")
+      lines.append(f"# TYPE {exported_name} {metric.type_name}")
+      lines.extend(metric.render())
+
+      if metric.type_name == "histogram":
+        lines.append(f"# HELP {metric.name}_quantile {metric.description} (recent p50/p95/p99)")
+        lines.append(f"# TYPE {metric.name}_quantile gauge")
+        lines.extend(metric.render_quantiles())
+    return "\n".join(lines) + "\n"
+
+  def write(self, path: str):
+    """Atomically write the exposition text (e.g. for node_exporter textfile)"""
+    directory = os.path.dirname(path)
+    if directory:
+      os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+      f.write(self.render())
+    os.replace(tmp_path, path)
+
+metrics = MetricsRegistry()
+
+# ============================== STANDARD METRICS ==============================
+NODE_LATENCY = metrics.histogram(
+  "srs_node_duration_seconds", "Graph node latency", ("graph", "stage")
+)
+LLM_LATENCY = metrics.histogram(
+  "srs_llm_call_duration_seconds", "LLM call latency", ("call_site", "model")
+)
+SEARCH_LATENCY = metrics.histogram(
+  "srs_tavily_call_duration_seconds", "Tavily search latency (upstream calls only)"
+)
+TOKENS = metrics.counter(
+  "srs_llm_tokens", "LLM tokens by call site and kind (prompt, completion, cached)",
+  ("call_site", "model", "kind")
+)
+CACHE_HITS = metrics.counter("srs_cache_hits", "Cache hits", ("cache",))
+CACHE_MISSES = metrics.counter("srs_cache_misses", "Cache misses", ("cache",))
+
+def timed_node(graph: str, stage: str, func: Callable) -> Callable:
+  """Wrap a (sync or async) graph node so its latency lands in NODE_LATENCY"""
+  if inspect.iscoroutinefunction(func):
+    @functools.wraps(func)
+    async def async_wrapper(*args, **kwargs):
+      with NODE_LATENCY.time(graph=graph, stage=stage):
+        return await func(*args, **kwargs)
+    return async_wrapper
+
+  @functools.wraps(func)
+  def wrapper(*args, **kwargs):
+    with NODE_LATENCY.time(graph=graph, stage=stage):
+      return func(*args, **kwargs)
+  return wrapper
+
+# ================================= EXPOSITION =================================
+class _MetricsHandler(BaseHTTPRequestHandler):
+  def do_GET(self):
+    if self.path.rstrip("/") not in ("", "/metrics"):
+      self.send_error(404)
+      return
+
+    body = metrics.render().encode("utf-8")
+    self.send_response(200)
+    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+    self.send_header("Content-Length", str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def log_message(self, format, *args):
+    pass  # keep scrapes out of the console
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+def start_metrics_server(port: int, host: str = METRICS_HOST) -> Optional[ThreadingHTTPServer]:
+  """Serve /metrics on a daemon thread, None if the port is taken"""
+  try:
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+  except OSError:
+    return None
+
+  threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+  return server
+
+def start_metrics_file_writer(path: str, interval: float = METRICS_FILE_INTERVAL):
+  """Rewrite the metrics file periodically on a daemon thread"""
+  def run():
+    while True:
+      time.sleep(interval)
+      try:
+        metrics.write(path)
+      except OSError:
+        pass
+
+  threading.Thread(target=run, name="metrics-file", daemon=True).start()
+
+def start_metrics_exporters():
+  """Start the exporters configured by METRICS_PORT / METRICS_FILE (once)"""
+  global _exporters_started
+
+  with _exporters_lock:
+    if _exporters_started:
+      return
+    _exporters_started = True
+
+  if METRICS_PORT:
+    start_metrics_server(int(METRICS_PORT))
+  if METRICS_FILE:
+    start_metrics_file_writer(METRICS_FILE)
@@ -0,0 +1,342 @@
+import re
+import io
+import zipfile
+from io import BytesIO
+from typing import BinaryIO, Iterable, Iterator, List, Tuple, Union
+from xml.sax.saxutils import escape
+
+# ============================== PACKAGE PARTS =================================
+# Static parts of a minimal WordprocessingML package; only document.xml and
+# numbering.xml depend on the content
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+<Override PartName="/word/numbering.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/>
+</Types>"""
+
+_PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+_DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering" Target="numbering.xml"/>
+</Relationships>"""
+
+_W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+def _heading_style(level: int, size: int) -> str:
+  return (
+    f'<w:style w:type="paragraph" w:styleId="Heading{level}">'
+    f'<w:name w:val="heading {level}"/><w:basedOn w:val="Normal"/><w:next w:val="Normal"/><w:qFormat/>'
+    f'<w:pPr><w:keepNext/><w:spacing w:before="240" w:after="80"/><w:outlineLvl w:val="{level - 1}"/></w:pPr>'
+    f'<w:rPr><w:b/><w:color w:val="1F3864"/><w:sz w:val="{size}"/></w:rPr></w:style>'
+  )
+
+_STYLES = (
+  f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:styles {_W}>'
+  '<w:docDefaults><w:rPrDefault><w:rPr>'
+  '<w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:eastAsia="Calibri" w:cs="Calibri"/>'
+  '<w:sz w:val="22"/></w:rPr></w:rPrDefault>'
+  '<w:pPrDefault><w:pPr><w:spacing w:after="120"/></w:pPr></w:pPrDefault></w:docDefaults>'
+  '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/></w:style>'
+  + "".join(_heading_style(level, size) for level, size in ((1, 32), (2, 28), (3, 24), (4, 22)))
+  + '<w:style w:type="paragraph" w:styleId="ListBullet"><w:name w:val="List Bullet"/><w:basedOn w:val="Normal"/>'
+  '<w:pPr><w:spacing w:after="40"/></w:pPr></w:style>'
+  '<w:style w:type="paragraph" w:styleId="ListNumber"><w:name w:val="List Number"/><w:basedOn w:val="Normal"/>'
+  '<w:pPr><w:spacing w:after="40"/></w:pPr></w:style>'
+  '<w:style w:type="paragraph" w:styleId="Code"><w:name w:val="Code"/><w:basedOn w:val="Normal"/>'
+  '<w:pPr><w:spacing w:after="0"/></w:pPr>'
+  '<w:rPr><w:rFonts w:ascii="Courier New" w:hAnsi="Courier New" w:cs="Courier New"/><w:sz w:val="20"/></w:rPr></w:style>'
+  '<w:style w:type="table" w:styleId="TableGrid"><w:name w:val="Table Grid"/><w:tblPr><w:tblBorders>'
+  + "".join(
+    f'<w:{side} w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+    for side in ("top", "left", "bottom", "right", "insideH", "insideV")
+  )
+  + '</w:tblBorders><w:tblCellMar><w:left w:w="108" w:type="dxa"/><w:right w:w="108" w:type="dxa"/></w:tblCellMar>'
+  '</w:tblPr></w:style></w:styles>'
+)
+
+# List levels: indentation (2 spaces) gives the nesting level, max 3 levels
+_LIST_LEVELS = 3
+_BULLET_NUM_ID = 1
+
+def _abstract_numbering(abstract_id: int, numbered: bool) -> str:
+  levels = []
+  for level in range(_LIST_LEVELS):
+    if numbered:
+      fmt, text = ("decimal", f"%{level + 1}.")
+    else:
+      fmt, text = ("bullet", ("•", "◦", "▪")[level])
+    indent = 720 * (level + 1)
+    levels.append(
+      f'<w:lvl w:ilvl="{level}"><w:start w:val="1"/><w:numFmt w:val="{fmt}"/>'
+      f'<w:lvlText w:val="{text}"/><w:lvlJc w:val="left"/>'
+      f'<w:pPr><w:ind w:left="{indent}" w:hanging="360"/></w:pPr></w:lvl>'
+    )
+  return f'<w:abstractNum w:abstractNumId="{abstract_id}">{"".join(levels)}</w:abstractNum>'
+
+def _numbering(numbered_lists: int) -> str:
+  """
+  One bullet instance shared by every bullet list, one numbered instance
+  per numbered list so each list restarts at 1
+  """
+  instances = [f'<w:num w:numId="{_BULLET_NUM_ID}"><w:abstractNumId w:val="0"/></w:num>']
+  for num_id in range(_BULLET_NUM_ID + 1, _BULLET_NUM_ID + 1 + numbered_lists):
+    instances.append(
+      f'<w:num w:numId="{num_id}"><w:abstractNumId w:val="1"/>'
+      f'<w:lvlOverride w:ilvl="0"><w:startOverride w:val="1"/></w:lvlOverride></w:num>'
+    )
+  return (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:numbering {_W}>'
+    + _abstract_numbering(0, numbered=False)
+    + _abstract_numbering(1, numbered=True)
+    + "".join(instances)
+    + "</w:numbering>"
+  )
+
+# ================================ INLINE RUNS =================================
+# Characters XML 1.0 does not allow (LLM output occasionally contains them)
+_INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_INLINE = re.compile(
+  r"\*\*\*(?P<bolditalic>.+?)\*\*\*"
+  r"|\*\*(?P<bold>.+?)\*\*"
+  r"|__(?P<bold2>.+?)__"
+  r"|(?<![*\w])\*(?P<italic>[^*\s](?:[^*]*?[^*\s])?)\*(?!\*)"
+  r"|`(?P<code>[^`]+)`"
+)
+
+def _text(value: str) -> str:
+  return escape(_INVALID_XML.sub("", value))
+
+def _run(text: str, bold: bool = False, italic: bool = False, code: bool = False) -> str:
+  if not text:
+    return ""
+  props = ""
+  if bold:
+    props += "<w:b/>"
+  if italic:
+    props += "<w:i/>"
+  if code:
+    props += '<w:rFonts w:ascii="Courier New" w:hAnsi="Courier New" w:cs="Courier New"/><w:sz w:val="20"/>'
+  rpr = f"<w:rPr>{props}</w:rPr>" if props else ""
+  return f'<w:r>{rpr}<w:t xml:space="preserve">{_text(text)}</w:t></w:r>'
+
+def inline_runs(text: str, bold: bool = False) -> str:
+  """Markdown inline emphasis (***, **, __, *, `code`) -> WordprocessingML runs"""
+  runs = []
+  position = 0
+  for match in _INLINE.finditer(text):
+    runs.append(_run(text[position:match.start()], bold=bold))
+    if match.group("bolditalic") is not None:
+      runs.append(_run(match.group("bolditalic"), bold=True, italic=True))
+    elif match.group("bold") is not None or match.group("bold2") is not None:
+      runs.append(_run(match.group("bold") or match.group("bold2"), bold=True))
+    elif match.group("italic") is not None:
+      runs.append(_run(match.group("italic"), bold=bold, italic=True))
+    else:
+      runs.append(_run(match.group("code"), bold=bold, code=True))
+    position = match.end()
+  runs.append(_run(text[position:], bold=bold))
+  return "".join(runs)
+
+# ================================= BLOCKS =====================================
+def _paragraph(runs: str, style: str = None, num: Tuple[int, int] = None) -> str:
+  props = ""
+  if style:
+    props += f'<w:pStyle w:val="{style}"/>'
+  if num:
+    num_id, level = num
+    props += f'<w:numPr><w:ilvl w:val="{level}"/><w:numId w:val="{num_id}"/></w:numPr>'
+  ppr = f"<w:pPr>{props}</w:pPr>" if props else ""
+  return f"<w:p>{ppr}{runs}</w:p>"
+
+_SEPARATOR_ROW = re.compile(r"^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?$")
+_NUMBERED_ITEM = re.compile(r"^\d+\. ")
+
+def _table_cells(line: str) -> List[str]:
+  line = line.strip()
+  if line.startswith("|"):
+    line = line[1:]
+  if line.endswith("|") and not line.endswith("\\|"):
+    line = line[:-1]
+  return [cell.strip().replace("\\|", "|") for cell in re.split(r"(?<!\\)\|", line)]
+
+def _table(lines: List[str]) -> str:
+  """Pipe table -> w:tbl; the row above a |---| separator is a bold header"""
+  rows = []
+  header_rows = 0
+  for line in lines:
+    if _SEPARATOR_ROW.match(line.strip()):
+      header_rows = len(rows)
+      continue
+    rows.append(_table_cells(line))
+
+  columns = max(len(row) for row in rows) if rows else 1
+  width = 9000 // columns
+
+  parts = [
+    '<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:w="0" w:type="auto"/></w:tblPr><w:tblGrid>',
+    f'<w:gridCol w:w="{width}"/>' * columns,
+    "</w:tblGrid>"
+  ]
+  for index, row in enumerate(rows):
+    header = index < header_rows
+    parts.append("<w:tr>")
+    for column in range(columns):
+      cell = row[column] if column < len(row) else ""
+      parts.append(
+        f'<w:tc><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/></w:tcPr>'
+        f"{_paragraph(inline_runs(cell, bold=header))}</w:tc>"
+      )
+    parts.append("</w:tr>")
+  parts.append("</w:tbl>")
+  return "".join(parts)
+
+def _lines(markdown: Union[str, Iterable[str]]) -> Iterator[str]:
+  if isinstance(markdown, str):
+    # Lazily, without materializing a list of every line
+    for match in re.finditer(r"[^\n]*\n|[^\n]+$", markdown):
+      yield match.group(0)
+  else:
+    yield from markdown
+
+class _BodyWriter:
+  """
+  Markdown lines -> document.xml body elements, one block at a time
+  (only a pipe table is buffered, until its last row)
+  """
+  def __init__(self):
+    self.numbered_lists = 0
+    self._in_code_block = False
+    self._table: List[str] = []
+    self._list_kind = None
+
+  def _list_num(self, numbered: bool) -> int:
+    if not numbered:
+      return _BULLET_NUM_ID
+    if self._list_kind != "number":
+      self.numbered_lists += 1
+    return _BULLET_NUM_ID + self.numbered_lists
+
+  def feed(self, line: str) -> Iterator[str]:
+    line = line.rstrip("\r\n").rstrip()
+    stripped = line.strip()
+
+    if self._table and not stripped.startswith("|"):
+      yield _table(self._table)
+      self._table = []
+
+    # Code blocks (including mermaid): monospace, one paragraph per line
+    if line.startswith("```"):
+      self._in_code_block = not self._in_code_block
+      self._list_kind = None
+      return
+
+    if self._in_code_block:
+      yield _paragraph(_run(line) if line else "", style="Code")
+      return
+
+    if stripped.startswith("|"):
+      self._table.append(line)
+      self._list_kind = None
+      return
+
+    list_kind = None
+
+    # Headers
+    if line.startswith("# "):
+      yield _paragraph(inline_runs(line[2:]), style="Heading1")
+    elif line.startswith("## "):
+      yield _paragraph(inline_runs(line[3:]), style="Heading2")
+    elif line.startswith("### "):
+      yield _paragraph(inline_runs(line[4:]), style="Heading3")
+    elif line.startswith("#### "):
+      yield _paragraph(inline_runs(line[5:]), style="Heading4")
+
+    # Bullet points
+    elif stripped.startswith("- ") or stripped.startswith("* "):
+      level = min((len(line) - len(line.lstrip())) // 2, _LIST_LEVELS - 1)
+      yield _paragraph(inline_runs(stripped[2:]), style="ListBullet", num=(self._list_num(False), level))
+      list_kind = "bullet" if self._list_kind != "number" else "number"
+
+    # Numbered lists
+    elif _NUMBERED_ITEM.match(stripped):
+      level = min((len(line) - len(line.lstrip())) // 2, _LIST_LEVELS - 1)
+      num_id = self._list_num(True)
+      yield _paragraph(inline_runs(_NUMBERED_ITEM.sub("", stripped)), style="ListNumber", num=(num_id, level))
+      list_kind = "number"
+
+    # Horizontal Rule
+    elif stripped == "---" or stripped == "***":
+      yield _paragraph(_run("_" * 20))
+
+    # Ignore empty lines unless inside code block (lists continue across them)
+    elif not stripped:
+      return
+
+    # Normal text
+    else:
+      yield _paragraph(inline_runs(line))
+
+    self._list_kind = list_kind
+
+  def close(self) -> Iterator[str]:
+    if self._table:
+      yield _table(self._table)
+      self._table = []
+
+# ================================== WRITER ====================================
+def write_docx(markdown: Union[str, Iterable[str]], target: Union[str, BinaryIO]):
+  """
+  Stream Markdown into a .docx zip container
+
+  document.xml is written block by block straight into the compressed zip
+  entry, so memory stays flat however long the SRS is.
+
+  Args:
+    markdown: The SRS as one string or any iterable of lines (e.g. a file)
+    target: Path or writable binary stream
+  """
+  body = _BodyWriter()
+
+  with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as package:
+    package.writestr("[Content_Types].xml", _CONTENT_TYPES)
+    package.writestr("_rels/.rels", _PACKAGE_RELS)
+    package.writestr("word/_rels/document.xml.rels", _DOCUMENT_RELS)
+    package.writestr("word/styles.xml", _STYLES)
+
+    with package.open("word/document.xml", "w") as entry:
+      out = io.TextIOWrapper(entry, encoding="utf-8", newline="")
+      out.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:document {_W}><w:body>')
+      for line in _lines(markdown):
+        for element in body.feed(line):
+          out.write(element)
+      for element in body.close():
+        out.write(element)
+      out.write(
+        '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+        '<w:pgMar w:top="1440" w:right="1440" w:bottom="1440" w:left="1440" w:header="720" w:footer="720" w:gutter="0"/>'
+        "</w:sectPr></w:body></w:document>"
+      )
+      out.flush()
+      out.detach()
+
+    # Numbered list count is only known once the body is written
+    package.writestr("word/numbering.xml", _numbering(body.numbered_lists))
+
+def convert_to_docx_stream(markdown_text: str) -> BytesIO:
+  """
+  Same contract as exporter.convert_to_docx, built by the streaming writer
+  """
+  file_stream = BytesIO()
+  write_docx(markdown_text, file_stream)
+  file_stream.seek(0)
+  return file_stream
@@ -0,0 +1,224 @@
+import os
+import re
+import json
+import math
+from collections import Counter
+from typing import Dict, List, Optional
+
+from .tracing import logger
+
+# =============================== CONFIGURATION ================================
+# Token budgets of the variable parts of each SRS prompt
+PLANNER_RESEARCH_BUDGET = int(os.getenv("PROMPT_BUDGET_PLANNER_RESEARCH", "4000"))
+PLANNER_TOOL_RESULTS_BUDGET = int(os.getenv("PROMPT_BUDGET_PLANNER_TOOLS", "3000"))
+WORKER_TASK_BUDGET = int(os.getenv("PROMPT_BUDGET_WORKER_TASK", "2000"))
+SYNTHESIS_WORKERS_BUDGET = int(os.getenv("PROMPT_BUDGET_SYNTHESIS_WORKERS", "24000"))
+SYNTHESIS_OUTLINE_BUDGET = int(os.getenv("PROMPT_BUDGET_SYNTHESIS_OUTLINE", "4000"))
+SYNTHESIS_SECTION_BUDGET = int(os.getenv("PROMPT_BUDGET_SYNTHESIS_SECTION", "10000"))
+
+# How overflow is compacted: "summarize" (extractive) or "truncate"
+PROMPT_COMPACTION = os.getenv("PROMPT_COMPACTION", "summarize")
+
+TRUNCATION_MARKER = "\n[...truncated]"
+
+# ============================== TOKEN COUNTING ================================
+_encoding = None
+_encoding_loaded = False
+
+def _get_encoding():
+  """tiktoken encoding if installed, else None (heuristic counting)"""
+  global _encoding, _encoding_loaded
+  if not _encoding_loaded:
+    _encoding_loaded = True
+    try:
+      import tiktoken
+      try:
+        _encoding = tiktoken.encoding_for_model("gpt-4o-mini")
+      except KeyError:
+        _encoding = tiktoken.get_encoding("o200k_base")
+    except Exception:
+      _encoding = None
+  return _encoding
+
+def count_tokens(text: str) -> int:
+  """Token count (exact with tiktoken, ~4 characters per token otherwise)"""
+  if not text:
+    return 0
+  encoding = _get_encoding()
+  if encoding is not None:
+    return len(encoding.encode(text, disallowed_special=()))
+  return math.ceil(len(text) / 4)
+
+# ================================ COMPACTION ==================================
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+  """Keep the head of the text, cut at a line/sentence boundary when possible"""
+  if count_tokens(text) <= max_tokens:
+    return text
+  if max_tokens <= 0:
+    return ""
+
+  encoding = _get_encoding()
+  if encoding is not None:
+    head = encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+  else:
+    head = text[:max_tokens * 4]
+
+  # Prefer a clean boundary in the last fifth of the kept text
+  boundary = max(head.rfind("\n"), head.rfind(". "))
+  if boundary > len(head) * 0.8:
+    head = head[:boundary + 1]
+
+  # Never leave a code/mermaid block open: drop it, or close it when it is most of the text
+  fences = [match.start() for match in _FENCE_LINE.finditer(head)]
+  if len(fences) % 2:
+    if fences[-1] > len(head) * 0.5:
+      head = head[:fences[-1]]
+    else:
+      head = head.rstrip() + "\n```"
+  return head.rstrip() + TRUNCATION_MARKER
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"\w+", re.UNICODE)
+_FENCE = re.compile(r"^\s*(?:```|~~~)")
+_FENCE_LINE = re.compile(r"^[ \t]*(?:```|~~~)", re.MULTILINE)
+
+def _units(text: str) -> List[str]:
+  """Sentences/lines of the prose, each fenced block as one unit"""
+  units, prose, fence = [], [], None
+
+  def flush_prose():
+    units.extend(s.strip() for s in _SENTENCE_SPLIT.split("\n".join(prose)) if s and s.strip())
+    prose.clear()
+
+  for line in text.split("\n"):
+    if fence is not None:
+      fence.append(line)
+      if _FENCE.match(line):
+        units.append("\n".join(fence))
+        fence = None
+    elif _FENCE.match(line):
+      flush_prose()
+      fence = [line]
+    else:
+      prose.append(line)
+
+  flush_prose()
+  if fence is not None:
+    units.append("\n".join(fence))
+  return units
+
+def extractive_summary(text: str, max_tokens: int) -> str:
+  """
+  Keep the most informative sentences (word-frequency scoring, first lines
+  favored) in their original order until the budget is used. Fenced code
+  and mermaid blocks are kept or dropped whole. Deterministic.
+  """
+  if count_tokens(text) <= max_tokens:
+    return text
+
+  sentences = _units(text)
+  if len(sentences) <= 1:
+    return truncate_to_tokens(text, max_tokens)
+
+  frequencies = Counter(word.lower() for word in _WORD.findall(text) if len(word) > 3)
+
+  def score(index: int) -> float:
+    words = [word.lower() for word in _WORD.findall(sentences[index]) if len(word) > 3]
+    if not words:
+      return 0.0
+    density = sum(frequencies[word] for word in words) / len(words)
+    return density * (1.0 + 1.0 / (1 + index))
+
+  ranked = sorted(range(len(sentences)), key=lambda i: (-score(i), i))
+
+  selected, used = [], 0
+  for index in ranked:
+    cost = count_tokens(sentences[index]) + 1
+    if used + cost > max_tokens:
+      continue
+    selected.append(index)
+    used += cost
+
+  if not selected:
+    return truncate_to_tokens(text, max_tokens)
+  return "\n".join(sentences[i] for i in sorted(selected)) + TRUNCATION_MARKER
+
+def compact(text: str, max_tokens: int, strategy: str = PROMPT_COMPACTION) -> str:
+  if strategy == "truncate":
+    return truncate_to_tokens(text, max_tokens)
+  return extractive_summary(text, max_tokens)
+
+# ================================ ALLOCATION ==================================
+def allocate(sizes: List[int], budget: int, shares: Optional[List[float]] = None) -> List[int]:
+  """
+  Split budget between parts of the given token sizes
+
+  Each part gets its share (equal by default). Parts smaller than their share
+  keep their size and the unused tokens go to the parts that overflow.
+  """
+  shares = shares or [1.0] * len(sizes)
+  limits = [0] * len(sizes)
+  pending = [i for i in range(len(sizes))]
+  remaining = budget
+
+  while pending:
+    total_share = sum(shares[i] for i in pending) or 1.0
+    fits = [i for i in pending if sizes[i] <= remaining * shares[i] / total_share]
+    if not fits:
+      for i in pending:
+        limits[i] = int(remaining * shares[i] / total_share)
+      break
+
+    for i in fits:
+      limits[i] = sizes[i]
+      remaining -= sizes[i]
+    pending = [i for i in pending if i not in fits]
+
+  return limits
+
+def fit_texts(
+  texts: List[str],
+  budget: int,
+  label: str,
+  shares: Optional[List[float]] = None,
+  strategy: str = PROMPT_COMPACTION
+) -> List[str]:
+  """
+  Compact a list of prompt sections so that together they fit in budget tokens
+
+  Returns:
+    The sections in the same order (unchanged when they already fit)
+  """
+  sizes = [count_tokens(text) for text in texts]
+  if sum(sizes) <= budget:
+    return list(texts)
+
+  limits = allocate(sizes, budget, shares)
+  fitted = [
+    text if size <= limit else compact(text, limit, strategy)
+    for text, size, limit in zip(texts, sizes, limits)
+  ]
+
+  logger.log("PROMPT_BUDGET", f"{label}: compacted {sum(sizes)} -> budget {budget} tokens",
+            data={
+              "strategy": strategy,
+              "tokens_before": sum(sizes),
+              "tokens_after": sum(count_tokens(text) for text in fitted),
+              "sections": len(texts)
+            }, level="INFO")
+  return fitted
+
+def fit_text(text: str, budget: int, label: str, strategy: str = PROMPT_COMPACTION) -> str:
+  return fit_texts([text], budget, label, strategy=strategy)[0]
+
+def fit_fields(data: Dict, budget: int, label: str, strategy: str = PROMPT_COMPACTION) -> Dict:
+  """
+  Compact the string fields of a JSON object so that json.dumps(data, indent=2)
+  fits in budget tokens. Field by field, so the result stays valid JSON.
+  """
+  keys = [key for key, value in data.items() if isinstance(value, str)]
+  skeleton = {key: "" if key in keys else value for key, value in data.items()}
+  overhead = count_tokens(json.dumps(skeleton, indent=2, ensure_ascii=False, default=str))
+
+  fitted = fit_texts([data[key] for key in keys], max(budget - overhead, 0), label, strategy=strategy)
+  return {**data, **dict(zip(keys, fitted))}
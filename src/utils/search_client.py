@@ -0,0 +1,131 @@
+import atexit
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .metrics import SEARCH_LATENCY
+
+class AsyncSearchClient:
+  """
+  Async Tavily client shared by every session in the process
+
+  - One pooled, keep-alive httpx.AsyncClient owned by a background event loop,
+    so concurrent SRS jobs (on any thread or event loop) reuse connections
+  - Identical in-flight queries are coalesced into a single upstream request
+
+  Usage:
+    client = AsyncSearchClient(api_key)
+    response = client.search(key, payload)         # sync callers
+    response = await client.asearch(key, payload)  # async callers
+  """
+
+  def __init__(
+    self,
+    api_key: Optional[str],
+    base_url: str = "https://api.tavily.com",
+    max_connections: int = 20,
+    timeout: float = 30.0
+  ):
+    self.api_key = api_key
+    self.base_url = base_url
+    self.max_connections = max_connections
+    self.timeout = timeout
+
+    self.upstream_requests = 0
+    self.coalesced_requests = 0
+
+    self._loop = None
+    self._http = None
+    self._inflight: Dict[str, asyncio.Task] = {}
+    self._lock = threading.Lock()
+
+  # ============================== EVENT LOOP ==================================
+  def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+    """Start the background loop that owns the HTTP pool (first use)"""
+    with self._lock:
+      if self._loop is None:
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(
+          target=loop.run_forever,
+          name="search-client-loop",
+          daemon=True
+        )
+        thread.start()
+        self._loop = loop
+        atexit.register(self.close)
+    return self._loop
+
+  def _get_http(self) -> httpx.AsyncClient:
+    """Create the pooled client on the background loop"""
+    if self._http is None:
+      self._http = httpx.AsyncClient(
+        base_url=self.base_url,
+        timeout=self.timeout,
+        headers={"Authorization": f"Bearer {self.api_key}"},
+        limits=httpx.Limits(
+          max_connections=self.max_connections,
+          max_keepalive_connections=self.max_connections
+        )
+      )
+    return self._http
+
+  # ================================ REQUESTS ==================================
+  async def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    # Timed here so cache hits and coalesced waiters do not skew the histogram
+    with SEARCH_LATENCY.time():
+      response = await self._get_http().post("/search", json=payload)
+    response.raise_for_status()
+    return response.json()
+
+  async def _coalesced_search(self, key: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Runs on the background loop, so _inflight needs no extra locking"""
+    task = self._inflight.get(key)
+
+    if task is None:
+      self.upstream_requests += 1
+      task = asyncio.ensure_future(self._post(payload))
+      self._inflight[key] = task
+      task.add_done_callback(lambda _: self._inflight.pop(key, None))
+    else:
+      self.coalesced_requests += 1
+
+    # Shield so one cancelled waiter does not cancel the shared request
+    return await asyncio.shield(task)
+
+  def submit(self, key: str, payload: Dict[str, Any]) -> Future:
+    """Schedule a search on the background loop"""
+    loop = self._ensure_loop()
+    return asyncio.run_coroutine_threadsafe(self._coalesced_search(key, payload), loop)
+
+  def search(self, key: str, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Blocking search for sync callers"""
+    return self.submit(key, payload).result(timeout=timeout)
+
+  async def asearch(self, key: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Search from any event loop"""
+    return await asyncio.wrap_future(self.submit(key, payload))
+
+  def stats(self) -> Dict[str, int]:
+    return {
+      "upstream_requests": self.upstream_requests,
+      "coalesced_requests": self.coalesced_requests,
+      "in_flight": len(self._inflight)
+    }
+
+  def close(self):
+    """Close the HTTP pool and stop the background loop"""
+    loop = self._loop
+    if loop is None or loop.is_closed():
+      return
+
+    if self._http is not None:
+      try:
+        asyncio.run_coroutine_threadsafe(self._http.aclose(), loop).result(timeout=5)
+      except Exception:
+        pass
+      self._http = None
+
+    loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,53 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+# Receives each synthesis token as it arrives (None = no one is listening)
+_token_listener: ContextVar[Optional[Callable[[str], None]]] = ContextVar(
+  "token_listener", default=None
+)
+
+@contextmanager
+def stream_tokens_to(callback: Callable[[str], None]):
+  """
+  Forward streamed LLM tokens to callback for everything run inside the block
+
+  Usage:
+    with stream_tokens_to(lambda token: print(token, end="", flush=True)):
+      srs = await generate_srs_langgraph(query)
+  """
+  token = _token_listener.set(callback)
+  try:
+    yield
+  finally:
+    _token_listener.reset(token)
+
+def get_token_listener() -> Optional[Callable[[str], None]]:
+  """Current token listener, if the caller asked for streaming"""
+  return _token_listener.get()
+
+class TokenBuffer:
+  """
+  Thread-safe token accumulator
+
+  The graph appends tokens from its own thread while the UI thread
+  polls text() to render the document as it grows.
+  """
+
+  def __init__(self):
+    self._parts = []
+    self._length = 0
+    self._lock = threading.Lock()
+
+  def append(self, token: str):
+    with self._lock:
+      self._parts.append(token)
+      self._length += len(token)
+
+  def __len__(self) -> int:
+    return self._length
+
+  def text(self) -> str:
+    with self._lock:
+      return "".join(self._parts)
@@ -0,0 +1,169 @@
+import os
+import gzip
+import json
+import shutil
+import argparse
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+class JSONLTraceSink:
+  """
+  Append-only JSONL trace file with size-based rotation
+
+  Every record is written (and flushed) as one line as soon as it arrives, so
+  the trace survives crashes and is never held in memory. When the active file
+  would exceed max_bytes it is rotated like logging.RotatingFileHandler:
+  trace.jsonl -> trace.jsonl.1 (-> .1.gz when compress=True) -> ... up to
+  backup_count files.
+
+  Usage:
+    sink = JSONLTraceSink("logs/trace.jsonl", max_bytes=10_000_000, compress=True)
+    sink.write({"event_type": "NODE_START", ...})
+  """
+
+  def __init__(
+    self,
+    path: str,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    compress: bool = False
+  ):
+    self.path = path
+    self.max_bytes = max_bytes
+    self.backup_count = backup_count
+    self.compress = compress
+    self._file = None
+    self._size = 0
+    self._lock = threading.Lock()
+
+  def _open(self):
+    if self._file is None:
+      directory = os.path.dirname(self.path)
+      if directory:
+        os.makedirs(directory, exist_ok=True)
+      self._file = open(self.path, "a", encoding="utf-8")
+      self._size = self._file.tell()
+    return self._file
+
+  def _backup_name(self, index: int) -> str:
+    name = f"{self.path}.{index}"
+    return f"{name}.gz" if self.compress else name
+
+  def _rotate(self):
+    if self._file is not None:
+      self._file.close()
+      self._file = None
+
+    if self.backup_count <= 0:
+      os.remove(self.path)
+      return
+
+    # Shift trace.jsonl.N-1 -> trace.jsonl.N (the oldest one falls off)
+    for index in range(self.backup_count - 1, 0, -1):
+      source = self._backup_name(index)
+      if os.path.exists(source):
+        os.replace(source, self._backup_name(index + 1))
+
+    if self.compress:
+      with open(self.path, "rb") as src, gzip.open(self._backup_name(1), "wb") as dst:
+        shutil.copyfileobj(src, dst)
+      os.remove(self.path)
+    else:
+      os.replace(self.path, self._backup_name(1))
+
+  def write(self, record: Dict[str, Any]):
+    line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+    size = len(line.encode("utf-8"))
+
+    with self._lock:
+      f = self._open()
+      if self._size and self._size + size > self.max_bytes:
+        self._rotate()
+        f = self._open()
+
+      f.write(line)
+      f.flush()
+      self._size += size
+
+  def files(self) -> List[str]:
+    """Trace files from oldest to newest"""
+    return trace_files(self.path)
+
+  def close(self):
+    with self._lock:
+      if self._file is not None:
+        self._file.close()
+        self._file = None
+
+# ================================== READER ====================================
+def trace_files(path: str) -> List[str]:
+  """Rotated backups (oldest first) followed by the active file"""
+  files = []
+  index = 1
+  while True:
+    for candidate in (f"{path}.{index}", f"{path}.{index}.gz"):
+      if os.path.exists(candidate):
+        files.append(candidate)
+        break
+    else:
+      break
+    index += 1
+
+  files.reverse()
+  if os.path.exists(path):
+    files.append(path)
+  return files
+
+def _open_trace(path: str):
+  if path.endswith(".gz"):
+    return gzip.open(path, "rt", encoding="utf-8")
+  return open(path, "r", encoding="utf-8")
+
+def read_trace(
+  path: str,
+  session_id: Optional[str] = None,
+  event_type: Optional[str] = None,
+  level: Optional[str] = None,
+  since: Optional[str] = None,
+  include_rotated: bool = True
+) -> Iterator[Dict[str, Any]]:
+  """
+  Stream records from a trace file (and its rotated backups) line by line
+
+  Args:
+    session_id: Only records of this session
+    event_type: Only this event type (prefix match, e.g. "SRS_")
+    level: Only this level
+    since: Only records with timestamp >= since ("YYYY-MM-DD HH:MM:SS")
+  """
+  files = trace_files(path) if include_rotated else [path]
+
+  for file_path in files:
+    with _open_trace(file_path) as f:
+      for line in f:
+        try:
+          record = json.loads(line)
+        except json.JSONDecodeError:
+          continue  # partial last line after a crash
+
+        if session_id and record.get("session_id") != session_id:
+          continue
+        if event_type and not record.get("event_type", "").startswith(event_type):
+          continue
+        if level and record.get("level") != level:
+          continue
+        if since and record.get("timestamp", "") < since:
+          continue
+        yield record
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Filter a JSONL trace without loading it whole")
+  parser.add_argument("path", nargs="?", default=os.getenv("TRACE_SINK_PATH", "logs/trace.jsonl"))
+  parser.add_argument("--session")
+  parser.add_argument("--event")
+  parser.add_argument("--level")
+  parser.add_argument("--since")
+  args = parser.parse_args()
+
+  for record in read_trace(args.path, args.session, args.event, args.level, args.since):
+    print(json.dumps(record, ensure_ascii=False))
@@ -1,74 +1,273 @@
+import os
 import time
 import json
+import queue
+import atexit
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, List
+
+from .trace_sink import JSONLTraceSink
+
+# =============================== CONFIGURATION ================================
+# Events below this level are dropped before any formatting happens
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+# Ring buffer size per session and number of sessions kept in memory
+LOG_BUFFER_SIZE = int(os.getenv("LOG_BUFFER_SIZE", "2000"))
+LOG_MAX_SESSIONS = int(os.getenv("LOG_MAX_SESSIONS", "100"))
+
+# Console and trace-sink output go through a bounded queue (full queue -> line dropped)
+LOG_CONSOLE = os.getenv("LOG_CONSOLE", "1") == "1"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Continuous JSONL trace (set TRACE_SINK_PATH="" to disable)
+TRACE_SINK_PATH = os.getenv("TRACE_SINK_PATH", "logs/trace.jsonl")
+TRACE_SINK_MAX_BYTES = int(os.getenv("TRACE_SINK_MAX_BYTES", str(10 * 1024 * 1024)))
+TRACE_SINK_BACKUPS = int(os.getenv("TRACE_SINK_BACKUPS", "5"))
+TRACE_SINK_GZIP = os.getenv("TRACE_SINK_GZIP", "0") == "1"
+
+LEVEL_RANKS = {
+  "DEBUG": 10,
+  "INFO": 20,
+  "TOOL": 20,
+  "AGENT": 20,
+  "SUCCESS": 25,
+  "WARNING": 30,
+  "ERROR": 40
+}
+
+COLOR_CODES = {
+  "INFO": "\033[94m",      # Blue
+  "SUCCESS": "\033[92m",   # Green
+  "WARNING": "\033[93m",   # Yellow
+  "ERROR": "\033[91m",     # Red
+  "TOOL": "\033[96m",      # Cyan
+  "AGENT": "\033[95m"      # Magenta
+}
+RESET = "\033[0m"
+
+DEFAULT_SESSION = "default"
+
+# Session the current task/thread logs into (propagates with contextvars)
+_session_key: ContextVar[str] = ContextVar("log_session", default=DEFAULT_SESSION)
+
+def current_session() -> str:
+  return _session_key.get()
+
+class _BackgroundWriter:
+  """Prints log lines and appends them to the trace sink on a background thread"""
+
+  def __init__(self, maxsize: int, console: bool = True, sink: Optional[JSONLTraceSink] = None):
+    self.console = console
+    self.sink = sink
+    self._queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+    self._thread = None
+    self._lock = threading.Lock()
+    self.dropped = 0
+
+  def _ensure_thread(self):
+    if self._thread is None:
+      with self._lock:
+        if self._thread is None:
+          self._thread = threading.Thread(target=self._drain, name="log-writer", daemon=True)
+          self._thread.start()
+          atexit.register(self.flush)
+
+  def submit(self, session_id: str, entry: Dict):
+    self._ensure_thread()
+    try:
+      self._queue.put_nowait((session_id, entry))
+    except queue.Full:
+      self.dropped += 1
+
+  def flush(self, timeout: float = 2.0):
+    """Wait (bounded) until every queued line has been printed"""
+    if self._thread is None:
+      return
+    deadline = time.monotonic() + timeout
+    while self._queue.unfinished_tasks and time.monotonic() < deadline:
+      time.sleep(0.01)
+
+  def _drain(self):
+    while True:
+      session_id, entry = self._queue.get()
+      try:
+        if self.console:
+          print(self._format(entry), flush=True)
+        if self.sink is not None:
+          self.sink.write({"session_id": session_id, **entry})
+      except Exception:
+        pass
+      finally:
+        self._queue.task_done()
+
+  @staticmethod
+  def _format(entry: Dict) -> str:
+    level = entry["level"]
+    color = COLOR_CODES.get(level, "")
+    line = f"{color}[{entry['timestamp']}] [{level}] {entry['event_type']}: {entry['message']}{RESET}"
+
+    data = entry["data"]
+    if data and level in ["TOOL", "ERROR"]:
+      line += f"\n{color}  -> Data: {json.dumps(data, indent=2, default=str)[:200]}...{RESET}"
+    return line
 
 class AgentLogger:
-  """Comprehensive logging and tracing for multi-agent system"""
-  
-  def __init__(self):
-    self.logs = []
-    self.start_time = None
+  """
+  Comprehensive logging and tracing for multi-agent system
+
+  - Session-scoped: each session (bound through contextvars) has its own
+    ring buffer, so concurrent Streamlit sessions never interleave
+  - Bounded: LOG_BUFFER_SIZE entries per session, LOG_MAX_SESSIONS sessions
+  - Non-blocking: console formatting/printing and the JSONL trace sink run
+    on a background thread
+
+  Usage:
+    logger.bind_session(session_id)     # or: with logger.session(session_id):
+    logger.log("EVENT", "message", data={...}, level="INFO")
+    logger.logs                         # entries of the current session
+  """
+
+  def __init__(
+    self,
+    min_level: str = LOG_LEVEL,
+    buffer_size: int = LOG_BUFFER_SIZE,
+    max_sessions: int = LOG_MAX_SESSIONS,
+    console: bool = LOG_CONSOLE,
+    sink_path: Optional[str] = TRACE_SINK_PATH
+  ):
+    self.min_rank = LEVEL_RANKS.get(min_level, 20)
+    self.buffer_size = buffer_size
+    self.max_sessions = max_sessions
     self.phase_times = {}
-      
+
+    self._buffers: "OrderedDict[str, deque]" = OrderedDict()
+    self._start_times: Dict[str, float] = {}
+    self._lock = threading.Lock()
+
+    sink = JSONLTraceSink(
+      sink_path,
+      max_bytes=TRACE_SINK_MAX_BYTES,
+      backup_count=TRACE_SINK_BACKUPS,
+      compress=TRACE_SINK_GZIP
+    ) if sink_path else None
+    self.sink = sink
+    self._writer = _BackgroundWriter(LOG_QUEUE_SIZE, console, sink) if (console or sink) else None
+
+  # ================================ SESSIONS ==================================
+  def bind_session(self, session_id: str):
+    """Route logs of the current task/thread (and its children) to session_id"""
+    _session_key.set(session_id or DEFAULT_SESSION)
+
+  @contextmanager
+  def session(self, session_id: str):
+    token = _session_key.set(session_id or DEFAULT_SESSION)
+    try:
+      yield
+    finally:
+      _session_key.reset(token)
+
+  def _buffer(self, session_id: str) -> deque:
+    """Get (or create) the session's ring buffer, evicting the oldest session"""
+    buffer = self._buffers.get(session_id)
+    if buffer is None:
+      buffer = deque(maxlen=self.buffer_size)
+      self._buffers[session_id] = buffer
+      while len(self._buffers) > self.max_sessions:
+        evicted, _ = self._buffers.popitem(last=False)
+        self._start_times.pop(evicted, None)
+    else:
+      self._buffers.move_to_end(session_id)
+    return buffer
+
+  @property
+  def start_time(self) -> Optional[float]:
+    return self._start_times.get(current_session())
+
+  @property
+  def logs(self) -> List[Dict]:
+    """Snapshot of the current session's entries"""
+    return self.session_logs(current_session())
+
+  def session_logs(self, session_id: str) -> List[Dict]:
+    with self._lock:
+      return list(self._buffers.get(session_id, ()))
+
+  # ================================= LOGGING ==================================
   def start_session(self, project_name: str):
-    self.start_time = time.time()
+    self._start_times[current_session()] = time.time()
     self.log("SESSION_START", f"Starting SRS generation for: {project_name}", level="INFO")
-      
+
+  def enabled(self, level: str) -> bool:
+    return LEVEL_RANKS.get(level, 20) >= self.min_rank
+
   def log(self, event_type: str, message: str, data: Optional[Dict] = None, level: str = "INFO"):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-    elapsed = time.time() - self.start_time if self.start_time else 0
-    
+    if LEVEL_RANKS.get(level, 20) < self.min_rank:
+      return
+
+    session_id = current_session()
+    now = time.time()
+    start_time = self._start_times.get(session_id)
+
     log_entry = {
-      "timestamp": timestamp,
-      "elapsed_seconds": round(elapsed, 2),
+      "timestamp": datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+      "elapsed_seconds": round(now - start_time, 2) if start_time else 0,
       "level": level,
       "event_type": event_type,
       "message": message,
       "data": data or {}
     }
-    
-    self.logs.append(log_entry)
-    
-    # Console output with colors
-    color_codes = {
-      "INFO": "\033[94m",      # Blue
-      "SUCCESS": "\033[92m",   # Green
-      "WARNING": "\033[93m",   # Yellow
-      "ERROR": "\033[91m",     # Red
-      "TOOL": "\033[96m",      # Cyan
-      "AGENT": "\033[95m"      # Magenta
-    }
-    
-    reset = "\033[0m"
-    color = color_codes.get(level, "")
-    
-    print(f"{color}[{timestamp}] [{level}] {event_type}: {message}{reset}")
-    if data and level in ["TOOL", "ERROR"]:
-      print(f"{color}  -> Data: {json.dumps(data, indent=2)[:200]}...{reset}")
-  
+
+    with self._lock:
+      self._buffer(session_id).append(log_entry)
+
+    if self._writer is not None:
+      self._writer.submit(session_id, log_entry)
+
+  def flush(self):
+    """Block until queued lines have been printed and written to the sink"""
+    if self._writer is not None:
+      self._writer.flush()
+
+  def stats(self) -> Dict[str, int]:
+    with self._lock:
+      return {
+        "sessions": len(self._buffers),
+        "entries": sum(len(buffer) for buffer in self._buffers.values()),
+        "writer_dropped": self._writer.dropped if self._writer else 0
+      }
+
   def start_phase(self, phase_name: str):
     self.phase_times[phase_name] = time.time()
     self.log("PHASE_START", f"Starting phase: {phase_name}", level="INFO")
-  
+
   def end_phase(self, phase_name: str):
     if phase_name in self.phase_times:
       duration = time.time() - self.phase_times[phase_name]
-      self.log("PHASE_END", f"Completed phase: {phase_name}", 
+      self.log("PHASE_END", f"Completed phase: {phase_name}",
                 data={"duration_seconds": round(duration, 2)}, level="SUCCESS")
-  
-  def export_trace(self, filename: str = "srs_trace.json"):
-    """Export full trace log to JSON file"""
+
+  def export_trace(self, filename: str = "srs_trace.json", session_id: Optional[str] = None):
+    """Export the session's trace log (current session by default) to JSON file"""
+    session_id = session_id or current_session()
+    start_time = self._start_times.get(session_id) or time.time()
+
     with open(filename, "w", encoding="utf-8") as f:
       json.dump({
         "session_info": {
-          "start_time": datetime.fromtimestamp(self.start_time).isoformat(),
-          "total_duration": round(time.time() - self.start_time, 2)
+          "session_id": session_id,
+          "start_time": datetime.fromtimestamp(start_time).isoformat(),
+          "total_duration": round(time.time() - start_time, 2)
         },
-        "logs": self.logs
-      }, f, indent=2, ensure_ascii=False)
-    
+        "logs": self.session_logs(session_id)
+      }, f, indent=2, ensure_ascii=False, default=str)
+
+    self.flush()
     print(f"\nTrace log exported to: {filename}")
 
 # Global logger instance
-logger = AgentLogger()
\ No newline at end of file
+logger = AgentLogger()
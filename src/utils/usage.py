@@ -0,0 +1,174 @@
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from .tracing import current_session
+
+# =============================== CONFIGURATION ================================
+# Token budgets (0 = unlimited). Session: whole conversation, SRS: one generation.
+SESSION_TOKEN_BUDGET = int(os.getenv("SESSION_TOKEN_BUDGET", "0"))
+SRS_TOKEN_BUDGET = int(os.getenv("SRS_TOKEN_BUDGET", "0"))
+
+# Used to size the worker pool when an SRS budget is set
+SRS_TOKENS_PER_WORKER = int(os.getenv("SRS_TOKENS_PER_WORKER", "3000"))
+SRS_SYNTHESIS_RESERVE = int(os.getenv("SRS_SYNTHESIS_RESERVE", "8000"))
+
+# USD per 1M tokens: (prompt, cached prompt, completion)
+MODEL_PRICES = {
+  "gpt-4o-mini": (0.15, 0.075, 0.60),
+  "gpt-4o": (2.50, 1.25, 10.00)
+}
+
+USAGE_MAX_SESSIONS = int(os.getenv("USAGE_MAX_SESSIONS", "1000"))
+USAGE_MAX_RUNS = int(os.getenv("USAGE_MAX_RUNS", "1000"))
+
+# SRS run (job ID / run ID) that LLM calls are currently charged to
+_usage_run: ContextVar[Optional[str]] = ContextVar("usage_run", default=None)
+
+def _price(model: str):
+  for name in sorted(MODEL_PRICES, key=len, reverse=True):
+    if model.startswith(name):
+      return MODEL_PRICES[name]
+  return None
+
+def _empty_totals() -> Dict[str, Any]:
+  return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0, "cost_usd": 0.0}
+
+def _add(totals: Dict[str, Any], usage: Dict[str, int], cost: float):
+  totals["calls"] += 1
+  totals["prompt_tokens"] += usage.get("prompt_tokens", 0)
+  totals["completion_tokens"] += usage.get("completion_tokens", 0)
+  totals["cached_tokens"] += usage.get("cached_tokens", 0)
+  totals["cost_usd"] = round(totals["cost_usd"] + cost, 6)
+
+def total_tokens(totals: Dict[str, Any]) -> int:
+  return totals["prompt_tokens"] + totals["completion_tokens"]
+
+class UsageLedger:
+  """
+  Token and cost accounting for every LLM call, keyed by session and node
+
+  Calls are charged to the session bound on the logger (contextvar) and, inside
+  run_scope(), to that SRS run as well. Budgets are checked against these totals.
+  Session totals are checkpointed with the conversation (token_usage) and
+  restored with restore_session(), so budgets survive restarts.
+
+  Usage:
+    with usage_ledger.run_scope(job_id):
+      ...  # every LLM call is recorded by record_llm_call()
+    usage_ledger.run_totals(job_id)
+  """
+
+  def __init__(self, max_sessions: int = USAGE_MAX_SESSIONS, max_runs: int = USAGE_MAX_RUNS):
+    self.max_sessions = max_sessions
+    self.max_runs = max_runs
+    self._sessions: "OrderedDict[str, Dict]" = OrderedDict()
+    self._runs: "OrderedDict[str, Dict]" = OrderedDict()
+    self._lock = threading.Lock()
+
+  @contextmanager
+  def run_scope(self, run_id: str):
+    token = _usage_run.set(run_id)
+    try:
+      yield
+    finally:
+      _usage_run.reset(token)
+
+  @staticmethod
+  def _entry(table: "OrderedDict[str, Dict]", key: str, limit: int) -> Dict:
+    entry = table.get(key)
+    if entry is None:
+      entry = {"total": _empty_totals(), "nodes": {}}
+      table[key] = entry
+      while len(table) > limit:
+        table.popitem(last=False)
+    else:
+      table.move_to_end(key)
+    return entry
+
+  def record(self, node: str, model: str, usage: Dict[str, int]):
+    price = _price(model)
+    cost = 0.0
+    if price:
+      uncached = usage.get("prompt_tokens", 0) - usage.get("cached_tokens", 0)
+      cost = (
+        uncached * price[0]
+        + usage.get("cached_tokens", 0) * price[1]
+        + usage.get("completion_tokens", 0) * price[2]
+      ) / 1_000_000
+
+    run_id = _usage_run.get()
+    with self._lock:
+      targets = [self._entry(self._sessions, current_session(), self.max_sessions)]
+      if run_id:
+        targets.append(self._entry(self._runs, run_id, self.max_runs))
+
+      for entry in targets:
+        _add(entry["total"], usage, cost)
+        _add(entry["nodes"].setdefault(node, _empty_totals()), usage, cost)
+
+  def _snapshot(self, table: "OrderedDict[str, Dict]", key: str) -> Dict[str, Any]:
+    with self._lock:
+      entry = table.get(key)
+      if entry is None:
+        return {"total": _empty_totals(), "nodes": {}}
+      return {
+        "total": dict(entry["total"]),
+        "nodes": {node: dict(totals) for node, totals in entry["nodes"].items()}
+      }
+
+  def session_totals(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+    return self._snapshot(self._sessions, session_id or current_session())
+
+  def restore_session(self, session_id: str, totals: Optional[Dict[str, Any]]):
+    """
+    Seed a session from its checkpointed totals (session_totals() output),
+    e.g. after a restart or on another replica. Higher in-memory totals win.
+    """
+    if not totals or "total" not in totals:
+      return
+
+    with self._lock:
+      current = self._sessions.get(session_id)
+      if current and total_tokens(current["total"]) >= total_tokens(totals["total"]):
+        return
+
+      entry = self._entry(self._sessions, session_id, self.max_sessions)
+      entry["total"] = {**_empty_totals(), **totals["total"]}
+      entry["nodes"] = {
+        node: {**_empty_totals(), **node_totals}
+        for node, node_totals in (totals.get("nodes") or {}).items()
+      }
+
+  def run_totals(self, run_id: Optional[str] = None) -> Dict[str, Any]:
+    run_id = run_id or _usage_run.get()
+    return self._snapshot(self._runs, run_id) if run_id else {"total": _empty_totals(), "nodes": {}}
+
+  # ================================= BUDGETS ==================================
+  def session_budget_exceeded(self, session_id: Optional[str] = None) -> bool:
+    if not SESSION_TOKEN_BUDGET:
+      return False
+    return total_tokens(self.session_totals(session_id)["total"]) >= SESSION_TOKEN_BUDGET
+
+  def remaining_srs_tokens(self) -> Optional[int]:
+    """Tokens left for the current SRS run (None: no budget)"""
+    limits = []
+    if SRS_TOKEN_BUDGET:
+      limits.append(SRS_TOKEN_BUDGET - total_tokens(self.run_totals()["total"]))
+    if SESSION_TOKEN_BUDGET:
+      limits.append(SESSION_TOKEN_BUDGET - total_tokens(self.session_totals()["total"]))
+    return min(limits) if limits else None
+
+  def worker_limit(self, planned: int) -> int:
+    """How many of the planned workers fit in the remaining budget (at least 1)"""
+    remaining = self.remaining_srs_tokens()
+    if remaining is None:
+      return planned
+
+    affordable = (remaining - SRS_SYNTHESIS_RESERVE) // SRS_TOKENS_PER_WORKER
+    return max(1, min(planned, affordable))
+
+usage_ledger = UsageLedger()
@@ -0,0 +1,95 @@
+import sys
+import os
+import time
+import random
+import argparse
+import tracemalloc
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.ooxml_writer import convert_to_docx_stream
+
+WORDS = (
+  "system shall user data request service module access report order payment "
+  "admin account session cache queue event record validate store notify audit"
+).split()
+
+def _sentence(rng: random.Random, words: int) -> str:
+  text = " ".join(rng.choice(WORDS) for _ in range(words))
+  return f"The {text} with **{rng.choice(WORDS)}** and *{rng.choice(WORDS)}* handling."
+
+def synthetic_srs(target_words: int, seed: int = 7) -> str:
+  """
+  SRS-shaped Markdown: numbered headings, prose, bullet and numbered lists,
+  requirement tables, mermaid diagrams and code blocks
+  """
+  rng = random.Random(seed)
+  lines = ["# SOFTWARE REQUIREMENTS SPECIFICATION (SRS): Benchmark Shop", ""]
+  words = 0
+  section = 0
+
+  while words < target_words:
+    section += 1
+    lines += [f"## {section}. Section {section}", ""]
+    for sub in range(1, 5):
+      block = [f"### {section}.{sub} Subsection", ""]
+      for _ in range(3):
+        block += [_sentence(rng, 25), ""]
+      block += [f"- {_sentence(rng, 8)}" for _ in range(4)]
+      block += ["  - nested detail", ""]
+      block += [f"{n}. {_sentence(rng, 8)}" for n in range(1, 4)]
+      block += ["", "| ID | Requirement | Priority |", "|---|---|---|"]
+      block += [f"| REQ-{section}{sub}{n} | {_sentence(rng, 10)} | High |" for n in range(5)]
+      block += ["", "```mermaid", "graph TD"]
+      block += [f"  N{n}[{rng.choice(WORDS)}] --> N{n + 1}[{rng.choice(WORDS)}]" for n in range(12)]
+      block += ["```", "", "```sql"]
+      block += [f"CREATE TABLE t{n} (id INT PRIMARY KEY, {rng.choice(WORDS)} TEXT);" for n in range(8)]
+      block += ["```", "", "---", ""]
+      lines += block
+      words += sum(len(line.split()) for line in block)
+
+  return "\n".join(lines)
+
+def bench(name: str, convert, markdown: str, repeat: int):
+  timings = []
+  peak = 0
+  size = 0
+
+  for _ in range(repeat):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = len(convert(markdown).getvalue())
+    timings.append(time.perf_counter() - started)
+    peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+  print(f"{name:<12} best {min(timings):7.3f}s | mean {sum(timings) / len(timings):7.3f}s | "
+        f"peak mem {peak / 1e6:7.1f} MB | output {size / 1e3:7.1f} kB")
+  return min(timings)
+
+if __name__ == "__main__":
+  """
+  Benchmark the streaming OOXML writer against the python-docx exporter
+  (tracemalloc slows both engines down equally; compare ratios, not absolutes)
+  """
+  parser = argparse.ArgumentParser(description="DOCX export benchmark")
+  parser.add_argument("--words", type=int, default=20000, help="Approximate SRS length in words")
+  parser.add_argument("--repeat", type=int, default=3, help="Runs per engine")
+  args = parser.parse_args()
+
+  markdown = synthetic_srs(args.words)
+
+  print("\n" + "="*80)
+  print(f"DOCX EXPORT BENCHMARK - {len(markdown.split())} words, {len(markdown.splitlines())} lines")
+  print("="*80 + "\n")
+
+  ooxml = bench("ooxml", convert_to_docx_stream, markdown, args.repeat)
+
+  try:
+    from src.utils.exporter import convert_to_docx
+  except ImportError as e:
+    print(f"python-docx  skipped ({e})")
+  else:
+    python_docx = bench("python-docx", convert_to_docx, markdown, args.repeat)
+    print(f"\nSpeedup: {python_docx / ooxml:.1f}x")
@@ -0,0 +1,107 @@
+import sys
+import os
+import operator
+from typing import Annotated, List, TypedDict
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from langgraph.graph import StateGraph, START, END
+
+import src.memory.checkpointer as checkpointer
+from src.memory.checkpointer import RetentionMemorySaver
+
+class CounterState(TypedDict):
+  count: int
+  notes: Annotated[List[str], operator.add]
+
+def _graph(saver):
+  def step(state: CounterState):
+    return {"count": state["count"] + 1, "notes": [f"step {state['count']}"]}
+
+  workflow = StateGraph(CounterState)
+  workflow.add_node("step", step)
+  workflow.add_edge(START, "step")
+  workflow.add_edge("step", END)
+  return workflow.compile(checkpointer=saver)
+
+def _run(app, thread_id: str, turns: int):
+  config = {"configurable": {"thread_id": thread_id}}
+  for turn in range(turns):
+    app.invoke({"count": turn, "notes": []}, config)
+
+def _with_limits(max_per_thread: int, max_threads: int):
+  saved = (checkpointer.CHECKPOINT_MAX_PER_THREAD, checkpointer.CHECKPOINT_MAX_THREADS)
+  checkpointer.CHECKPOINT_MAX_PER_THREAD = max_per_thread
+  checkpointer.CHECKPOINT_MAX_THREADS = max_threads
+  return saved
+
+def _restore(saved):
+  checkpointer.CHECKPOINT_MAX_PER_THREAD, checkpointer.CHECKPOINT_MAX_THREADS = saved
+
+def test_per_thread_cap_prunes_checkpoints_writes_and_blobs():
+  saved = _with_limits(3, 100)
+  try:
+    saver = RetentionMemorySaver()
+    app = _graph(saver)
+    _run(app, "thread-a", 10)
+
+    checkpoints = saver.storage["thread-a"][""]
+    assert len(checkpoints) == 3
+
+    # Pending writes only for the checkpoints that are left
+    for thread_id, _, checkpoint_id in saver.writes:
+      assert thread_id != "thread-a" or checkpoint_id in checkpoints
+
+    # Every channel value left is referenced by a remaining checkpoint
+    referenced = set()
+    for entry in checkpoints.values():
+      referenced.update(saver._channel_versions(entry).items())
+    blobs = [key for key in saver.blobs if key[0] == "thread-a"]
+    assert blobs
+    for _, _, channel, version in blobs:
+      assert (channel, version) in referenced
+
+    # The latest state is intact
+    state = app.get_state({"configurable": {"thread_id": "thread-a"}}).values
+    assert state["count"] == 10
+  finally:
+    _restore(saved)
+
+def test_thread_cap_evicts_least_recently_written():
+  saved = _with_limits(5, 2)
+  try:
+    saver = RetentionMemorySaver()
+    app = _graph(saver)
+    for thread_id in ("thread-a", "thread-b", "thread-c"):
+      _run(app, thread_id, 1)
+
+    assert "thread-a" not in saver.storage
+    assert not any(key[0] == "thread-a" for key in saver.blobs)
+    assert set(saver.storage) == {"thread-b", "thread-c"}
+    assert saver.stats()["threads"] == 2
+  finally:
+    _restore(saved)
+
+def test_release_thread_forgets_everything():
+  saver = RetentionMemorySaver()
+  app = _graph(saver)
+  _run(app, "one-shot", 2)
+
+  saver.release_thread("one-shot")
+  assert "one-shot" not in saver.storage
+  assert not any(key[0] == "one-shot" for key in saver.writes)
+  assert not any(key[0] == "one-shot" for key in saver.blobs)
+
+if __name__ == "__main__":
+  """
+  Test the checkpoint retention policy of the in-memory saver
+  """
+  print("\n" + "="*80)
+  print("TESTING CHECKPOINT PRUNING")
+  print("="*80 + "\n")
+
+  for name, test in list(globals().items()):
+    if name.startswith("test_"):
+      test()
+      print(f"  {name}: OK")
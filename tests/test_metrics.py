@@ -0,0 +1,129 @@
+import sys
+import os
+import asyncio
+import urllib.request
+
+import httpx
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.metrics import MetricsRegistry, SEARCH_LATENCY, NODE_LATENCY, timed_node, start_metrics_server
+from src.utils.search_client import AsyncSearchClient
+
+def _series(text: str, name: str) -> dict:
+  """Sample lines of one metric: 'name{labels}' -> value"""
+  samples = {}
+  for line in text.splitlines():
+    if line.startswith(name) and not line.startswith("#"):
+      key, value = line.rsplit(" ", 1)
+      samples[key] = float(value)
+  return samples
+
+def test_counter_render():
+  registry = MetricsRegistry()
+  hits = registry.counter("test_hits", "Hits", ("cache",))
+  hits.inc(cache="tavily")
+  hits.inc(2, cache="tavily")
+  hits.inc(cache='a"b')
+
+  text = registry.render()
+  assert "# HELP test_hits_total Hits" in text
+  assert "# TYPE test_hits_total counter" in text
+  assert _series(text, "test_hits_total") == {
+    'test_hits_total{cache="a\\"b"}': 1,
+    'test_hits_total{cache="tavily"}': 3
+  }
+  assert hits.value(cache="tavily") == 3
+
+def test_histogram_buckets_sum_count_and_quantiles():
+  registry = MetricsRegistry()
+  latency = registry.histogram("test_seconds", "Latency", ("stage",), buckets=(0.1, 1, 10))
+  for value in (0.05, 0.5, 0.7, 5, 50):
+    latency.observe(value, stage="research")
+
+  text = registry.render()
+  assert "# TYPE test_seconds histogram" in text
+  assert _series(text, "test_seconds_bucket") == {
+    'test_seconds_bucket{stage="research",le="0.1"}': 1,
+    'test_seconds_bucket{stage="research",le="1"}': 3,
+    'test_seconds_bucket{stage="research",le="10"}': 4,
+    'test_seconds_bucket{stage="research",le="+Inf"}': 5
+  }
+  assert _series(text, "test_seconds_count") == {'test_seconds_count{stage="research"}': 5}
+  assert _series(text, "test_seconds_sum") == {'test_seconds_sum{stage="research"}': 56.25}
+  assert "# TYPE test_seconds_quantile gauge" in text
+  assert _series(text, "test_seconds_quantile")['test_seconds_quantile{stage="research",quantile="0.5"}'] == 0.7
+  assert latency.summary() == [{"stage": "research", "count": 5, "p50": 0.7, "p95": 50, "p99": 50}]
+
+def test_gauge_reads_callback_and_survives_errors():
+  registry = MetricsRegistry()
+  registry.gauge("test_store", "Store size", ("kind",), lambda: {("threads",): 2, ("checkpoints",): 7})
+
+  def unreachable():
+    raise ConnectionError("down")
+
+  registry.gauge("test_broken", "Broken store", ("kind",), unreachable)
+
+  text = registry.render()
+  assert _series(text, "test_store") == {'test_store{kind="checkpoints"}': 7, 'test_store{kind="threads"}': 2}
+  assert "# TYPE test_broken gauge" in text
+  assert _series(text, "test_broken{") == {}
+
+def test_timed_node_sync_and_async():
+  before = {row["stage"]: row["count"] for row in NODE_LATENCY.summary() if row["graph"] == "test"}
+
+  timed_node("test", "sync", lambda state: state)({})
+  async def node(state):
+    return state
+  asyncio.run(timed_node("test", "async", node)({}))
+
+  after = {row["stage"]: row["count"] for row in NODE_LATENCY.summary() if row["graph"] == "test"}
+  assert after["sync"] == before.get("sync", 0) + 1
+  assert after["async"] == before.get("async", 0) + 1
+
+def test_search_latency_counts_upstream_calls_only():
+  async def handler(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(0.2)
+    return httpx.Response(200, json={"results": []})
+
+  client = AsyncSearchClient(api_key="test")
+  client._http = httpx.AsyncClient(base_url="https://search.test", transport=httpx.MockTransport(handler))
+  before = sum(row["count"] for row in SEARCH_LATENCY.summary())
+
+  async def run():
+    # Five identical in-flight queries: one upstream call, one observation
+    await asyncio.gather(*(client.asearch("same-key", {"query": "q"}) for _ in range(5)))
+
+  try:
+    asyncio.run(run())
+  finally:
+    client.close()
+
+  assert sum(row["count"] for row in SEARCH_LATENCY.summary()) == before + 1
+
+def test_metrics_endpoint():
+  server = start_metrics_server(0)
+  assert server is not None
+  try:
+    port = server.server_address[1]
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+      assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+      body = response.read().decode("utf-8")
+  finally:
+    server.shutdown()
+
+  assert "# TYPE srs_tavily_call_duration_seconds histogram" in body
+
+if __name__ == "__main__":
+  """
+  Test the in-process metrics and their Prometheus text exposition
+  """
+  print("\n" + "="*80)
+  print("TESTING METRICS")
+  print("="*80 + "\n")
+
+  for name, test in list(globals().items()):
+    if name.startswith("test_"):
+      test()
+      print(f"  {name}: OK")
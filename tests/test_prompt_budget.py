@@ -0,0 +1,72 @@
+import sys
+import os
+import json
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.prompt_budget import count_tokens, extractive_summary, truncate_to_tokens, fit_fields, allocate
+
+PROSE = " ".join(
+  f"The order service stores order {n} and notifies the payment service about order {n}."
+  for n in range(40)
+)
+
+MERMAID = "\n".join(["```mermaid", "graph TD"] + [f"  N{n}[order] --> N{n + 1}[payment]" for n in range(30)] + ["```"])
+
+def _fences(text: str) -> int:
+  return sum(1 for line in text.split("\n") if line.strip().startswith("```"))
+
+def test_summary_keeps_fenced_blocks_whole():
+  text = f"{PROSE}\n{MERMAID}\n{PROSE}"
+  for budget in (50, 200, 400, 800):
+    summary = extractive_summary(text, budget)
+    assert _fences(summary) % 2 == 0, budget
+    if "```mermaid" in summary:
+      assert MERMAID in summary
+
+def test_summary_within_budget():
+  summary = extractive_summary(PROSE, 100)
+  assert count_tokens(summary) <= 110  # + truncation marker
+
+def test_truncation_never_leaves_a_block_open():
+  for text in (f"{PROSE}\n{MERMAID}", f"Intro.\n{MERMAID}\n{PROSE}"):
+    for budget in (30, 80, 150, 300):
+      assert _fences(truncate_to_tokens(text, budget)) % 2 == 0, budget
+
+def test_fit_fields_keeps_valid_json():
+  task = {
+    "objective": "Design the order database",
+    "requirements": f"{PROSE}\n{MERMAID}",
+    "context": PROSE,
+    "priority": 1,
+    "deliverables": ["Schema", "ER diagram"]
+  }
+  fitted = fit_fields(task, 300, "test task")
+  text = json.dumps(fitted, indent=2)
+
+  assert json.loads(text) == fitted
+  assert fitted["objective"] == task["objective"]
+  assert fitted["priority"] == 1 and fitted["deliverables"] == task["deliverables"]
+  assert count_tokens(text) <= 340
+  assert _fences(fitted["requirements"]) % 2 == 0
+
+def test_fit_fields_unchanged_when_it_fits():
+  task = {"objective": "Small", "context": "Short"}
+  assert fit_fields(task, 1000, "test task") == task
+
+def test_allocate_redistributes_unused_share():
+  assert allocate([10, 500, 500], 610) == [10, 300, 300]
+
+if __name__ == "__main__":
+  """
+  Test prompt compaction: fenced blocks stay whole, JSON stays valid
+  """
+  print("\n" + "="*80)
+  print("TESTING PROMPT BUDGET")
+  print("="*80 + "\n")
+
+  for name, test in list(globals().items()):
+    if name.startswith("test_"):
+      test()
+      print(f"  {name}: OK")
@@ -0,0 +1,122 @@
+import sys
+import os
+import time
+import asyncio
+import threading
+
+# SRS nodes build their LLM and search clients at import time; no request is made in these tests
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("TAVILY_API_KEY", "test")
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agents.srs.nodes import research
+from src.agents.srs.nodes.research import ResearchPrefetcher
+
+QUERY = "Project Type: Web App"
+
+def _patch(searches, timeout: float):
+  """Swap the search functions and budget, returns a restore callback"""
+  saved = (research._run_searches, research._search, research.RESEARCH_QUERY_TIMEOUT, research.research_prefetch)
+  research._run_searches = searches
+  research._search = lambda query: (_ for _ in ()).throw(AssertionError("searched again"))
+  research.RESEARCH_QUERY_TIMEOUT = timeout
+  research.research_prefetch = ResearchPrefetcher()
+
+  def restore():
+    research.research_prefetch._executor.shutdown(wait=False, cancel_futures=True)
+    (research._run_searches, research._search, research.RESEARCH_QUERY_TIMEOUT, research.research_prefetch) = saved
+  return restore
+
+def test_finished_prefetch_is_reused():
+  restore = _patch(lambda query: (["q"], [[{"title": "A", "url": "https://a.test", "content": "A"}]]), timeout=5)
+  try:
+    research.research_prefetch.start("s1", QUERY)
+    time.sleep(0.1)
+    state = research.research_node({"project_query": QUERY})
+    assert len(state["research_sources"]) == 1
+  finally:
+    restore()
+
+def test_slow_prefetch_waits_only_for_remaining_budget():
+  release = threading.Event()
+
+  def stuck(query):
+    release.wait(10)
+    return ["q"], [[]]
+
+  restore = _patch(stuck, timeout=1)
+  try:
+    research.research_prefetch.start("s1", QUERY)
+    time.sleep(0.5)
+
+    started = time.perf_counter()
+    state = research.research_node({"project_query": QUERY})
+    elapsed = time.perf_counter() - started
+
+    # 0.5s left of the budget + grace, no second round of searches
+    assert elapsed < 0.5 + research.PREFETCH_GRACE_SECONDS + 0.5, elapsed
+    assert all(result.startswith("Search timed out") for result in state["research_results"])
+  finally:
+    release.set()
+    restore()
+
+def test_queued_prefetch_is_cancelled():
+  prefetcher = ResearchPrefetcher(max_workers=1)
+  release = threading.Event()
+  saved = research._run_searches
+  research._run_searches = lambda query: release.wait(10)
+  try:
+    prefetcher.start("busy", "other project")
+    prefetcher.start("s1", QUERY)
+    assert prefetcher.claim(QUERY) is None
+    assert prefetcher.stats()["discarded"] == 1
+  finally:
+    release.set()
+    research._run_searches = saved
+    prefetcher._executor.shutdown(wait=False, cancel_futures=True)
+
+def test_async_node_keeps_the_loop_free():
+  release = threading.Event()
+
+  def slow(query):
+    release.wait(10)
+    return ["q"], [[]]
+
+  restore = _patch(slow, timeout=5)
+  try:
+    research.research_prefetch.start("s1", QUERY)
+
+    async def run():
+      ticks = 0
+      async def ticker():
+        nonlocal ticks
+        while not release.is_set():
+          ticks += 1
+          await asyncio.sleep(0.01)
+
+      async def finish():
+        await asyncio.sleep(0.3)
+        release.set()
+
+      await asyncio.gather(research.aresearch_node({"project_query": QUERY}), ticker(), finish())
+      return ticks
+
+    assert asyncio.run(run()) > 10
+  finally:
+    release.set()
+    restore()
+
+if __name__ == "__main__":
+  """
+  Test how the research node reuses speculative research
+  """
+  print("\n" + "="*80)
+  print("TESTING RESEARCH PREFETCH")
+  print("="*80 + "\n")
+
+  for name, test in list(globals().items()):
+    if name.startswith("test_"):
+      test()
+      print(f"  {name}: OK")
@@ -0,0 +1,96 @@
+import sys
+import os
+import time
+import asyncio
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.cache import SQLiteCache
+from src.utils.search_client import AsyncSearchClient
+
+def _client(delay: float = 0.2):
+  """Search client whose upstream is a local mock counting real requests"""
+  requests = []
+  lock = threading.Lock()
+
+  async def handler(request: httpx.Request) -> httpx.Response:
+    with lock:
+      requests.append(request.content)
+    await asyncio.sleep(delay)
+    return httpx.Response(200, json={"results": [{"title": "t", "url": "u", "content": "c"}]})
+
+  client = AsyncSearchClient(api_key="test")
+  client._http = httpx.AsyncClient(base_url="https://search.test", transport=httpx.MockTransport(handler))
+  return client, requests
+
+def test_identical_queries_are_coalesced():
+  client, requests = _client()
+  try:
+    with ThreadPoolExecutor(max_workers=5) as pool:
+      responses = list(pool.map(lambda _: client.search("same-key", {"query": "q"}, timeout=10), range(5)))
+  finally:
+    client.close()
+
+  assert len(requests) == 1
+  assert all(response == responses[0] for response in responses)
+  assert client.stats()["upstream_requests"] == 1
+  assert client.stats()["coalesced_requests"] == 4
+  assert client.stats()["in_flight"] == 0
+
+def test_distinct_and_sequential_queries_are_not_coalesced():
+  client, requests = _client(delay=0.05)
+
+  async def run():
+    return await asyncio.gather(
+      client.asearch("key-a", {"query": "a"}),
+      client.asearch("key-b", {"query": "b"})
+    )
+
+  try:
+    asyncio.run(run())
+    # Finished requests are not reused: coalescing only covers in-flight ones
+    client.search("key-a", {"query": "a"}, timeout=10)
+  finally:
+    client.close()
+
+  assert len(requests) == 3
+  assert client.stats()["coalesced_requests"] == 0
+
+def test_cache_ttl_and_lru():
+  with tempfile.TemporaryDirectory() as directory:
+    cache = SQLiteCache(os.path.join(directory, "cache.db"), namespace="test", ttl_seconds=0.2, max_entries=2)
+
+    cache.set("a", [1])
+    assert cache.get("a") == [1]
+
+    time.sleep(0.3)
+    assert cache.get("a") is None  # expired
+
+    cache.set("a", [1])
+    cache.set("b", [2])
+    cache.get("a")
+    cache.set("c", [3])  # evicts b, the least recently read
+    assert cache.get("b") is None
+    assert cache.get("a") == [1]
+    assert cache.get("c") == [3]
+
+    cache._conn.close()
+
+if __name__ == "__main__":
+  """
+  Test search request coalescing and the search cache (TTL, LRU)
+  """
+  print("\n" + "="*80)
+  print("TESTING SEARCH CLIENT")
+  print("="*80 + "\n")
+
+  for name, test in list(globals().items()):
+    if name.startswith("test_"):
+      test()
+      print(f"  {name}: OK")
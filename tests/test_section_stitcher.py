@@ -0,0 +1,88 @@
+import sys
+import os
+
+# Section writers are built at import time; no request is made in these tests
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agents.srs.prompts import SYNTHESIS_SECTIONS
+from src.agents.srs.nodes.sections import number_section, SectionStitcher
+
+SECTION = {"number": 3, "title": "System Features"}
+
+def test_headings_are_renumbered():
+  text = "\n".join([
+    "## 7. Features",
+    "### 2.4 Checkout",
+    "Intro",
+    "#### Payment",
+    "#### Refunds",
+    "### x.x Search"
+  ])
+  lines = number_section(text, SECTION, {}).split("\n")
+
+  assert lines[0] == "## 3. System Features"
+  assert "### 3.1 Checkout" in lines
+  assert "#### 3.1.1 Payment" in lines
+  assert "#### 3.1.2 Refunds" in lines
+  assert "### 3.2 Search" in lines
+
+def test_shallow_subsections_are_shifted():
+  # Writer used ## for subsections: the shallowest becomes ###
+  text = "## Features\n## Checkout\n### Payment"
+  lines = number_section(text, SECTION, {}).split("\n")
+  assert lines[1:] == ["### 3.1 Checkout", "#### 3.1.1 Payment"]
+
+def test_fenced_code_is_untouched():
+  text = "## Features\n```python\n# not a heading\n```\n### Checkout"
+  out = number_section(text, SECTION, {})
+  assert "# not a heading" in out
+  assert "### 3.1 Checkout" in out
+
+def test_req_ids_first_seen_order():
+  req_ids = {}
+  out = number_section("## Features\nREQ-7 login\nREQ-3 logout\nREQ-7 again", SECTION, req_ids)
+  assert out.split("\n")[1:] == ["REQ-1 login", "REQ-2 logout", "REQ-1 again"]
+  assert req_ids == {"REQ-7": "REQ-1", "REQ-3": "REQ-2"}
+
+def test_req_ids_kept_without_map():
+  out = number_section("## Features\nREQ-7 login", SECTION)
+  assert out.split("\n")[1:] == ["REQ-7 login"]
+
+def test_req_ids_renumbered_only_in_system_features():
+  # Sections finish out of order and are written independently:
+  # only the System Features section is renumbered
+  features = next(
+    position for position, section in enumerate(SYNTHESIS_SECTIONS)
+    if section["title"].startswith("System Features")
+  )
+  emitted = []
+  stitcher = SectionStitcher({"project_name": "Shop"}, emitted.append)
+
+  stitcher.add(features, "## Features\nREQ-7 login\nREQ-3 logout\nREQ-7 again")
+  assert len(emitted) == 1  # header only, earlier sections are not done yet
+
+  for position in range(len(SYNTHESIS_SECTIONS)):
+    if position != features:
+      stitcher.add(position, "## Section\nSee REQ-3")
+
+  document = stitcher.document()
+  assert document.startswith("# SOFTWARE REQUIREMENTS SPECIFICATION (SRS): Shop")
+  assert "REQ-1 login\nREQ-2 logout\nREQ-1 again" in document
+  assert document.count("See REQ-3") == len(SYNTHESIS_SECTIONS) - 1
+  assert "".join(emitted) == document.rstrip("\n") + "\n\n"
+
+if __name__ == "__main__":
+  """
+  Test section numbering and REQ renumbering of the section-parallel synthesis
+  """
+  print("\n" + "="*80)
+  print("TESTING SECTION STITCHER")
+  print("="*80 + "\n")
+
+  for name, test in list(globals().items()):
+    if name.startswith("test_"):
+      test()
+      print(f"  {name}: OK")
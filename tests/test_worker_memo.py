@@ -0,0 +1,85 @@
+import sys
+import os
+
+# Worker LLM is built at import time; no request is made in these tests
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agents.srs.nodes.workers import parse_requirements, requirement_slice, worker_fingerprint, worker_memo
+
+QUERY = "\n".join([
+  "Project Type: Web App",
+  "",
+  "Core Features:",
+  "- Task creation",
+  "- Deadlines and reminders",
+  "",
+  "Technology Stack: React, Node.js",
+  "",
+  "Non-Functional Requirements:",
+  "- Handle 10,000 concurrent users"
+])
+
+DATABASE = {
+  "agent_role": "Database Architect",
+  "specialty": "Data modeling",
+  "requirements_covered": ["Task creation", "Handle 10,000 concurrent users"],
+  "task": {"objective": "Design the schema"}
+}
+
+def test_parse_requirements():
+  requirements = parse_requirements(QUERY)
+  assert requirements["context"] == ["Project Type: Web App", "Technology Stack: React, Node.js"]
+  assert requirements["items"] == [
+    "Core Features: Task creation",
+    "Core Features: Deadlines and reminders",
+    "Non-Functional Requirements: Handle 10,000 concurrent users"
+  ]
+
+def test_slice_is_context_plus_covered_items():
+  assert requirement_slice(DATABASE, parse_requirements(QUERY)) == [
+    "Project Type: Web App",
+    "Technology Stack: React, Node.js",
+    "Core Features: Task creation",
+    "Non-Functional Requirements: Handle 10,000 concurrent users"
+  ]
+
+def test_unknown_coverage_depends_on_everything():
+  agent = {**DATABASE, "requirements_covered": ["something else"]}
+  requirements = parse_requirements(QUERY)
+  assert requirement_slice(agent, requirements) == requirements["context"] + requirements["items"]
+
+def test_reworded_task_still_hits():
+  requirements = parse_requirements(QUERY)
+  reworded = {**DATABASE, "specialty": "Schemas", "task": {"objective": "Design a database schema"}}
+  assert worker_fingerprint(reworded, requirements) == worker_fingerprint(DATABASE, requirements)
+
+def test_unrelated_requirement_change_still_hits():
+  changed = parse_requirements(QUERY.replace("Deadlines and reminders", "Comments on tasks"))
+  assert worker_fingerprint(DATABASE, changed) == worker_fingerprint(DATABASE, parse_requirements(QUERY))
+
+def test_covered_or_context_change_misses():
+  base = worker_fingerprint(DATABASE, parse_requirements(QUERY))
+  assert worker_fingerprint(DATABASE, parse_requirements(QUERY.replace("10,000", "50,000"))) != base
+  assert worker_fingerprint(DATABASE, parse_requirements(QUERY.replace("Node.js", "Django"))) != base
+  assert worker_fingerprint({**DATABASE, "agent_role": "Backend Engineer"}, parse_requirements(QUERY)) != base
+
+def test_memo_is_keyed_by_fingerprint():
+  requirements = parse_requirements(QUERY)
+  memo = worker_memo([DATABASE], [{"agent_index": 1, "role": "Database Architect", "output": "schema"}], requirements)
+  assert memo == {worker_fingerprint(DATABASE, requirements): "schema"}
+
+if __name__ == "__main__":
+  """
+  Test the worker memo key used by incremental SRS regeneration
+  """
+  print("\n" + "="*80)
+  print("TESTING WORKER MEMO")
+  print("="*80 + "\n")
+
+  for name, test in list(globals().items()):
+    if name.startswith("test_"):
+      test()
+      print(f"  {name}: OK")